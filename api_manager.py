@@ -33,6 +33,13 @@ class ApiKeyManager:
         """Повертає активний ключ для сервісу."""
         return self.data["active_keys"].get(service_name)
 
+    def get_key_pool(self, service_name):
+        """Усі ключі сервісу для розподілу запитів; активний ключ — першим."""
+        active_key = self.get_active_key(service_name)
+        keys = [active_key] if active_key else []
+        keys += [key for key in self.get_keys_for_service(service_name) if key and key != active_key]
+        return keys
+
     def add_key(self, service_name, key_value):
         """Додає новий ключ, якщо його ще немає."""
         keys = self.get_keys_for_service(service_name)
@@ -65,4 +72,17 @@ class ApiKeyManager:
     def set_active_key(self, service_name, key_value):
         """Встановлює активний ключ для сервісу."""
         self.data["active_keys"][service_name] = key_value
+        self.save()
+
+    def get_model(self, service_name):
+        """Модель, обрана для сервісу (gpt, gemini), або None — модель за замовчуванням."""
+        return self.data.get("models", {}).get(service_name) or None
+
+    def set_model(self, service_name, model):
+        """Запам'ятовує модель для сервісу; порожнє значення повертає модель за замовчуванням."""
+        models = self.data.setdefault("models", {})
+        if model:
+            models[service_name] = model
+        else:
+            models.pop(service_name, None)
         self.save()
\ No newline at end of file
@@ -0,0 +1,277 @@
+# batch_cli.py
+# Консольна обробка цілого розділу без графічного інтерфейсу.
+# Приклад:
+#   python batch_cli.py chapter_01 -o chapter_01_uk --service deepl --src KO --dest UK
+import argparse
+import json
+import os
+import sys
+import time
+
+# Дозволяє працювати на сервері без дисплея
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtGui import QGuiApplication, QImage
+from PyQt6.QtCore import QRect
+
+from translators import KEYLESS_SERVICES, create_translator
+from translation_memory import TranslationMemory, CachedTranslator
+from api_manager import ApiKeyManager
+from ocr_engine import OCR_LANGS, DEFAULT_STRIP_HEIGHT, DEFAULT_STRIP_OVERLAP, create_reader
+from ocr_cache import OcrCache, cached_ocr
+from text_grouping import bbox_to_rect, group_text_bubbles, distribute_text_to_group, group_sentences
+from renderer import load_fonts, render_page, font_size_for, DEFAULT_FONT, DEFAULT_FONT_SIZE
+from text_removal import TEXT_REMOVAL_METHODS, DEFAULT_TEXT_REMOVAL
+from pipeline import PagePipeline, PipelineStage
+from ocr_pool import OcrProcessPool
+from ocr_daemon import DEFAULT_PORT, start_daemon
+from chapter_batcher import BatchingTranslator, translate_pages
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+
+def find_pages(input_dir):
+    """Повертає відсортований список зображень у папці."""
+    return sorted(
+        os.path.join(input_dir, name) for name in os.listdir(input_dir)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+
+
+# ======================================================================
+# ЕТАПИ ОБРОБКИ ОДНІЄЇ СТОРІНКИ
+# ======================================================================
+def ocr_page(reader, path, font_name, font_size, ocr_cache=None, strip_height=DEFAULT_STRIP_HEIGHT,
+             strip_overlap=DEFAULT_STRIP_OVERLAP, strip_workers=1, auto_fit=True):
+    """Розпізнає текст і групує блоки в речення. Повертає словник стану сторінки."""
+    ocr_results, groups = cached_ocr(reader, path, ocr_cache, group_text_bubbles,
+                                     strip_height, strip_overlap, strip_workers)
+    found_rects = [
+        {'rect': QRect(*bbox_to_rect(bbox)), 'text': text, 'prob': prob,
+         'translated': '', 'font': font_name, 'font_size': font_size, 'auto_fit': auto_fit}
+        for bbox, text, prob in ocr_results
+    ]
+    return {
+        'path': path,
+        'found_rects': found_rects,
+        'groups': groups,
+        'sentences': group_sentences(found_rects, groups),
+    }
+
+
+def translate_page(page, translator, src_lang, dest_lang):
+    """Перекладає речення сторінки і розподіляє переклад по блоках груп."""
+    items = translator.translate_batch([{'text': s} for s in page['sentences']], src_lang, dest_lang)
+    return apply_translations(page, [item.get('translated', '') for item in items])
+
+
+def apply_translations(page, translations):
+    page['translations'] = translations
+    for group, translated in zip(page['groups'], translations):
+        distribute_text_to_group(page['found_rects'], group, translated)
+    return page
+
+
+def render_and_save(page, output_dir, text_removal=DEFAULT_TEXT_REMOVAL):
+    """Відтворює переклад на сторінці, зберігає PNG і JSON-опис поруч."""
+    stem = os.path.splitext(os.path.basename(page['path']))[0]
+    image = QImage(page['path'])
+    if image.isNull():
+        raise IOError(f"Не вдалося завантажити зображення {page['path']}")
+    png_path = os.path.join(output_dir, f"{stem}.png")
+    if not render_page(image, page['found_rects'], text_removal).save(png_path):
+        raise IOError(f"Не вдалося зберегти {png_path}")
+    page['output'] = png_path
+    with open(os.path.join(output_dir, f"{stem}.json"), 'w', encoding='utf-8') as f:
+        json.dump(page_to_json(page), f, indent=4, ensure_ascii=False)
+    return page
+
+
+def page_to_json(page):
+    blocks = []
+    for item in page['found_rects']:
+        rect = item['rect']
+        blocks.append({
+            'rect': [rect.x(), rect.y(), rect.width(), rect.height()],
+            'text': item['text'],
+            'prob': item.get('prob'),
+            'translated': item['translated'],
+            'font': item['font'],
+            'font_size': font_size_for(item),
+            'auto_fit': item.get('auto_fit', False),
+        })
+    return {
+        'source': page['path'],
+        'output': page.get('output'),
+        'blocks': blocks,
+        'groups': page['groups'],
+        'sentences': page['sentences'],
+        'translations': page.get('translations', []),
+    }
+
+
+def run_chapter_batched(pages, ocr_stage, render_stage, translator, src_lang, dest_lang, queue_size, on_result):
+    """Розпізнає всі сторінки, перекладає речення розділу спільними пакетами і відтворює сторінки."""
+    ocr_results = PagePipeline([ocr_stage], queue_size).run(pages)
+    failed = [result for result in ocr_results if not result.ok]
+    for result in failed:
+        on_result(result)
+    recognized = [result for result in ocr_results if result.ok]
+
+    sentences = [result.item['sentences'] for result in recognized]
+    print(f"Переклад {sum(len(s) for s in sentences)} речень з {len(recognized)} сторінок...")
+    for result, translations in zip(recognized, translate_pages(translator, sentences, src_lang, dest_lang)):
+        apply_translations(result.item, translations)
+
+    def report(result):
+        # Повертаємо індекс сторінки у вихідному списку
+        result.index = recognized[result.index].index
+        on_result(result)
+
+    rendered = PagePipeline([render_stage], queue_size).run([r.item for r in recognized], on_result=report)
+    return sorted(failed + rendered, key=lambda result: result.index)
+
+
+# ======================================================================
+# ТОЧКА ВХОДУ
+# ======================================================================
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Пакетний переклад сторінок манхви без графічного інтерфейсу.")
+    parser.add_argument("input_dir", help="Папка зі сторінками (png/jpg)")
+    parser.add_argument("-o", "--output", help="Папка для результатів (за замовчуванням <input_dir>_translated)")
+    parser.add_argument("--service", default="google", choices=["google", "google_fast", "deepl", "gpt", "gemini"], help="Сервіс перекладу")
+    parser.add_argument("--api-key", action="append",
+                        help="API ключ; можна вказати кілька разів (за замовчуванням — усі ключі сервісу з api_keys.json)")
+    parser.add_argument("--model", help="Модель для gpt і gemini (за замовчуванням — обрана в налаштуваннях API)")
+    parser.add_argument("--src", default="auto", help="Мова оригіналу (auto, ko, KO ...)")
+    parser.add_argument("--dest", default="uk", help="Мова перекладу (uk, UK, EN-US ...)")
+    parser.add_argument("--font", help="Сімейство шрифту (за замовчуванням — перший шрифт з папки fonts)")
+    parser.add_argument("--font-size", type=int, default=DEFAULT_FONT_SIZE,
+                        help="Розмір шрифту (використовується разом з --no-auto-fit)")
+    parser.add_argument("--no-auto-fit", action="store_true",
+                        help="Не підбирати розмір шрифту під рамку, а використовувати --font-size")
+    parser.add_argument("--fonts-dir", default="fonts", help="Папка зі шрифтами")
+    parser.add_argument("--text-removal", choices=list(TEXT_REMOVAL_METHODS), default=DEFAULT_TEXT_REMOVAL,
+                        help="Як прибирати оригінальний текст: inpaint, background (колір фону) або white")
+    parser.add_argument("--cpu", action="store_true", help="Не намагатися використовувати GPU для OCR")
+    parser.add_argument("--no-cache", action="store_true", help="Не використовувати пам'ять перекладів")
+    parser.add_argument("--no-ocr-cache", action="store_true", help="Не використовувати кеш результатів OCR")
+    parser.add_argument("--ocr-processes", type=int, default=0,
+                        help="Кількість процесів OCR на CPU (0 — одна модель у головному процесі)")
+    parser.add_argument("--ocr-threads", type=int, help="Потоків PyTorch на кожен процес OCR")
+    parser.add_argument("--ocr-daemon", action="store_true",
+                        help="Розпізнавати через спільну службу OCR (ocr_daemon.py), запустивши її за потреби")
+    parser.add_argument("--ocr-daemon-port", type=int, default=DEFAULT_PORT, help="Порт служби OCR")
+    parser.add_argument("--strip-height", type=int, default=DEFAULT_STRIP_HEIGHT,
+                        help="Висота смуги для розпізнавання довгих сторінок (0 — без розбиття)")
+    parser.add_argument("--strip-overlap", type=int, default=DEFAULT_STRIP_OVERLAP, help="Перекриття смуг у пікселях")
+    parser.add_argument("--strip-workers", type=int, default=1, help="Потоків для паралельного розпізнавання смуг")
+    parser.add_argument("--ocr-workers", type=int, default=1, help="Кількість потоків розпізнавання")
+    parser.add_argument("--translate-workers", type=int, default=2, help="Кількість потоків перекладу")
+    parser.add_argument("--render-workers", type=int, default=2, help="Кількість потоків відтворення")
+    parser.add_argument("--chapter-batch", action="store_true",
+                        help="Спершу розпізнати всі сторінки, а потім перекласти речення розділу спільними пакетами")
+    parser.add_argument("--max-requests", type=int, default=4,
+                        help="Максимум одночасних запитів до сервісу перекладу")
+    parser.add_argument("--queue-size", type=int, default=2, help="Розмір черги між етапами")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    if not os.path.isdir(args.input_dir):
+        print(f"Помилка: папку '{args.input_dir}' не знайдено.")
+        return 2
+    pages = find_pages(args.input_dir)
+    if not pages:
+        print(f"Помилка: у папці '{args.input_dir}' немає зображень.")
+        return 2
+    output_dir = args.output or args.input_dir.rstrip("/\\") + "_translated"
+    os.makedirs(output_dir, exist_ok=True)
+
+    api_key = args.api_key
+    if args.service not in KEYLESS_SERVICES:
+        # Кілька ключів DeepL працюють як один пул з сумарною квотою
+        api_key = api_key or ApiKeyManager().get_key_pool(args.service)
+        if not api_key:
+            print(f"Помилка: для сервісу '{args.service}' не встановлено жодного API ключа.")
+            return 2
+        if len(api_key) > 1:
+            print(f"Ключів {args.service}: {len(api_key)}, запити розподіляються між ними.")
+
+    app = QGuiApplication(sys.argv[:1])
+    fonts = load_fonts(args.fonts_dir)
+    font_name = args.font or (fonts[0] if fonts else DEFAULT_FONT)
+
+    print(f"Завантаження OCR-моделей для {OCR_LANGS}...")
+    ocr_pool = None
+    if args.ocr_daemon:
+        reader = start_daemon(port=args.ocr_daemon_port, langs=OCR_LANGS, gpu=not args.cpu)
+        device = f"служба OCR, {reader.device}"
+    elif args.ocr_processes > 0:
+        ocr_pool = OcrProcessPool(args.ocr_processes, OCR_LANGS, args.ocr_threads)
+        ocr_pool.warmup()
+        reader, device = ocr_pool, f"CPU, {ocr_pool.processes} процесів x {ocr_pool.threads_per_worker} потоків"
+        # Кожен потік етапу OCR тримає зайнятим один процес пулу
+        args.ocr_workers = max(args.ocr_workers, ocr_pool.processes)
+    else:
+        reader, device = create_reader(OCR_LANGS, gpu=not args.cpu)
+    print(f"OCR готовий ({device}).")
+
+    model = args.model or ApiKeyManager().get_model(args.service)
+    translator = BatchingTranslator(create_translator(args.service, api_key, model=model), max_concurrency=args.max_requests)
+    memory = None
+    if not args.no_cache:
+        memory = TranslationMemory()
+        translator = CachedTranslator(translator, memory, args.service)
+
+    ocr_cache = None if args.no_ocr_cache else OcrCache()
+    ocr_stage = PipelineStage("ocr", lambda path: ocr_page(reader, path, font_name, args.font_size, ocr_cache,
+                                                           args.strip_height, args.strip_overlap, args.strip_workers,
+                                                           not args.no_auto_fit),
+                              args.ocr_workers)
+    translate_stage = PipelineStage("translate", lambda page: translate_page(page, translator, args.src, args.dest),
+                                    args.translate_workers)
+    render_stage = PipelineStage("render", lambda page: render_and_save(page, output_dir, args.text_removal),
+                                 args.render_workers)
+
+    done = [0]
+    def report(result):
+        done[0] += 1
+        path = pages[result.index]
+        if result.ok:
+            page = result.item
+            print(f"[{done[0]}/{len(pages)}] {os.path.basename(path)} -> {page['output']} "
+                  f"({len(page['found_rects'])} блоків, {len(page['groups'])} речень)")
+        else:
+            print(f"[{done[0]}/{len(pages)}] Помилка обробки {path} на етапі '{result.stage}':")
+            print(result.error[2])
+
+    started = time.perf_counter()
+    try:
+        if args.chapter_batch:
+            stages = [ocr_stage, render_stage]
+            results = run_chapter_batched(pages, ocr_stage, render_stage, translator,
+                                          args.src, args.dest, args.queue_size, report)
+        else:
+            stages = [ocr_stage, translate_stage, render_stage]
+            results = PagePipeline(stages, queue_size=args.queue_size).run(pages, on_result=report)
+    finally:
+        if ocr_pool:
+            ocr_pool.shutdown()
+    failed = sum(1 for result in results if not result.ok)
+    elapsed = time.perf_counter() - started
+    print(f"Готово: {len(pages) - failed}/{len(pages)} сторінок за {elapsed:.1f} с. Результати: {output_dir}")
+    for stage in stages:
+        print(f"  {stage.name}: {stage.processed} стор., {stage.busy_time:.1f} с роботи, потоків: {stage.workers}")
+    if memory:
+        stats = memory.stats()
+        print(f"Пам'ять перекладів: з кешу {stats['hits']}, через мережу {stats['misses']}.")
+    if ocr_cache:
+        print(f"Кеш OCR: з кешу {ocr_cache.hits} стор., розпізнано {ocr_cache.misses} стор.")
+    del app
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
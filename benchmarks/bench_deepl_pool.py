@@ -0,0 +1,178 @@
+# benchmarks/bench_deepl_pool.py
+# Перевірка пулу ключів DeepL на локальній заглушці API: перемикання при вичерпаній
+# квоті (456), відпочинок ключа після 429 з обмеженим очікуванням і вилучення
+# відхилених ключів (403). Для кожного сценарію друкує розподіл запитів між ключами.
+#   python benchmarks/bench_deepl_pool.py --sentences 120
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chapter_batcher import BatchingTranslator
+from translators import DeepLKeyPool, is_translation_error
+
+
+# ======================================================================
+# ЗАГЛУШКА API
+# ======================================================================
+class MockDeepLHandler(BaseHTTPRequestHandler):
+    """/v2/usage і /v2/translate з квотою символів на ключ; «переклад» — текст великими літерами."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    quota = {}              # ключ -> ліміт символів; ключів, яких тут немає, сервіс не знає (403)
+    used = {}
+    requests = {}
+    rate_limited = set()    # ключі, що на кожен переклад відповідають 429
+    lock = threading.Lock()
+
+    def _reply(self, status, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self):
+        key = self.headers.get('Authorization', '').split()[-1]
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        cls = type(self)
+        if key not in cls.quota:
+            return self._reply(403, {'message': "Wrong endpoint or invalid auth key"})
+        if self.path.startswith("/v2/usage"):
+            return self._reply(200, {'character_count': cls.used[key], 'character_limit': cls.quota[key]})
+        try:
+            texts = json.loads(body)['text']
+        except ValueError:
+            texts = urllib.parse.parse_qs(body.decode('utf-8'))['text']
+        with cls.lock:
+            cls.requests[key] += 1
+            if key in cls.rate_limited:
+                return self._reply(429, {'message': "Too many requests"})
+            characters = sum(len(text) for text in texts)
+            if cls.used[key] + characters > cls.quota[key]:
+                return self._reply(456, {'message': "Quota exceeded"})
+            cls.used[key] += characters
+        self._reply(200, {'translations': [{'detected_source_language': 'EN', 'text': text.upper(),
+                                            'billed_characters': len(text)} for text in texts]})
+
+    do_GET = do_POST = _handle
+
+    def log_message(self, *args):
+        pass
+
+    @classmethod
+    def reset(cls, quota, rate_limited=()):
+        cls.quota = dict(quota)
+        cls.used = {key: 0 for key in quota}
+        cls.requests = {key: 0 for key in quota}
+        cls.rate_limited = set(rate_limited)
+
+
+# ======================================================================
+# СЦЕНАРІЇ
+# ======================================================================
+BATCH_ITEMS = 10
+
+
+def chapter_texts(sentences):
+    return [f"sentence number {i}" for i in range(sentences)]
+
+
+def translate_chapter(pool, sentences):
+    items = [{'text': text} for text in chapter_texts(sentences)]
+    BatchingTranslator(pool, max_concurrency=3, max_items=BATCH_ITEMS).translate_batch(items, 'en', 'uk')
+    correct = sum(item['translated'] == item['text'].upper() for item in items)
+    errors = {item['translated'] for item in items if is_translation_error(item['translated'])}
+    return correct, errors
+
+
+def scenario_quota_failover(server_url, sentences):
+    """Першому ключу не вистачає квоти, другий ключ відхилено — розділ усе одно перекладається.
+
+    Без попередньої перевірки пул не знає залишків, тож обидві помилки приходять під час перекладу.
+    Квота першого ключа — половина найменшого пакета, тож 456 буде за будь-якої довжини розділу."""
+    texts = chapter_texts(sentences)
+    smallest_batch = min(sum(map(len, texts[i:i + BATCH_ITEMS])) for i in range(0, len(texts), BATCH_ITEMS))
+    MockDeepLHandler.reset({'small:fx': smallest_batch // 2, 'big1:fx': 100_000, 'big2:fx': 100_000})
+    pool = DeepLKeyPool(['small:fx', 'bad:fx', 'big1:fx', 'big2:fx'], validate=False, server_url=server_url)
+    correct, errors = translate_chapter(pool, sentences)
+    available = {key: ok for key, _, ok in pool.usage()}
+    ok = correct == sentences and not available['small:fx'] and not available['bad:fx']
+    return ok, f"перекладено {correct}/{sentences}"
+
+
+def scenario_rate_limit_cooldown(server_url, sentences):
+    """Ключ, що відповідає 429, відпочиває, а запити йдуть на інший."""
+    MockDeepLHandler.reset({'busy:fx': 100_000, 'free:fx': 100_000}, rate_limited={'busy:fx'})
+    pool = DeepLKeyPool(['busy:fx', 'free:fx'], server_url=server_url)
+    correct, errors = translate_chapter(pool, sentences)
+    return correct == sentences, f"перекладено {correct}/{sentences}"
+
+
+def scenario_rate_limit_bounded(server_url, sentences):
+    """Усі ключі відповідають 429 — запит завершується помилкою, а не чекає вічно."""
+    MockDeepLHandler.reset({'busy1:fx': 100_000, 'busy2:fx': 100_000}, rate_limited={'busy1:fx', 'busy2:fx'})
+    pool = DeepLKeyPool(['busy1:fx', 'busy2:fx'], server_url=server_url)
+    pool.RATE_LIMIT_COOLDOWN = 0.1
+    pool.MAX_RATE_LIMIT_WAIT = 0.5
+    started = time.perf_counter()
+    correct, errors = translate_chapter(pool, 10)
+    elapsed = time.perf_counter() - started
+    return correct == 0 and elapsed < 5 and any("забагато запитів" in e for e in errors), f"помилка за {elapsed:.1f} с"
+
+
+def scenario_all_rejected(server_url, sentences):
+    """Усі ключі відхилено — повідомлення про це, а не про вичерпану квоту."""
+    MockDeepLHandler.reset({})
+    pool = DeepLKeyPool(['bad1:fx', 'bad2:fx'], validate=False, server_url=server_url)
+    correct, errors = translate_chapter(pool, 10)
+    return correct == 0 and all("відхилено" in e and "квот" not in e for e in errors), "; ".join(errors)
+
+
+def scenario_all_exhausted(server_url, sentences):
+    """Квоту всіх ключів вичерпано — повідомлення про квоту."""
+    MockDeepLHandler.reset({'empty1:fx': 0, 'empty2:fx': 0})
+    pool = DeepLKeyPool(['empty1:fx', 'empty2:fx'], validate=False, server_url=server_url)
+    correct, errors = translate_chapter(pool, 10)
+    return correct == 0 and all("квоту всіх ключів" in e for e in errors), "; ".join(errors)
+
+
+SCENARIOS = [
+    ("квота 456", scenario_quota_failover),
+    ("429, відпочинок", scenario_rate_limit_cooldown),
+    ("429 на всіх", scenario_rate_limit_bounded),
+    ("ключі відхилено", scenario_all_rejected),
+    ("квоту вичерпано", scenario_all_exhausted),
+]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Перевірка пулу ключів DeepL на заглушці API.")
+    parser.add_argument("--sentences", type=int, default=120, help="Речень у розділі")
+    args = parser.parse_args(argv)
+
+    import deepl
+    # Власні повтори бібліотеки на 429 приховали б поведінку пулу
+    deepl.http_client.max_network_retries = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockDeepLHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server_url = f"http://127.0.0.1:{server.server_port}"
+
+    failed = 0
+    for name, scenario in SCENARIOS:
+        ok, details = scenario(server_url, args.sentences)
+        failed += not ok
+        print(f"{name:>16}: {'OK' if ok else 'НЕПРАВИЛЬНО'}  {details}  запитів {MockDeepLHandler.requests}")
+    server.shutdown()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
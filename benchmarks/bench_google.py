@@ -0,0 +1,139 @@
+# benchmarks/bench_google.py
+# Перевірка FastGoogleTranslator на локальній заглушці endpoint translate_a/single:
+# пакетний режим (речення через роздільник в одному запиті) проти запиту на речення,
+# повтори після 429/503, ліміт частоти і запасний шлях, коли сервіс зливає рядки пакета.
+#   python benchmarks/bench_google.py --sentences 80 --rate 20
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from translators import FastGoogleTranslator
+
+
+# ======================================================================
+# ЗАГЛУШКА API
+# ======================================================================
+class MockGoogleHandler(BaseHTTPRequestHandler):
+    """Відповідає у форматі translate_a/single; «переклад» кожного рядка — текст у лапках."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    requests = 0
+    failures = []           # коди відповідей для наступних запитів, по одному на запит
+    merge_lines = False     # відповідати на пакет одним рядком, як інколи робить сервіс
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        text = urllib.parse.parse_qs(body.decode('utf-8'))['q'][0]
+        cls = type(self)
+        with cls.lock:
+            cls.requests += 1
+            status = cls.failures.pop(0) if cls.failures else 200
+        if status != 200:
+            return self._reply(status, {'error': "mock failure"})
+        lines = text.split("\n")
+        if cls.merge_lines and len(lines) > 1:
+            lines = [" ".join(lines)]
+        # Сервіс ділить переклад на сегменти; роздільник рядків лишається в кінці сегмента
+        segments = [[f"«{line}»" + ("\n" if i < len(lines) - 1 else ""), line] for i, line in enumerate(lines)]
+        self._reply(200, [segments, None, "ko"])
+
+    def _reply(self, status, data):
+        payload = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+    @classmethod
+    def reset(cls, failures=(), merge_lines=False):
+        cls.requests = 0
+        cls.failures = list(failures)
+        cls.merge_lines = merge_lines
+
+
+# ======================================================================
+# СЦЕНАРІЇ
+# ======================================================================
+def translate(translator, sentences):
+    items = [{'text': f"문장 {i} 잠깐 어디 가"} for i in range(sentences)]
+    started = time.perf_counter()
+    translator.translate_batch(items, 'ko', 'uk')
+    elapsed = time.perf_counter() - started
+    correct = sum(item['translated'] == f"«{item['text']}»" for item in items)
+    return correct, elapsed
+
+
+def run_scenarios(base_url, sentences, rate):
+    """Повертає [(назва, успіх, подробиці)]."""
+    results = []
+
+    def make(**kwargs):
+        return FastGoogleTranslator(base_url=base_url, requests_per_second=kwargs.pop('rate', 1000.0), **kwargs)
+
+    MockGoogleHandler.reset()
+    correct, elapsed = translate(make(batch_mode=False), sentences)
+    per_sentence = MockGoogleHandler.requests
+    results.append(("запит на речення", correct == sentences and per_sentence == sentences,
+                    f"перекладено {correct}/{sentences}, запитів {per_sentence}, {elapsed:.2f} с"))
+
+    MockGoogleHandler.reset()
+    correct, elapsed = translate(make(batch_mode=True), sentences)
+    batched = MockGoogleHandler.requests
+    results.append(("пакетний режим", correct == sentences and batched < max(2, per_sentence),
+                    f"перекладено {correct}/{sentences}, запитів {batched}, {elapsed:.2f} с"))
+
+    # Перші запити отримують 429 і 503 — retry_with_backoff має їх повторити
+    MockGoogleHandler.reset(failures=[429, 503])
+    correct, elapsed = translate(make(batch_mode=True, concurrency=1), sentences)
+    results.append(("повтори 429/503", correct == sentences and MockGoogleHandler.requests == batched + 2,
+                    f"перекладено {correct}/{sentences}, запитів {MockGoogleHandler.requests}, {elapsed:.2f} с"))
+
+    # Сервіс злив рядки пакета — переклад іде по одному реченню
+    MockGoogleHandler.reset(merge_lines=True)
+    correct, elapsed = translate(make(batch_mode=True), sentences)
+    results.append(("злиті рядки", correct == sentences,
+                    f"перекладено {correct}/{sentences}, запитів {MockGoogleHandler.requests}, {elapsed:.2f} с"))
+
+    # Запити понад початковий сплеск (burst = concurrency) не можуть іти частіше за rate на секунду
+    MockGoogleHandler.reset()
+    translator = make(batch_mode=False, rate=rate, concurrency=4)
+    correct, elapsed = translate(translator, sentences)
+    minimum = max(0, sentences - translator.rate_limiter.capacity) / rate
+    results.append(("ліміт частоти", correct == sentences and elapsed >= minimum * 0.9,
+                    f"{sentences} запитів за {elapsed:.2f} с (не швидше за {minimum:.2f} с при {rate:g}/с)"))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Перевірка швидкого Google-перекладача на заглушці API.")
+    parser.add_argument("--sentences", type=int, default=80, help="Речень у розділі")
+    parser.add_argument("--rate", type=float, default=40.0, help="Ліміт запитів на секунду для сценарію ліміту")
+    args = parser.parse_args(argv)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockGoogleHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}/translate_a/single"
+
+    failed = 0
+    for name, ok, details in run_scenarios(base_url, args.sentences, args.rate):
+        failed += not ok
+        print(f"{name:>18}: {'OK' if ok else 'НЕПРАВИЛЬНО'}  {details}")
+    server.shutdown()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
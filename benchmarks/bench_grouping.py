@@ -0,0 +1,92 @@
+# benchmarks/bench_grouping.py
+# Мікро-бенчмарк групування OCR-блоків на синтетичних сторінках з великою кількістю блоків.
+# Перед вимірюванням перевіряє обидва алгоритми на невеликій сторінці з відомою відповіддю.
+#   python benchmarks/bench_grouping.py --boxes 500 2000 --repeat 20
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from text_grouping import group_text_bubbles, group_text_bubbles_sequential
+
+
+def synthetic_page(box_count, width=800, seed=0):
+    """Генерує бульбашки по 2–5 рядків, розкидані по довгій сторінці, іноді по дві поруч."""
+    rng = random.Random(seed)
+    results = []
+    y = 50
+    while len(results) < box_count:
+        columns = rng.choice([1, 1, 2])
+        for column in range(columns):
+            bubble_x = 40 + column * (width // 2)
+            line_y = y
+            for _ in range(rng.randint(2, 5)):
+                line_width = rng.uniform(80, width // 2 - 80)
+                line_height = rng.uniform(18, 32)
+                x = bubble_x + rng.uniform(0, 40)
+                results.append(([[x, line_y], [x + line_width, line_y],
+                                 [x + line_width, line_y + line_height], [x, line_y + line_height]],
+                                "텍스트", 0.9))
+                line_y += line_height + rng.uniform(2, 10)
+        y += rng.uniform(250, 500)
+    return results[:box_count]
+
+
+def line(x, y, width, height=24):
+    return ([[x, y], [x + width, y], [x + width, y + height], [x, y + height]], "텍스트", 0.9)
+
+
+# Дві бульбашки поруч, рядки яких чергуються за висотою, і під ними — бульбашка з трьох рядків
+FIXTURE = [
+    line(40, 100, 260), line(460, 104, 240),
+    line(52, 132, 230), line(470, 138, 220),
+    line(40, 164, 250), line(465, 170, 200),
+    line(200, 320, 300), line(190, 352, 330), line(210, 384, 280),
+]
+FIXTURE_GROUPS = [[0, 2, 4], [1, 3, 5], [6, 7, 8]]
+
+
+def check_fixture():
+    """Бульбашки поруч мають розділятися, а рядки однієї бульбашки — зливатися.
+
+    Послідовний алгоритм тут помиляється навмисно — він показує, чому кількість груп різниться."""
+    results = {}
+    for name, fn in (("послідовний", group_text_bubbles_sequential), ("union-find", group_text_bubbles)):
+        groups = results[name] = sorted(sorted(group) for group in fn(FIXTURE))
+        print(f"{name:>12}: {'OK' if groups == FIXTURE_GROUPS else 'НЕПРАВИЛЬНО'} {groups}")
+    return results["union-find"] == FIXTURE_GROUPS
+
+
+def measure(fn, results, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(results)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Порівняння алгоритмів групування OCR-блоків.")
+    parser.add_argument("--boxes", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    print(f"Контрольна сторінка, очікувані групи {FIXTURE_GROUPS}:")
+    if not check_fixture():
+        return 1
+    print()
+    print(f"{'блоків':>8} {'алгоритм':>12} {'медіана, мс':>12} {'макс, мс':>10} {'груп':>6}")
+    for box_count in args.boxes:
+        results = synthetic_page(box_count)
+        for name, fn in (("послідовний", group_text_bubbles_sequential), ("union-find", group_text_bubbles)):
+            median, worst = measure(fn, results, args.repeat)
+            print(f"{box_count:>8} {name:>12} {median:>12.2f} {worst:>10.2f} {len(fn(results)):>6}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+# benchmarks/bench_layout.py
+# Мікро-бенчмарк автопідбору розміру шрифту для сторінки з великою кількістю бульбашок.
+#   python benchmarks/bench_layout.py --bubbles 100 --repeat 20
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtGui import QGuiApplication
+from PyQt6.QtCore import QRect
+
+from renderer import DEFAULT_FONT, font_size_for
+from text_layout import clear_layout_cache
+
+WORDS = "я не знаю що тут сталося але нам треба йти негайно поки вони не повернулися".split()
+
+
+def synthetic_rects(bubble_count, font, seed=0):
+    rng = random.Random(seed)
+    return [
+        {'rect': QRect(rng.randint(0, 600), rng.randint(0, 20000), rng.randint(60, 300), rng.randint(30, 160)),
+         'translated': " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 14))),
+         'font': font, 'font_size': 14, 'auto_fit': True}
+        for _ in range(bubble_count)
+    ]
+
+
+def measure(found_rects, repeat, cold):
+    timings = []
+    for _ in range(repeat):
+        if cold:
+            clear_layout_cache()
+        started = time.perf_counter()
+        for item in found_rects:
+            font_size_for(item)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Швидкість автопідбору розміру шрифту.")
+    parser.add_argument("--bubbles", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--font", default=DEFAULT_FONT)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    app = QGuiApplication(sys.argv[:1])
+    print(f"{'бульбашок':>10} {'кеш':>10} {'медіана, мс':>12} {'макс, мс':>10}")
+    for bubble_count in args.bubbles:
+        found_rects = synthetic_rects(bubble_count, args.font)
+        for name, cold in (("холодний", True), ("теплий", False)):
+            median, worst = measure(found_rects, args.repeat, cold)
+            print(f"{bubble_count:>10} {name:>10} {median:>12.2f} {worst:>10.2f}")
+    del app
+
+
+if __name__ == '__main__':
+    main()
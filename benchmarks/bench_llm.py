@@ -0,0 +1,114 @@
+# benchmarks/bench_llm.py
+# Порівняння кількості запитів на розділ: перекладачі на чат-моделях (пакування сторінок
+# під бюджет токенів) проти одного запиту на бульбашку. Сервіс — локальна заглушка
+# OpenAI-сумісного або Gemini API з потоковими відповідями та затримкою на запит.
+# Завершується з кодом 1, якщо переклад неповний або пакування не зменшило кількості запитів.
+#   python benchmarks/bench_llm.py --pages 40 --bubbles 8 --backend gpt --latency 0.3
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chapter_batcher import BatchingTranslator, translate_pages
+from llm_translators import OpenAITranslator, GeminiTranslator
+
+WORDS = "잠깐 어디 가는 거야 지금 당장 돌아와 나는 너를 믿어 그건 말도 안 돼 빨리 도망쳐".split()
+
+
+# ======================================================================
+# ЗАГЛУШКА API
+# ======================================================================
+class MockChatHandler(BaseHTTPRequestHandler):
+    """Відповідає на /chat/completions і :streamGenerateContent подіями SSE з «перекладом» (текст у дужках)."""
+    protocol_version = "HTTP/1.1"
+    # Без цього дрібні фрагменти потоку чекають на затримане підтвердження TCP
+    disable_nagle_algorithm = True
+    latency = 0.0
+    requests = 0
+
+    def do_POST(self):
+        type(self).requests += 1
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        if self.path.endswith("/chat/completions"):
+            user = body['messages'][-1]['content']
+            wrap = lambda text: {'choices': [{'delta': {'content': text}}]}
+        else:
+            user = body['contents'][-1]['parts'][0]['text']
+            wrap = lambda text: {'candidates': [{'content': {'parts': [{'text': text}]}}]}
+        bubbles = json.loads(user)['bubbles']
+        reply = json.dumps({'translations': [{'id': b['id'], 'text': f"«{b['text']}»"} for b in bubbles]},
+                           ensure_ascii=False)
+        time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        events = [wrap(reply[i:i + 40]) for i in range(0, len(reply), 40)]
+        lines = [f"data: {json.dumps(event, ensure_ascii=False)}\n\n" for event in events] + ["data: [DONE]\n\n"]
+        for line in lines:
+            data = line.encode('utf-8')
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+def synthetic_chapter(pages, bubbles, seed=0):
+    rng = random.Random(seed)
+    return [[" ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 8))) for _ in range(bubbles)]
+            for _ in range(pages)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Запити на розділ: пакетний LLM-переклад проти запиту на бульбашку.")
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--bubbles", type=int, default=8, help="Речень на сторінці")
+    parser.add_argument("--backend", choices=["gpt", "gemini"], default="gpt")
+    parser.add_argument("--latency", type=float, default=0.2, help="Затримка заглушки на запит, с")
+    parser.add_argument("--max-prompt-tokens", type=int, default=3000)
+    args = parser.parse_args(argv)
+
+    MockChatHandler.latency = args.latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockChatHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}/v1"
+    backend = OpenAITranslator if args.backend == "gpt" else GeminiTranslator
+    chapter = synthetic_chapter(args.pages, args.bubbles)
+    bubble_count = sum(len(page) for page in chapter)
+
+    print(f"{'режим':>22} {'запитів':>8} {'час, с':>8}")
+    request_counts = {}
+    ok = True
+    for name, per_bubble in (("запит на бульбашку", True), ("пакети під токени", False)):
+        translator = backend("test-key", model="mock", base_url=base_url, max_prompt_tokens=args.max_prompt_tokens)
+        MockChatHandler.requests = 0
+        started = time.perf_counter()
+        if per_bubble:
+            translations = [[translator.translate_batch([{'text': text}], 'ko', 'uk')[0]['translated'] for text in page]
+                            for page in chapter]
+        else:
+            translations = translate_pages(BatchingTranslator(translator), chapter, 'ko', 'uk')
+        elapsed = time.perf_counter() - started
+        correct = sum(translated == f"«{text}»"
+                      for page, page_translations in zip(chapter, translations)
+                      for text, translated in zip(page, page_translations))
+        print(f"{name:>22} {MockChatHandler.requests:>8} {elapsed:>8.2f}   (перекладено {correct}/{bubble_count})")
+        request_counts[per_bubble] = MockChatHandler.requests
+        ok = ok and correct == bubble_count
+    server.shutdown()
+    # З однієї бульбашки менше ніж один запит не вийде
+    if bubble_count > 1 and request_counts[False] >= request_counts[True]:
+        print("Пакетний режим не зменшив кількості запитів.")
+        ok = False
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,191 @@
+# benchmarks/bench_pipeline.py
+# Відтворюваний бенчмарк конвеєра OCR → групування → переклад → відтворення → збереження
+# на синтетичних сторінках із заглушками сервісів. Результат — JSON з часом кожного етапу.
+#   python benchmarks/bench_pipeline.py --pages 20 --ocr-latency 0.2 --translate-latency 0.1 -o bench.json
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtGui import QGuiApplication, QImage, QPainter, QColor, QFont
+from PyQt6.QtCore import Qt, QRect, QRectF
+
+from translators import BaseTranslator
+from text_grouping import bbox_to_rect, group_text_bubbles, distribute_text_to_group, group_sentences
+from renderer import render_page, DEFAULT_FONT, DEFAULT_FONT_SIZE
+
+STAGES = ["load", "readtext", "group", "translate", "distribute", "render", "save"]
+
+
+# ======================================================================
+# ЗАГЛУШКИ СЕРВІСІВ
+# ======================================================================
+class FakeOcrReader:
+    """Повертає заздалегідь відому розмітку сторінки із затримкою, що імітує easyocr."""
+
+    def __init__(self, layouts, latency=0.0, latency_per_box=0.0):
+        self.layouts = layouts
+        self.latency = latency
+        self.latency_per_box = latency_per_box
+
+    def readtext(self, image_path):
+        boxes = self.layouts[image_path]
+        time.sleep(self.latency + self.latency_per_box * len(boxes))
+        return [([list(point) for point in bbox], text, prob) for bbox, text, prob in boxes]
+
+
+class FakeTranslator(BaseTranslator):
+    """Перекладач-заглушка з налаштовуваною затримкою на запит і на речення."""
+
+    def __init__(self, latency=0.0, latency_per_item=0.0):
+        self.latency = latency
+        self.latency_per_item = latency_per_item
+        self.requests = 0
+
+    def translate_batch(self, items: list[dict], src_lang: str, dest_lang: str) -> list[dict]:
+        self.requests += 1
+        time.sleep(self.latency + self.latency_per_item * len(items))
+        for item in items:
+            item['translated'] = f"[{dest_lang}] {item['text']}" if item['text'].strip() else ''
+        return items
+
+
+# ======================================================================
+# СИНТЕТИЧНІ СТОРІНКИ
+# ======================================================================
+def generate_page(path, rng, width=800, height=6000, bubbles=8):
+    """Малює «манхва-подібну» сторінку: кольоровий фон і бульбашки з кількома рядками тексту.
+    Повертає розмітку у форматі easyocr."""
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(QColor(rng.randint(40, 220), rng.randint(40, 220), rng.randint(40, 220)))
+    painter = QPainter(image)
+    painter.setFont(QFont(DEFAULT_FONT, 18))
+    boxes = []
+    for _ in range(bubbles):
+        bubble_w, bubble_h = rng.randint(220, 360), rng.randint(120, 220)
+        x, y = rng.randint(0, width - bubble_w), rng.randint(0, height - bubble_h)
+        painter.setBrush(QColor("white"))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.drawEllipse(QRectF(x, y, bubble_w, bubble_h))
+        painter.setPen(QColor("black"))
+        line_y = y + 30
+        for line in range(rng.randint(2, 4)):
+            line_w, line_h = rng.randint(100, bubble_w - 60), 26
+            line_x = x + (bubble_w - line_w) // 2
+            text = f"대사 {line} " * 2
+            painter.drawText(QRect(line_x, line_y, line_w, line_h), int(Qt.AlignmentFlag.AlignCenter), text)
+            boxes.append(([(line_x, line_y), (line_x + line_w, line_y),
+                           (line_x + line_w, line_y + line_h), (line_x, line_y + line_h)], text, 0.95))
+            line_y += line_h + 4
+    painter.end()
+    image.save(path)
+    return boxes
+
+
+# ======================================================================
+# ВИМІРЮВАННЯ
+# ======================================================================
+def percentile(values, q):
+    if not values:
+        return 0.0
+    # Метод найближчого рангу
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def process_page(path, reader, translator, output_dir, timings):
+    def timed(stage, fn, *args):
+        started = time.perf_counter()
+        result = fn(*args)
+        timings[stage].append(time.perf_counter() - started)
+        return result
+
+    image = timed("load", QImage, path)
+    ocr_results = timed("readtext", reader.readtext, path)
+    groups = timed("group", group_text_bubbles, ocr_results)
+    found_rects = [{'rect': QRect(*bbox_to_rect(bbox)), 'text': text, 'translated': '',
+                    'font': DEFAULT_FONT, 'font_size': DEFAULT_FONT_SIZE}
+                   for bbox, text, _ in ocr_results]
+    items = [{'text': sentence} for sentence in group_sentences(found_rects, groups)]
+    items = timed("translate", translator.translate_batch, items, 'ko', 'uk')
+
+    def distribute():
+        for group, item in zip(groups, items):
+            distribute_text_to_group(found_rects, group, item['translated'])
+    timed("distribute", distribute)
+    rendered = timed("render", render_page, image, found_rects)
+    out_path = os.path.join(output_dir, os.path.basename(path))
+    timed("save", rendered.save, out_path)
+
+
+def summarize(timings, pages, wall_time):
+    report = {'pages': pages, 'wall_time_s': round(wall_time, 4),
+              'pages_per_s': round(pages / wall_time, 3) if wall_time else None, 'stages': {}}
+    for stage in STAGES:
+        values = timings[stage]
+        total = sum(values)
+        report['stages'][stage] = {
+            'count': len(values),
+            'total_s': round(total, 4),
+            'p50_ms': round(percentile(values, 50) * 1000, 3),
+            'p95_ms': round(percentile(values, 95) * 1000, 3),
+            'throughput_per_s': round(len(values) / total, 2) if total else None,
+        }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк етапів обробки сторінок із заглушками сервісів.")
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--height", type=int, default=6000, help="Висота синтетичної сторінки")
+    parser.add_argument("--bubbles", type=int, default=8, help="Бульбашок на сторінці")
+    parser.add_argument("--ocr-latency", type=float, default=0.0, help="Затримка заглушки OCR на сторінку, с")
+    parser.add_argument("--translate-latency", type=float, default=0.0, help="Затримка заглушки перекладу на запит, с")
+    parser.add_argument("--real-ocr", action="store_true", help="Використати справжній easyocr замість заглушки")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="Файл для JSON-звіту (за замовчуванням — stdout)")
+    args = parser.parse_args(argv)
+
+    app = QGuiApplication(sys.argv[:1])
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as work_dir:
+        input_dir = os.path.join(work_dir, "pages")
+        output_dir = os.path.join(work_dir, "out")
+        os.makedirs(input_dir)
+        os.makedirs(output_dir)
+        layouts = {}
+        for i in range(args.pages):
+            path = os.path.join(input_dir, f"{i:03d}.png")
+            layouts[path] = generate_page(path, rng, height=args.height, bubbles=args.bubbles)
+
+        if args.real_ocr:
+            from ocr_engine import create_reader
+            reader, _ = create_reader()
+        else:
+            reader = FakeOcrReader(layouts, args.ocr_latency)
+        translator = FakeTranslator(args.translate_latency)
+
+        timings = {stage: [] for stage in STAGES}
+        started = time.perf_counter()
+        for path in sorted(layouts):
+            process_page(path, reader, translator, output_dir, timings)
+        report = summarize(timings, args.pages, time.perf_counter() - started)
+
+    text = json.dumps(report, indent=4, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+    del app
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# chapter_batcher.py
+# Пакування речень з багатьох сторінок у великі запити до сервісу перекладу.
+# Замість одного запиту на сторінку (3–10 речень) розділ перекладається кількома
+# запитами, заповненими майже до лімітів сервісу, які відправляються паралельно.
+from concurrent.futures import ThreadPoolExecutor
+
+from translators import BaseTranslator
+
+# Ліміти за замовчуванням для сервісів, які не оголосили власних
+DEFAULT_MAX_BATCH_ITEMS = 50
+DEFAULT_MAX_BATCH_BYTES = 30_000
+
+
+def pack_batches(texts, max_items, max_bytes):
+    """Розбиває тексти на пакети, що вкладаються в ліміти. Повертає списки індексів."""
+    batches = []
+    current, current_bytes = [], 0
+    for index, text in enumerate(texts):
+        size = len(text.encode('utf-8'))
+        if current and (len(current) >= max_items or current_bytes + size > max_bytes):
+            batches.append(current)
+            current, current_bytes = [], 0
+        # Текст, більший за ліміт, усе одно йде окремим пакетом — сервіс поверне помилку саме для нього
+        current.append(index)
+        current_bytes += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+class BatchingTranslator(BaseTranslator):
+    """Перекладач, що ділить великий список речень на пакети і відправляє їх паралельно."""
+
+    def __init__(self, translator: BaseTranslator, max_concurrency=4, max_items=None, max_bytes=None):
+        self.translator = translator
+        self.max_concurrency = max_concurrency
+        self.max_items = max_items or getattr(translator, 'MAX_BATCH_ITEMS', DEFAULT_MAX_BATCH_ITEMS)
+        self.max_bytes = max_bytes or getattr(translator, 'MAX_BATCH_BYTES', DEFAULT_MAX_BATCH_BYTES)
+
+    def translate_batch(self, items: list[dict], src_lang: str, dest_lang: str) -> list[dict]:
+        to_translate = [item for item in items if item['text'].strip()]
+        for item in items:
+            if not item['text'].strip():
+                item['translated'] = ''
+        if not to_translate:
+            return items
+
+        batches = pack_batches([item['text'] for item in to_translate], self.max_items, self.max_bytes)
+
+        def run(batch):
+            request = [{'text': to_translate[i]['text']} for i in batch]
+            return batch, self.translator.translate_batch(request, src_lang, dest_lang)
+
+        if len(batches) == 1 or self.max_concurrency <= 1:
+            results = [run(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as executor:
+                results = list(executor.map(run, batches))
+
+        for batch, translated in results:
+            for i, result in zip(batch, translated):
+                to_translate[i]['translated'] = result.get('translated', '')
+        return items
+
+
+def translate_pages(translator: BaseTranslator, pages_sentences, src_lang, dest_lang):
+    """Перекладає речення кількох сторінок одним викликом і повертає переклади посторінково."""
+    flat = [{'text': sentence} for sentences in pages_sentences for sentence in sentences]
+    flat = translator.translate_batch(flat, src_lang, dest_lang)
+    translations, start = [], 0
+    for sentences in pages_sentences:
+        translations.append([item.get('translated', '') for item in flat[start:start + len(sentences)]])
+        start += len(sentences)
+    return translations
@@ -6,7 +6,7 @@ from PyQt6.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
 
 # Імпортуємо необхідні класи з інших файлів
 from api_manager import ApiKeyManager
-from translators import GoogleTranslator, DeepLTranslator
+from translators import LLM_SERVICES, get_translator, is_translation_error
 
 # Використовуємо той самий клас Worker, що і в main.py
 class Worker(QObject):
@@ -110,19 +110,16 @@ class ServiceCheckDialog(QDialog):
         self.result_text.clear()
 
         self.thread = QThread()
-        self.worker = Worker(self._translation_task, text_to_check, service, api_key)
+        self.worker = Worker(self._translation_task, text_to_check, service, api_key, self.key_manager.get_model(service))
         self.worker.moveToThread(self.thread)
         self.thread.started.connect(self.worker.run)
         self.worker.finished.connect(self.on_check_finished)
         self.thread.start()
 
-    def _translation_task(self, text, service, api_key):
+    def _translation_task(self, text, service, api_key, model=None):
         """Ця функція виконується в окремому потоці."""
-        translator = None
-        if service == 'deepl':
-            translator = DeepLTranslator(api_key)
-        else: # google
-            translator = GoogleTranslator()
+        # Той самий перекладач, що й у головному вікні: з'єднання і перевірка ключа вже можуть бути готові
+        translator = get_translator(service, api_key, model) if service in ('deepl', *LLM_SERVICES) else get_translator('google')
         
         # Перекладаємо один елемент
         result_batch = translator.translate_batch(
@@ -139,7 +136,7 @@ class ServiceCheckDialog(QDialog):
             self.result_text.setText(f"Сталася помилка:\n\n{result}")
         else:
             translated_text = result.get('translated', 'Не вдалося отримати переклад.')
-            if "ПОМИЛКА" in translated_text:
+            if is_translation_error(translated_text):
                  self.status_label.setText("❌ Помилка перевірки.")
             else:
                  self.status_label.setText("✅ Успіх! Сервіс працює.")
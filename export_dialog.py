@@ -0,0 +1,82 @@
+# export_dialog.py
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QComboBox, QSpinBox, QLineEdit,
+    QPushButton, QDialogButtonBox, QFileDialog, QLabel
+)
+from exporter import (
+    ExportOptions, EXPORT_FORMATS, EXPORT_MODES, DEFAULT_SLICE_HEIGHT, available_formats
+)
+
+class ExportDialog(QDialog):
+    def __init__(self, page_count, default_dir="", parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Експорт розділу")
+        self.setMinimumWidth(480)
+
+        main_layout = QVBoxLayout(self)
+        main_layout.addWidget(QLabel(f"Буде експортовано відтворених сторінок: {page_count}"))
+        form_layout = QFormLayout()
+
+        dir_layout = QHBoxLayout()
+        self.dir_edit = QLineEdit(default_dir)
+        btn_browse = QPushButton("Обрати...")
+        btn_browse.clicked.connect(self.browse_dir)
+        dir_layout.addWidget(self.dir_edit)
+        dir_layout.addWidget(btn_browse)
+        form_layout.addRow("Папка:", dir_layout)
+
+        self.format_combo = QComboBox()
+        for name in available_formats():
+            self.format_combo.addItem(EXPORT_FORMATS[name], name)
+        form_layout.addRow("Формат:", self.format_combo)
+
+        self.png_compression_spin = QSpinBox(); self.png_compression_spin.setRange(0, 9); self.png_compression_spin.setValue(6)
+        self.png_compression_spin.setToolTip("0 — найшвидше, 9 — найменші файли")
+        form_layout.addRow("Стиснення PNG:", self.png_compression_spin)
+        self.quality_spin = QSpinBox(); self.quality_spin.setRange(1, 100); self.quality_spin.setValue(90)
+        form_layout.addRow("Якість:", self.quality_spin)
+
+        self.mode_combo = QComboBox()
+        for name, title in EXPORT_MODES.items():
+            self.mode_combo.addItem(title, name)
+        form_layout.addRow("Сторінки:", self.mode_combo)
+        self.slice_height_spin = QSpinBox(); self.slice_height_spin.setRange(200, 60000)
+        self.slice_height_spin.setSingleStep(100); self.slice_height_spin.setValue(DEFAULT_SLICE_HEIGHT)
+        self.slice_height_spin.setSuffix(" px")
+        form_layout.addRow("Висота частини:", self.slice_height_spin)
+        main_layout.addLayout(form_layout)
+
+        self.buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        self.buttons.button(QDialogButtonBox.StandardButton.Ok).setText("Експортувати")
+        self.buttons.accepted.connect(self.accept)
+        self.buttons.rejected.connect(self.reject)
+        main_layout.addWidget(self.buttons)
+
+        self.format_combo.currentIndexChanged.connect(self.update_controls)
+        self.mode_combo.currentIndexChanged.connect(self.update_controls)
+        self.dir_edit.textChanged.connect(self.update_controls)
+        self.update_controls()
+
+    def browse_dir(self):
+        path = QFileDialog.getExistingDirectory(self, "Папка для експорту", self.dir_edit.text())
+        if path:
+            self.dir_edit.setText(path)
+
+    def update_controls(self):
+        image_format = self.format_combo.currentData()
+        self.png_compression_spin.setEnabled(image_format == 'png')
+        self.quality_spin.setEnabled(image_format in ('webp', 'jpeg'))
+        self.slice_height_spin.setEnabled(self.mode_combo.currentData() == 'slice')
+        self.buttons.button(QDialogButtonBox.StandardButton.Ok).setEnabled(bool(self.dir_edit.text().strip()))
+
+    def output_dir(self):
+        return self.dir_edit.text().strip()
+
+    def options(self):
+        return ExportOptions(
+            image_format=self.format_combo.currentData(),
+            png_compression=self.png_compression_spin.value(),
+            quality=self.quality_spin.value(),
+            mode=self.mode_combo.currentData(),
+            slice_height=self.slice_height_spin.value(),
+        )
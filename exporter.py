@@ -0,0 +1,138 @@
+# exporter.py
+# Експорт відтворених сторінок розділу в папку: окремими файлами, однією довгою
+# стрічкою або стрічкою, нарізаною на частини фіксованої висоти. Декодування,
+# склеювання та кодування виконуються в пулі потоків на QImage (Qt відпускає GIL
+# під час кодування, тож потоки працюють паралельно).
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtGui import QImage, QImageWriter, QPainter, QColor
+from PyQt6.QtCore import Qt
+
+EXPORT_FORMATS = {'png': "PNG", 'webp': "WebP", 'jpeg': "JPEG"}
+EXPORT_MODES = {'pages': "Окремі сторінки", 'stitch': "Одна довга стрічка", 'slice': "Стрічка, нарізана на частини"}
+# Найбільша сторона зображення, яку підтримує формат
+MAX_DIMENSION = {'png': 2 ** 31 - 1, 'webp': 16383, 'jpeg': 65535}
+DEFAULT_SLICE_HEIGHT = 2000
+
+
+class ExportOptions:
+    def __init__(self, image_format='png', png_compression=6, quality=90, mode='pages',
+                 slice_height=DEFAULT_SLICE_HEIGHT, workers=None):
+        if image_format not in EXPORT_FORMATS:
+            raise ValueError(f"Непідтримуваний формат: {image_format}")
+        if mode not in EXPORT_MODES:
+            raise ValueError(f"Невідомий режим експорту: {mode}")
+        self.image_format = image_format
+        self.png_compression = png_compression  # 0 (без стиснення) – 9 (найсильніше)
+        self.quality = quality                  # 0–100 для WebP та JPEG
+        self.mode = mode
+        self.slice_height = slice_height
+        self.workers = workers or os.cpu_count() or 4
+
+    @property
+    def extension(self):
+        return 'jpg' if self.image_format == 'jpeg' else self.image_format
+
+
+def available_formats():
+    """Формати з EXPORT_FORMATS, для яких у цій збірці Qt є плагін запису."""
+    supported = {bytes(name).decode() for name in QImageWriter.supportedImageFormats()}
+    return [name for name in EXPORT_FORMATS if name in supported]
+
+
+def encode_image(image: QImage, path, options: ExportOptions):
+    writer = QImageWriter(path, options.image_format.encode())
+    if options.image_format == 'png':
+        # Qt задає стиснення PNG через якість і рахує рівень як (100 - якість) * 9 // 91;
+        # округлення вгору дає саме той рівень 0–9, який обрав користувач
+        writer.setQuality(100 - math.ceil(options.png_compression * 91 / 9))
+    else:
+        writer.setQuality(options.quality)
+    if options.image_format == 'jpeg' and image.hasAlphaChannel():
+        image = image.convertToFormat(QImage.Format.Format_RGB32)
+    if not writer.write(image):
+        raise OSError(f"Не вдалося записати {path}: {writer.errorString()}")
+    return path
+
+
+def _load(source):
+    image = source if isinstance(source, QImage) else QImage(source)
+    if image.isNull():
+        raise OSError(f"Не вдалося завантажити сторінку {source}")
+    return image
+
+
+def strip_layout(images):
+    """Розміщення сторінок у стрічці: ширина — за першою сторінкою, інші масштабуються під неї.
+    Повертає (ширина, висота, [(зображення, y, висота)])."""
+    width = images[0].width()
+    layout, y = [], 0
+    for image in images:
+        height = round(image.height() * width / image.width())
+        layout.append((image, y, height))
+        y += height
+    return width, y, layout
+
+
+def compose_strip_part(width, layout, top, height) -> QImage:
+    """Малює частину стрічки [top, top + height) з тих сторінок, що її перетинають."""
+    part = QImage(width, height, QImage.Format.Format_RGB32)
+    part.fill(QColor("white"))
+    painter = QPainter(part)
+    painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+    for image, y, page_height in layout:
+        if y + page_height <= top or y >= top + height: continue
+        if page_height == image.height():
+            painter.drawImage(0, y - top, image)
+        else:
+            painter.drawImage(0, y - top, image.scaled(width, page_height, Qt.AspectRatioMode.IgnoreAspectRatio,
+                                                       Qt.TransformationMode.SmoothTransformation))
+    painter.end()
+    return part
+
+
+def export_chapter(sources, output_dir, options: ExportOptions, progress=None, is_cancelled=None):
+    """Експортує сторінки (QImage або шляхи до файлів) у папку output_dir.
+
+    progress(виконано, всього) викликається з потоку, що запустив експорт.
+    is_cancelled() дозволяє перервати експорт між файлами. Повертає список записаних файлів."""
+    if not sources:
+        return []
+    os.makedirs(output_dir, exist_ok=True)
+    ext = options.extension
+
+    with ThreadPoolExecutor(max_workers=options.workers) as executor:
+        if options.mode == 'pages':
+            jobs = [(source, os.path.join(output_dir, f"{i + 1:03d}.{ext}")) for i, source in enumerate(sources)]
+            futures = [executor.submit(lambda job: encode_image(_load(job[0]), job[1], options), job) for job in jobs]
+        else:
+            images = list(executor.map(_load, sources))
+            width, total_height, layout = strip_layout(images)
+            if options.mode == 'stitch':
+                parts = [(0, total_height, os.path.join(output_dir, f"chapter.{ext}"))]
+            else:
+                step = max(1, options.slice_height)
+                parts = [(top, min(step, total_height - top), os.path.join(output_dir, f"{i + 1:03d}.{ext}"))
+                         for i, top in enumerate(range(0, total_height, step))]
+            limit = MAX_DIMENSION[options.image_format]
+            if max(width, max(height for _, height, _ in parts)) > limit:
+                raise ValueError(f"Зображення {width}x{max(height for _, height, _ in parts)} завелике для "
+                                 f"{EXPORT_FORMATS[options.image_format]} (не більше {limit} px). "
+                                 f"Оберіть нарізку на частини або інший формат.")
+            futures = [executor.submit(lambda part: encode_image(compose_strip_part(width, layout, part[0], part[1]),
+                                                                 part[2], options), part) for part in parts]
+
+        written = []
+        try:
+            for future in futures:
+                if is_cancelled and is_cancelled():
+                    break
+                written.append(future.result())
+                if progress:
+                    progress(len(written), len(futures))
+        finally:
+            for future in futures:
+                future.cancel()
+    return written
@@ -0,0 +1,239 @@
+# llm_translators.py
+# Переклад через чат-моделі: OpenAI-сумісні API (GPT, локальні сервери з тим самим
+# протоколом) і Gemini. Замість запиту на кожну бульбашку модель отримує всі речення
+# сторінки (або кількох сторінок) одним пронумерованим списком і повертає JSON з
+# перекладами. Запити пакуються під бюджет токенів, відповіді читаються потоком,
+# а кілька останніх перекладених реплік передаються в наступний запит як контекст,
+# щоб імена й звертання персонажів не змінювалися між пакетами.
+from abc import abstractmethod
+import json
+import math
+import os
+import urllib.parse
+
+from translators import BaseTranslator, TRANSLATION_ERROR
+from net_utils import ConnectionPool, is_retryable_error, retry_with_backoff
+
+DEFAULT_OPENAI_BASE_URL = "https://api.openai.com/v1"
+DEFAULT_OPENAI_MODEL = "gpt-4o-mini"
+DEFAULT_GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+DEFAULT_GEMINI_MODEL = "gemini-2.5-flash"
+
+# Бюджет токенів одного запиту: речення, контекст та інструкції разом
+DEFAULT_MAX_PROMPT_TOKENS = 3000
+# Скільки останніх перекладених реплік додавати до запиту як контекст і скільки токенів на них відвести
+DEFAULT_CONTEXT_SENTENCES = 8
+CONTEXT_TOKENS_PER_SENTENCE = 40
+
+SYSTEM_PROMPT = (
+    "You translate comic (manhwa) speech bubbles from {src} to {dest}. "
+    "The user sends a JSON object with a numbered list of bubbles in reading order; "
+    "consecutive bubbles are usually a dialogue, so keep speaker voice, names and forms of address consistent. "
+    "Translate naturally and concisely so the text fits a speech bubble. "
+    "Reply with JSON only: {{\"translations\": [{{\"id\": <id>, \"text\": \"<translation>\"}}, ...]}} "
+    "with exactly one entry for every id."
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Груба оцінка кількості токенів: для корейської та кирилиці токен — це 1–3 байти UTF-8."""
+    return math.ceil(len(text.encode('utf-8')) / 3) + 4
+
+
+def language_name(code: str) -> str:
+    return "the detected source language" if not code or code == 'auto' else code
+
+
+class LLMTranslator(BaseTranslator):
+    """Спільна частина перекладачів на чат-моделях: пакування, підказка, розбір JSON.
+
+    Нащадки реалізують лише _complete(system, user) -> str — потоковий запит до свого API."""
+    # BatchingTranslator не повинен дробити розділ дрібніше — пакування під токени робиться тут
+    MAX_BATCH_ITEMS = 1000
+    MAX_BATCH_BYTES = 400_000
+
+    def __init__(self, api_key, model, base_url, max_prompt_tokens=DEFAULT_MAX_PROMPT_TOKENS,
+                 context_sentences=DEFAULT_CONTEXT_SENTENCES, temperature=0.2, max_retries=3, timeout=120.0):
+        self.api_key = api_key
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.max_prompt_tokens = max_prompt_tokens
+        self.context_sentences = context_sentences
+        self.temperature = temperature
+        self.max_retries = max_retries
+        self.connections = ConnectionPool(timeout)
+        self.requests_sent = 0
+
+    def close(self):
+        self.connections.close()
+
+    # --- пакування ---
+    def _chunks(self, texts, reserved_tokens):
+        """Ділить індекси текстів на пакети, що вміщуються в бюджет токенів."""
+        budget = max(1, self.max_prompt_tokens - reserved_tokens)
+        chunk, used = [], 0
+        for index, text in enumerate(texts):
+            cost = estimate_tokens(text)
+            if chunk and used + cost > budget:
+                yield chunk
+                chunk, used = [], 0
+            # Речення, довше за бюджет, усе одно йде окремим запитом
+            chunk.append(index)
+            used += cost
+        if chunk:
+            yield chunk
+
+    def _user_message(self, texts, ids, context):
+        payload = {'bubbles': [{'id': i, 'text': texts[i]} for i in ids]}
+        if context:
+            payload['previous_bubbles'] = [{'text': source, 'translation': translated} for source, translated in context]
+        return json.dumps(payload, ensure_ascii=False)
+
+    # --- розбір відповіді ---
+    @staticmethod
+    def parse_translations(reply: str) -> dict:
+        """Витягує {id: переклад} з відповіді моделі (допускає обгортку ```json ... ```)."""
+        start, end = reply.find("{"), reply.rfind("}")
+        if start == -1 or end <= start:
+            raise ValueError("відповідь моделі не містить JSON")
+        data = json.loads(reply[start:end + 1])
+        entries = data.get('translations', []) if isinstance(data, dict) else data
+        return {int(entry['id']): str(entry.get('text', '')) for entry in entries
+                if isinstance(entry, dict) and 'id' in entry}
+
+    def _translate_ids(self, texts, ids, context, src_lang, dest_lang) -> dict:
+        system = SYSTEM_PROMPT.format(src=language_name(src_lang), dest=language_name(dest_lang))
+        user = self._user_message(texts, ids, context)
+
+        def send():
+            self.requests_sent += 1
+            return self.parse_translations(self._complete(system, user))
+
+        translations = retry_with_backoff(send, max_retries=self.max_retries, is_retryable=_is_retryable)
+        return {i: translations[i] for i in ids if i in translations}
+
+    def translate_batch(self, items: list[dict], src_lang: str, dest_lang: str) -> list[dict]:
+        to_translate = [item for item in items if item['text'].strip()]
+        for item in items:
+            if not item['text'].strip():
+                item['translated'] = ''
+        if not to_translate:
+            return items
+
+        texts = [" ".join(item['text'].split()) for item in to_translate]
+        context_budget = self.context_sentences * CONTEXT_TOKENS_PER_SENTENCE
+        context = []
+        results = {}
+        for ids in self._chunks(texts, estimate_tokens(SYSTEM_PROMPT) + context_budget):
+            try:
+                translated = self._translate_ids(texts, ids, context, src_lang, dest_lang)
+            except Exception as e:
+                print(f"Помилка перекладу {type(self).__name__}: {e}")
+                translated = {}
+            missing = [i for i in ids if i not in translated]
+            if translated and missing:
+                # Модель пропустила або злила репліки — повторюємо лише їх, не втрачаючи вже перекладених
+                try:
+                    translated.update(self._translate_ids(texts, missing, context, src_lang, dest_lang))
+                except Exception as e:
+                    print(f"Помилка повторного перекладу {type(self).__name__}: {e}")
+            for i in ids:
+                results[i] = translated.get(i, TRANSLATION_ERROR)
+            context = _recent_context(context + [(texts[i], translated[i]) for i in ids if i in translated],
+                                      self.context_sentences, context_budget)
+
+        for index, item in enumerate(to_translate):
+            item['translated'] = results[index]
+        return items
+
+    @abstractmethod
+    def _complete(self, system: str, user: str) -> str:
+        """Надсилає підказку моделі й повертає повний текст відповіді."""
+
+    def _stream(self, url, payload, headers, extract):
+        """Надсилає запит і збирає текст з подій SSE (рядки "data: ...")."""
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        headers = dict(headers, **{'Content-Type': 'application/json', 'Accept': 'text/event-stream'})
+        parts = []
+        for line in self.connections.stream_lines('POST', url, body=body, headers=headers):
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                # Дочитуємо відповідь до кінця, щоб з'єднання можна було використати повторно
+                continue
+            if not data:
+                continue
+            chunk = extract(json.loads(data))
+            if chunk:
+                parts.append(chunk)
+        return "".join(parts)
+
+
+def _recent_context(pairs, max_sentences, max_tokens):
+    """Останні перекладені репліки (оригінал, переклад), що вміщуються в бюджет контексту."""
+    context = pairs[-max_sentences:] if max_sentences > 0 else []
+    while context and sum(estimate_tokens(source) + estimate_tokens(text) for source, text in context) > max_tokens:
+        context.pop(0)
+    return context
+
+
+def _is_retryable(error):
+    # Неповний або зіпсований JSON — модель могла обірвати відповідь, варто спробувати ще раз
+    return is_retryable_error(error) or isinstance(error, ValueError)
+
+
+# ======================================================================
+# OPENAI-СУМІСНІ API
+# ======================================================================
+class OpenAITranslator(LLMTranslator):
+    """Chat Completions з потоковою відповіддю і response_format json_object.
+
+    base_url може вказувати на будь-який сумісний сервер (локальна модель, проксі, заглушка)."""
+
+    def __init__(self, api_key, model=None, base_url=None, **kwargs):
+        super().__init__(api_key, model or os.environ.get("OPENAI_MODEL", DEFAULT_OPENAI_MODEL),
+                         base_url or os.environ.get("OPENAI_BASE_URL", DEFAULT_OPENAI_BASE_URL), **kwargs)
+
+    def _complete(self, system, user):
+        payload = {
+            'model': self.model,
+            'messages': [{'role': 'system', 'content': system}, {'role': 'user', 'content': user}],
+            'temperature': self.temperature,
+            'response_format': {'type': 'json_object'},
+            'stream': True,
+        }
+        headers = {'Authorization': f"Bearer {self.api_key}"} if self.api_key else {}
+
+        def extract(event):
+            choices = event.get('choices') or [{}]
+            return (choices[0].get('delta') or {}).get('content')
+
+        return self._stream(f"{self.base_url}/chat/completions", payload, headers, extract)
+
+
+# ======================================================================
+# GEMINI
+# ======================================================================
+class GeminiTranslator(LLMTranslator):
+    """generateContent з потоковою відповіддю (alt=sse) і responseMimeType application/json."""
+
+    def __init__(self, api_key, model=None, base_url=None, **kwargs):
+        super().__init__(api_key, model or os.environ.get("GEMINI_MODEL", DEFAULT_GEMINI_MODEL),
+                         base_url or os.environ.get("GEMINI_BASE_URL", DEFAULT_GEMINI_BASE_URL), **kwargs)
+
+    def _complete(self, system, user):
+        payload = {
+            'systemInstruction': {'parts': [{'text': system}]},
+            'contents': [{'role': 'user', 'parts': [{'text': user}]}],
+            'generationConfig': {'temperature': self.temperature, 'responseMimeType': 'application/json'},
+        }
+        query = urllib.parse.urlencode({'alt': 'sse'})
+        url = f"{self.base_url}/models/{urllib.parse.quote(self.model)}:streamGenerateContent?{query}"
+
+        def extract(event):
+            candidates = event.get('candidates') or [{}]
+            parts = (candidates[0].get('content') or {}).get('parts') or []
+            return "".join(part.get('text', '') for part in parts)
+
+        return self._stream(url, payload, {'x-goog-api-key': self.api_key}, extract)
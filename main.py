@@ -1,32 +1,58 @@
 # main.py
 
+import time
+# Момент запуску — від нього рахується час до першого показу вікна
+STARTUP_TIME = time.perf_counter()
+
 import sys
 import os
+import math
 import traceback
-import easyocr
+from collections import OrderedDict
 
 # Імпортуємо оновлені класи з допоміжних файлів
-from translators import GoogleTranslator, DeepLTranslator
+from translators import DeepLTranslator, KEYLESS_SERVICES, get_translator
+from translation_memory import TranslationMemory, CachedTranslator
+from ocr_engine import OCR_LANGS, create_reader
+from ocr_daemon import OcrDaemonClient, connect_daemon, start_daemon
+from ocr_cache import OcrCache, cached_ocr
+from text_grouping import bbox_to_rect, group_text_bubbles, distribute_text_to_group, group_sentences
+from renderer import load_fonts, painted_bounds, redraw_dirty, font_size_for
+from thumbnails import ThumbnailLoader, ThumbnailCache
+from page_cache import PageImageCache
+from text_layout import MIN_FONT_SIZE, MAX_FONT_SIZE
+from render_pool import RenderPool
+from text_removal import TEXT_REMOVAL_METHODS, DEFAULT_TEXT_REMOVAL
+from project_state import ProjectStore, deserialize_rects
 from api_manager import ApiKeyManager
 from settings_dialog import SettingsDialog
 from check_dialog import ServiceCheckDialog
+from export_dialog import ExportDialog
+from exporter import export_chapter
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QScrollArea, QListWidget, QListWidgetItem, QTextEdit,
     QFileDialog, QGroupBox, QFormLayout, QFontComboBox, QSpinBox,
     QStatusBar, QFrame, QComboBox, QGridLayout, QProgressBar, QStackedWidget,
-    QSplitter, QMessageBox
+    QSplitter, QMessageBox, QCheckBox
 )
 from PyQt6.QtGui import (
-    QPixmap, QPainter, QPen, QFont, QFontDatabase, QDragEnterEvent, QDropEvent,
-    QColor, QFontMetrics, QIcon, QKeyEvent, QCursor
+    QPixmap, QPainter, QPen, QFont, QDragEnterEvent, QDropEvent,
+    QColor, QFontMetrics, QIcon, QKeyEvent, QCursor, QImage
+)
+from PyQt6.QtCore import (
+    Qt, QRect, QEvent, QObject, QThread, pyqtSignal, pyqtSlot, QSize, QPoint, QTimer,
+    QRunnable, QThreadPool
 )
-from PyQt6.QtCore import Qt, QRect, QEvent, QObject, QThread, pyqtSignal, pyqtSlot, QSize, QPoint, QTimer
 
 # ======================================================================
 # ДОПОМІЖНІ КЛАСИ
 # ======================================================================
+class ProgressSignal(QObject):
+    """Передає прогрес фонового завдання в GUI-потік."""
+    progress = pyqtSignal(int, int)
+
 class Worker(QObject):
     finished = pyqtSignal(object)
     error = pyqtSignal(tuple)
@@ -45,60 +71,213 @@ class Worker(QObject):
         else:
             self.finished.emit(result)
 
+class _TileSignals(QObject):
+    finished = pyqtSignal(int, tuple, QImage)
+
+class _ScaleTileTask(QRunnable):
+    """Якісне масштабування одного тайла з QImage у пулі потоків (QPixmap поза GUI-потоком не можна)."""
+    def __init__(self, image, generation, key, source_rect, target_size, signals):
+        super().__init__()
+        self.image = image
+        self.generation = generation
+        self.key = key
+        self.source_rect = source_rect
+        self.target_size = target_size
+        self.signals = signals
+
+    def run(self):
+        tile = self.image.copy(self.source_rect).scaled(self.target_size, Qt.AspectRatioMode.IgnoreAspectRatio,
+                                                        Qt.TransformationMode.SmoothTransformation)
+        self.signals.finished.emit(self.generation, self.key, tile)
+
 class ImageLabel(QLabel): # ЗМІНЕНО: тепер підтримує виділення кількох рамок
+    # Масштабоване зображення малюється смугами (тайлами): для довгої сторінки
+    # масштабуються й малюються лише ті тайли, що потрапили у видиму область.
+    TILE_HEIGHT = 512
+    TILE_CACHE_BYTES = 128 * 1024 * 1024
+
     def __init__(self):
         super().__init__()
         self.original_pixmap = QPixmap()
-        self.scaled_pixmap_display = QPixmap()
+        self.display_rect = QRect()
         self.rects = []
         self.selected_indices = [] # ЗМІНЕНО: тепер це список
+        self._tiles = OrderedDict() # (ширина, висота, індекс) -> QPixmap
+        self._tiles_bytes = 0
+        # Швидкий режим (під час перетягування розділювача): тайли масштабуються без
+        # згладжування, а якісні готуються у фоні після його вимкнення
+        self._fast_mode = False
+        self._fast_tiles = {}
+        self._pending = set()
+        self._generation = 0
+        self._source_image = None
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(2)
+        self._signals = _TileSignals(self)
+        self._signals.finished.connect(self._on_tile_scaled)
         self.setAlignment(Qt.AlignmentFlag.AlignCenter)
     
     def set_pixmap(self, pixmap):
         self.original_pixmap = pixmap if pixmap else QPixmap()
+        self._generation += 1
+        self._source_image = None
+        self.clear_tiles()
         self.update_scaled_display()
         self.update()
 
+    def update_pixmap_region(self, pixmap, changed_rect):
+        """Підміняє зображення, змінене лише в changed_rect (координати оригіналу), зберігаючи решту тайлів."""
+        self.original_pixmap = pixmap
+        self._generation += 1
+        self._source_image = None
+        self._fast_tiles.clear()
+        self._pending.clear()
+        if self.display_rect.isEmpty(): return
+        for key in [key for key in self._tiles if self._tile_rows(key)[0] <= changed_rect.bottom()
+                    and self._tile_rows(key)[1] > changed_rect.top()]:
+            old = self._tiles.pop(key)
+            self._tiles_bytes -= old.width() * old.height() * 4
+        self.update(self.scaled_rect(changed_rect).adjusted(-2, -2, 2, 2))
+
+    def _tile_rows(self, key):
+        """Рядки оригіналу [top, bottom), які покриває тайл із ключем (ширина, висота, індекс)."""
+        source_height = max(1, math.ceil(self.TILE_HEIGHT * self.original_pixmap.width() / key[0]))
+        return key[2] * source_height, (key[2] + 1) * source_height
+
     def set_rects(self, rects):
         self.rects = rects
         self.update()
 
     def set_selected_indices(self, indices): # ЗМІНЕНО: назва та логіка
+        changed = set(self.selected_indices) ^ set(indices)
         self.selected_indices = indices
-        self.update()
+        # Перемальовуємо лише рамки, виділення яких змінилося
+        for i in changed:
+            if 0 <= i < len(self.rects):
+                self.update(self.scaled_rect(self.rects[i]['rect']).adjusted(-3, -3, 3, 3))
+
+    def clear_tiles(self):
+        self._tiles.clear()
+        self._tiles_bytes = 0
+        self._fast_tiles.clear()
+        self._pending.clear()
+
+    def set_fast_mode(self, enabled):
+        if self._fast_mode == enabled: return
+        self._fast_mode = enabled
+        if not enabled:
+            self._request_visible_tiles()
+
+    def _request_visible_tiles(self):
+        """Ставить у чергу якісне масштабування видимих тайлів, яких ще немає в кеші."""
+        if self.display_rect.isEmpty() or self.original_pixmap.isNull(): return
+        if self._source_image is None:
+            self._source_image = self.original_pixmap.toImage()
+        for index in self._tile_indices(self.visibleRegion().boundingRect()):
+            key = self._tile_key(index)
+            if key in self._tiles or key in self._pending: continue
+            target, top, bottom = self._tile_target_rect(index)
+            if target.isEmpty(): continue
+            self._pending.add(key)
+            source_rect = QRect(0, top, self.original_pixmap.width(), bottom - top)
+            self._pool.start(_ScaleTileTask(self._source_image, self._generation, key, source_rect,
+                                            target.size(), self._signals))
+
+    def _on_tile_scaled(self, generation, key, image):
+        self._pending.discard(key)
+        if generation != self._generation or key[:2] != self._tile_key(0)[:2]: return
+        self._store_tile(key, QPixmap.fromImage(image))
+        self.update(self._tile_target_rect(key[2])[0])
 
     def update_scaled_display(self):
         if self.original_pixmap.isNull() or self.size().width() <= 0 or self.size().height() <= 0:
-            self.scaled_pixmap_display = QPixmap()
+            self.display_rect = QRect()
             return
-        self.scaled_pixmap_display = self.original_pixmap.scaled(
-            self.size(),
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
+        display_size = self.original_pixmap.size().scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatio)
+        self.display_rect = QRect(QPoint((self.width() - display_size.width()) // 2,
+                                         (self.height() - display_size.height()) // 2), display_size)
         self.update()
 
+    def scale_factor(self):
+        if self.display_rect.isEmpty() or self.original_pixmap.width() == 0: return 0
+        return self.display_rect.width() / self.original_pixmap.width()
+
+    def scaled_rect(self, original_rect):
+        scale_factor = self.scale_factor()
+        return QRect(
+            self.display_rect.x() + int(original_rect.x() * scale_factor),
+            self.display_rect.y() + int(original_rect.y() * scale_factor),
+            int(original_rect.width() * scale_factor),
+            int(original_rect.height() * scale_factor)
+        )
+
+    def _tile_source_height(self):
+        """Висота тайла в пікселях оригіналу для поточного масштабу."""
+        return self._tile_rows(self._tile_key(1))[0]
+
+    def _tile_target_rect(self, index):
+        source_height = self._tile_source_height()
+        top = index * source_height
+        bottom = min(top + source_height, self.original_pixmap.height())
+        y0 = round(top * self.display_rect.height() / self.original_pixmap.height())
+        y1 = round(bottom * self.display_rect.height() / self.original_pixmap.height())
+        return QRect(self.display_rect.x(), self.display_rect.y() + y0, self.display_rect.width(), y1 - y0), top, bottom
+
+    def _tile_key(self, index):
+        return (self.display_rect.width(), self.display_rect.height(), index)
+
+    def _tile_indices(self, region):
+        region = region.intersected(self.display_rect)
+        if region.isEmpty(): return range(0)
+        source_height = self._tile_source_height()
+        scale_y = self.display_rect.height() / self.original_pixmap.height()
+        first = int((region.top() - self.display_rect.y()) / scale_y) // source_height
+        last = int((region.bottom() - self.display_rect.y()) / scale_y) // source_height
+        return range(first, last + 1)
+
+    def _scale_tile(self, index, mode):
+        target, top, bottom = self._tile_target_rect(index)
+        source = self.original_pixmap.copy(QRect(0, top, self.original_pixmap.width(), bottom - top))
+        return source.scaled(target.size(), Qt.AspectRatioMode.IgnoreAspectRatio, mode)
+
+    def _tile(self, index):
+        key = self._tile_key(index)
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self._tiles.move_to_end(key)
+            return tile
+        if self._fast_mode or key in self._pending:
+            # Тимчасовий тайл низької якості, доки якісний не готовий
+            if any(old[:2] != key[:2] for old in self._fast_tiles):
+                self._fast_tiles.clear()
+            if key not in self._fast_tiles:
+                self._fast_tiles[key] = self._scale_tile(index, Qt.TransformationMode.FastTransformation)
+            return self._fast_tiles[key]
+        tile = self._scale_tile(index, Qt.TransformationMode.SmoothTransformation)
+        self._store_tile(key, tile)
+        return tile
+
+    def _store_tile(self, key, tile):
+        self._tiles[key] = tile
+        self._tiles_bytes += tile.width() * tile.height() * 4
+        # Тайли старих масштабів витісняються першими (LRU)
+        while self._tiles_bytes > self.TILE_CACHE_BYTES and len(self._tiles) > 1:
+            _, old = self._tiles.popitem(last=False)
+            self._tiles_bytes -= old.width() * old.height() * 4
+
     def paintEvent(self, event):
-        if self.scaled_pixmap_display.isNull():
+        if self.display_rect.isEmpty() or self.original_pixmap.isNull():
             return
         
         painter = QPainter(self)
-        x_offset = (self.width() - self.scaled_pixmap_display.width()) // 2
-        y_offset = (self.height() - self.scaled_pixmap_display.height()) // 2
-        painter.drawPixmap(x_offset, y_offset, self.scaled_pixmap_display)
-        
-        if self.original_pixmap.width() == 0 or self.scaled_pixmap_display.width() == 0: return
+        for index in self._tile_indices(event.rect()):
+            target, _, _ = self._tile_target_rect(index)
+            if target.isEmpty(): continue
+            painter.drawPixmap(target, self._tile(index))
 
-        scale_factor = self.scaled_pixmap_display.width() / self.original_pixmap.width()
-        
         for i, rect_data in enumerate(self.rects):
-            original_rect = rect_data['rect']
-            scaled_rect = QRect(
-                x_offset + int(original_rect.x() * scale_factor), 
-                y_offset + int(original_rect.y() * scale_factor),
-                int(original_rect.width() * scale_factor), 
-                int(original_rect.height() * scale_factor)
-            )
+            scaled_rect = self.scaled_rect(rect_data['rect'])
+            if not scaled_rect.adjusted(-3, -3, 3, 3).intersects(event.rect()): continue
             # ЗМІНЕНО: перевіряємо, чи є індекс у списку виділених
             pen = QPen(Qt.GlobalColor.yellow, 3) if i in self.selected_indices else QPen(Qt.GlobalColor.red, 2)
             painter.setPen(pen)
@@ -160,10 +339,12 @@ class MinimapWidget(QWidget):
 
     def set_pixmap(self, pixmap: QPixmap):
         self.full_pixmap = pixmap
+        # Мініатюра масштабується один раз на сторінку, а не при кожній зміні розміру:
+        # paintEvent все одно розтягує її на всю висоту віджета
+        self.minimap_pixmap = QPixmap()
         if not self.full_pixmap.isNull():
-            self.minimap_pixmap = self.full_pixmap.scaled(
-                self.width(), self.height(),
-                Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+            self.minimap_pixmap = self.full_pixmap.scaledToWidth(
+                min(self.full_pixmap.width(), self.width() * 2),
                 Qt.TransformationMode.SmoothTransformation
             )
         self.update_viewport()
@@ -190,6 +371,7 @@ class MinimapWidget(QWidget):
         painter = QPainter(self)
         painter.fillRect(self.rect(), QColor("#23272a"))
         if not self.minimap_pixmap.isNull():
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
             painter.drawPixmap(self.rect(), self.minimap_pixmap)
         if not self.viewport_rect.isNull():
             painter.fillRect(self.viewport_rect, QColor(200, 200, 220, 80))
@@ -199,8 +381,7 @@ class MinimapWidget(QWidget):
     
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        if not self.full_pixmap.isNull():
-            self.set_pixmap(self.full_pixmap)
+        self.update_viewport()
 
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
@@ -357,16 +538,24 @@ class PageListWidget(QListWidget):
 # ГОЛОВНИЙ КЛАС ДОДАТКУ
 # ======================================================================
 class ManhwaTranslatorApp(QMainWindow):
-    def __init__(self):
+    def __init__(self, use_ocr_daemon=False):
         super().__init__()
         self.setWindowTitle("Перекладач Манхви")
         self.setGeometry(100, 100, 1600, 900)
         
-        self.loaded_fonts = self.load_fonts("fonts")
+        # Сімейства шрифтів беруться з кешу, самі файли реєструються під час першого використання
+        self.loaded_fonts = load_fonts("fonts", lazy=True)
         self.setStyleSheet(self.get_stylesheet())
         
         self._is_scrolling = False
         self._is_first_show = True
+        # Поки панель редагування заповнюється даними групи, її сигнали не повинні змінювати дані
+        self._loading_panel = False
+        # Якісне перемасштабування після зміни розміру відкладається, доки користувач не відпустить розділювач
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(150)
+        self.resize_timer.timeout.connect(self.finish_interactive_resize)
         
         self._setup_ui()
         self._connect_signals()
@@ -378,13 +567,43 @@ class ManhwaTranslatorApp(QMainWindow):
         
         self.translation_groups = []
         self.sentences_to_translate = []
+        # Інкрементне відтворення: індекси змінених рамок і межі рамок, намальованих востаннє
+        # (None — потрібне повне відтворення)
+        self.dirty_rects = set()
+        self.rendered_bounds = None
+        self._rendered_unsaved = False
+        self.clean_image = QImage() # сторінка з видаленим текстом для інкрементного відтворення
+        # Відтворення сторінок у пулі потоків; render_all_pending — сторінки поточного «відтворити всі»
+        self.render_pool = RenderPool(parent=self)
+        self.render_pool.page_rendered.connect(self.on_page_rendered)
+        self.render_pool.page_failed.connect(self.on_page_render_failed)
+        self.render_all_pending = set()
+        self.render_all_total = 0
+        self.translation_memory = TranslationMemory()
+        self.ocr_cache = OcrCache()
+        self.page_cache = PageImageCache(parent=self)
+        self.project_store = ProjectStore(parent=self)
+        self.processing_path = None
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setSingleShot(True)
+        self.autosave_timer.setInterval(1500)
+        self.autosave_timer.timeout.connect(self.autosave)
 
         self.view_stack.setCurrentWidget(self.drop_zone)
+        # OCR-модель (і torch) завантажується під час першого розпізнавання або кнопкою «Підготувати OCR»
         self.ocr_reader = None
+        # use_ocr_daemon — запустити службу OCR, якщо її немає; запущеною службою вікно користується завжди
+        self.use_ocr_daemon = use_ocr_daemon
+        # Служба OCR перестала відповідати посеред роботи — далі розпізнаємо локальною моделлю
+        self._ocr_daemon_failed = False
+        self.ocr_thread = None; self.ocr_worker = None
+        # None — експорт не виконується; інакше — чи натиснув користувач «Скасувати експорт»
+        self._export_cancelled = None
+        self._process_after_ocr = False
         
         self._update_language_combos()
-        self.start_ocr_initialization()
         self.update_page_control_buttons()
+        QTimer.singleShot(0, self.offer_session_restore)
 
     def _setup_ui(self):
         central_widget = QWidget()
@@ -401,16 +620,22 @@ class ManhwaTranslatorApp(QMainWindow):
         
         self.translator_service_combo = QComboBox()
         self.translator_service_combo.addItem("Google Translate", "google")
+        self.translator_service_combo.addItem("Google Translate (швидкий)", "google_fast")
         self.translator_service_combo.addItem("DeepL", "deepl")
+        self.translator_service_combo.addItem("GPT (OpenAI-сумісний API)", "gpt")
+        self.translator_service_combo.addItem("Gemini", "gemini")
 
         self.btn_settings = QPushButton("⚙️ Керування API")
         self.btn_check_service = QPushButton("🔬 Перевірити сервіси")
+        self.btn_warmup_ocr = QPushButton("Підготувати OCR")
+        self.btn_warmup_ocr.setToolTip("Завантажити OCR-моделі заздалегідь, щоб перше розпізнавання не чекало на них")
 
         arrow_label = QLabel("→"); arrow_label.setStyleSheet("font-size: 15pt; font-weight: bold;")
         lang_selection_layout.addWidget(QLabel("Сервіс:"))
         lang_selection_layout.addWidget(self.translator_service_combo)
         lang_selection_layout.addWidget(self.btn_settings)
         lang_selection_layout.addWidget(self.btn_check_service)
+        lang_selection_layout.addWidget(self.btn_warmup_ocr)
         lang_selection_layout.addStretch()
         lang_selection_layout.addWidget(QLabel("Мова оригіналу:"))
         lang_selection_layout.addWidget(self.source_lang_combo)
@@ -438,7 +663,7 @@ class ManhwaTranslatorApp(QMainWindow):
         translated_layout.addWidget(QLabel("Переклад:"))
         self.translated_scroll_area = QScrollArea(); self.translated_scroll_area.setWidgetResizable(False)
         self.translated_scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.translated_image_label = QLabel(); self.translated_image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.translated_image_label = ImageLabel()
         self.translated_scroll_area.setWidget(self.translated_image_label)
         translated_layout.addWidget(self.translated_scroll_area)
         self.image_splitter.addWidget(original_frame)
@@ -465,6 +690,7 @@ class ManhwaTranslatorApp(QMainWindow):
         self.page_list_widget.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         self.page_list_widget.setWordWrap(True)
         pages_layout.addWidget(self.page_list_widget)
+        self.thumbnail_loader = ThumbnailLoader(self.page_list_widget.iconSize(), ThumbnailCache(), parent=self)
 
         page_buttons_panel = QWidget()
         page_buttons_layout = QGridLayout(page_buttons_panel)
@@ -513,21 +739,36 @@ class ManhwaTranslatorApp(QMainWindow):
         self.font_combo = QComboBox()
         if self.loaded_fonts: self.font_combo.addItems(self.loaded_fonts)
         else: self.font_combo = QFontComboBox()
-        self.font_size_spin = QSpinBox(); self.font_size_spin.setRange(6, 72)
+        self.font_size_spin = QSpinBox(); self.font_size_spin.setRange(MIN_FONT_SIZE, MAX_FONT_SIZE)
+        self.auto_fit_check = QCheckBox("Підбирати розмір під рамку")
         form_layout.addRow("Оригінал:", self.original_text)
         form_layout.addRow("Переклад:", self.translated_text)
         form_layout.addRow("Шрифт:", self.font_combo)
         form_layout.addRow("Розмір:", self.font_size_spin)
+        form_layout.addRow("", self.auto_fit_check)
         edit_group.setLayout(form_layout)
         right_layout.addWidget(edit_group)
         
+        text_removal_layout = QHBoxLayout()
+        text_removal_layout.addWidget(QLabel("Видалення тексту:"))
+        self.text_removal_combo = QComboBox()
+        for name, title in TEXT_REMOVAL_METHODS.items():
+            self.text_removal_combo.addItem(title, name)
+        self.text_removal_combo.setCurrentIndex(self.text_removal_combo.findData(DEFAULT_TEXT_REMOVAL))
+        text_removal_layout.addWidget(self.text_removal_combo, 1)
+        right_layout.addLayout(text_removal_layout)
+
         action_buttons_layout = QGridLayout()
         self.btn_process = QPushButton("Розпізнати та Перекласти")
         self.btn_render = QPushButton("Відтворити")
         self.btn_save = QPushButton("Зберегти")
+        self.btn_render_all = QPushButton("Відтворити всі сторінки")
+        self.btn_export = QPushButton("Експортувати розділ")
         action_buttons_layout.addWidget(self.btn_process, 0, 0, 1, 2)
         action_buttons_layout.addWidget(self.btn_render, 1, 0)
         action_buttons_layout.addWidget(self.btn_save, 1, 1)
+        action_buttons_layout.addWidget(self.btn_render_all, 2, 0)
+        action_buttons_layout.addWidget(self.btn_export, 2, 1)
         right_layout.addLayout(action_buttons_layout)
         self.progress_bar = QProgressBar(); self.progress_bar.setTextVisible(True)
         self.progress_bar.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -553,6 +794,14 @@ class ManhwaTranslatorApp(QMainWindow):
             image_width = total_width - tools_width - minimap_width
             self.main_splitter.setSizes([image_width, minimap_width, tools_width])
             self._is_first_show = False
+            QTimer.singleShot(0, self.report_startup_time)
+
+    def report_startup_time(self):
+        """Час від запуску процесу до першого показу вікна (викликається після першої обробки подій)."""
+        elapsed = time.perf_counter() - STARTUP_TIME
+        print(f"Час до першого показу вікна: {elapsed:.2f} с")
+        if not self.status_bar.currentMessage():
+            self.status_bar.showMessage(f"Готово до роботи. Запуск зайняв {elapsed:.2f} с", 5000)
 
     def _connect_signals(self):
         self.translator_service_combo.currentIndexChanged.connect(self._update_language_combos)
@@ -561,20 +810,26 @@ class ManhwaTranslatorApp(QMainWindow):
         self.drop_zone.btn_browse.clicked.connect(self.open_image_dialog)
         self.drop_zone.files_dropped.connect(self.add_pages)
         self.btn_process.clicked.connect(self.start_full_process)
+        self.btn_warmup_ocr.clicked.connect(self.start_ocr_initialization)
         self.btn_render.clicked.connect(self.render_translated_image)
+        self.btn_render_all.clicked.connect(self.render_all_pages)
+        self.btn_export.clicked.connect(self.export_chapter_dialog)
+        self.text_removal_combo.currentIndexChanged.connect(self.on_text_removal_changed)
         self.btn_save.clicked.connect(self.save_translated_image)
         self.text_list.currentRowChanged.connect(self.update_edit_panel)
         self.translated_text.textChanged.connect(self.update_data_from_panel)
         self.font_combo.currentTextChanged.connect(self.update_data_from_panel)
         self.font_size_spin.valueChanged.connect(self.update_data_from_panel)
+        self.auto_fit_check.toggled.connect(self.update_data_from_panel)
         self.original_scroll_bar = self.original_scroll_area.verticalScrollBar()
         self.translated_scroll_bar = self.translated_scroll_area.verticalScrollBar()
         self.original_scroll_bar.valueChanged.connect(self.sync_scroll_from_original)
         self.translated_scroll_bar.valueChanged.connect(self.sync_scroll_from_translated)
         self.original_scroll_bar.valueChanged.connect(self.minimap.update_viewport)
         self.original_scroll_bar.rangeChanged.connect(self.minimap.update_viewport)
-        self.main_splitter.splitterMoved.connect(self.update_image_display_sizes)
+        self.main_splitter.splitterMoved.connect(self.on_interactive_resize)
         self.page_list_widget.currentItemChanged.connect(self.on_page_selected)
+        self.thumbnail_loader.thumbnail_ready.connect(self.on_thumbnail_ready)
         self.page_list_widget.model().rowsMoved.connect(self.renumber_pages)
         self.btn_add_page.clicked.connect(self.open_image_dialog)
         self.btn_delete_page.clicked.connect(self.delete_page)
@@ -612,27 +867,8 @@ class ManhwaTranslatorApp(QMainWindow):
 
     def _distribute_text_to_group(self, group_index, new_text):
         """Пропорційно розподіляє текст по бульбашках групи."""
-        group_indices = self.translation_groups[group_index]
-        
-        original_words_in_group = [self.found_rects[idx]['text'].split() for idx in group_indices]
-        total_original_words = sum(len(words) for words in original_words_in_group)
-        
-        translated_words = new_text.split()
-        total_translated_words = len(translated_words)
-        
-        start_index = 0
-        for j, idx in enumerate(group_indices):
-            num_original_words = len(original_words_in_group[j])
-            share = num_original_words / total_original_words if total_original_words > 0 else 0
-            num_translated_words = round(share * total_translated_words)
-            
-            if j == len(group_indices) - 1:
-                chunk = translated_words[start_index:]
-            else:
-                chunk = translated_words[start_index : start_index + num_translated_words]
-            
-            self.found_rects[idx]['translated'] = " ".join(chunk)
-            start_index += num_translated_words
+        distribute_text_to_group(self.found_rects, self.translation_groups[group_index], new_text)
+        self.dirty_rects.update(self.translation_groups[group_index])
 
     # ======================================================================
     # МЕТОДИ РОБОТИ ЗІ СТОРІНКАМИ (без змін)
@@ -648,16 +884,21 @@ class ManhwaTranslatorApp(QMainWindow):
             item = QListWidgetItem()
             item.setData(Qt.ItemDataRole.UserRole, path)
             item.setText(os.path.basename(path)) 
-            thumb = QPixmap(path).scaled(self.page_list_widget.iconSize(), 
-                                           Qt.AspectRatioMode.KeepAspectRatio, 
-                                           Qt.TransformationMode.SmoothTransformation)
-            item.setIcon(QIcon(thumb))
             self.page_list_widget.addItem(item)
+            # Мініатюра з'явиться, щойно її підготує фоновий пул
+            self.thumbnail_loader.request(path)
         self.renumber_pages()
         if self.page_list_widget.count() > 0 and self.image_path is None:
             self.page_list_widget.setCurrentRow(0)
         self.status_bar.showMessage(f"Готово. Всього сторінок: {self.page_list_widget.count()}", 5000)
 
+    def on_thumbnail_ready(self, path, image):
+        icon = QIcon(QPixmap.fromImage(image))
+        for i in range(self.page_list_widget.count()):
+            item = self.page_list_widget.item(i)
+            if item.data(Qt.ItemDataRole.UserRole) == path:
+                item.setIcon(icon)
+
     def delete_page(self):
         selected_item = self.page_list_widget.currentItem()
         if not selected_item: return
@@ -678,6 +919,7 @@ class ManhwaTranslatorApp(QMainWindow):
             path = item.data(Qt.ItemDataRole.UserRole)
             item.setText(f"{i + 1}. {os.path.basename(path)}")
         self.update_page_control_buttons()
+        self.schedule_autosave()
 
     def move_left(self):
         current_row = self.page_list_widget.currentRow()
@@ -722,24 +964,37 @@ class ManhwaTranslatorApp(QMainWindow):
         path = current.data(Qt.ItemDataRole.UserRole) if current else None
         self.display_page(path)
         self.update_page_control_buttons()
+        self.prefetch_neighbour_pages()
+
+    def prefetch_neighbour_pages(self, radius=1):
+        """Завантажує у фоні сусідні сторінки в порядку списку, щоб перемикання було миттєвим."""
+        row = self.page_list_widget.currentRow()
+        if row < 0: return
+        rows = [r for offset in range(1, radius + 1) for r in (row + offset, row - offset)]
+        paths = [self.page_list_widget.item(r).data(Qt.ItemDataRole.UserRole)
+                 for r in rows if 0 <= r < self.page_list_widget.count()]
+        self.page_cache.prefetch(paths)
 
     def display_page(self, path):
+        self.flush_rendered()
         if not path:
             self.image_path = None
             self.current_pixmap = QPixmap()
             self.original_image_label.set_pixmap(self.current_pixmap)
-            self.translated_image_label.setPixmap(QPixmap())
+            self.translated_image_label.set_pixmap(QPixmap())
             self.minimap.set_pixmap(QPixmap())
             self.text_list.clear()
             self.clear_edit_panel()
             self.original_image_label.set_selected_indices([])
-            self.found_rects = []
+            self.found_rects = []; self.translation_groups = []; self.sentences_to_translate = []
+            self.reset_render_state()
+            self.original_image_label.set_rects(self.found_rects)
             self.view_stack.setCurrentWidget(self.drop_zone)
             self.update_button_states()
             return
             
         self.image_path = path
-        self.current_pixmap = QPixmap(path)
+        self.current_pixmap = QPixmap.fromImage(self.page_cache.load(path))
         if self.current_pixmap.isNull():
             self.status_bar.showMessage(f"Помилка: не вдалося завантажити зображення {path}")
             self.image_path = None
@@ -747,20 +1002,86 @@ class ManhwaTranslatorApp(QMainWindow):
             
         self.original_image_label.set_pixmap(self.current_pixmap)
         self.minimap.set_pixmap(self.current_pixmap)
-        self.translated_pixmap = QPixmap()
-        self.translated_image_label.setPixmap(QPixmap())
         self.translated_image_label.setFixedSize(0,0)
-        self.status_bar.showMessage(f"Відкрито: {path}")
-        self.text_list.clear()
         self.clear_edit_panel()
         self.original_image_label.set_selected_indices([])
-        self.found_rects = []
+        # Відновлюємо збережений стан сторінки замість повторного розпізнавання та перекладу
+        self.reset_render_state()
+        state = self.project_store.get(path)
+        if state:
+            self.found_rects = deserialize_rects(state['found_rects'])
+            self.translation_groups = state['groups']
+            self.sentences_to_translate = state['sentences']
+            self.translated_pixmap = QPixmap.fromImage(self.project_store.load_rendered(path))
+            self.status_bar.showMessage(f"Відкрито: {path} (відновлено {len(self.found_rects)} блоків)")
+        else:
+            self.found_rects = []; self.translation_groups = []; self.sentences_to_translate = []
+            self.translated_pixmap = QPixmap()
+            self.status_bar.showMessage(f"Відкрито: {path}")
+        self.translated_image_label.set_pixmap(self.translated_pixmap)
+        self.original_image_label.set_rects(self.found_rects)
+        self.populate_text_list()
         self.view_stack.setCurrentWidget(self.view_stack.widget(1))
         QApplication.processEvents()
         self.balance_image_splitter()
         self.update_image_display_sizes()
         self.update_button_states()
     
+    def populate_text_list(self):
+        self.text_list.clear()
+        for i, sentence in enumerate(self.sentences_to_translate):
+            item = QListWidgetItem(f"{i+1}. {sentence[:60]}...")
+            item.setData(Qt.ItemDataRole.UserRole, i) # Зберігаємо індекс групи
+            self.text_list.addItem(item)
+
+    # ======================================================================
+    # ЗБЕРЕЖЕННЯ СТАНУ СТОРІНОК
+    # ======================================================================
+    def store_page_state(self):
+        """Запам'ятовує стан поточної сторінки і планує автозбереження проєкту."""
+        if not self.image_path: return
+        self.project_store.put(self.image_path, self.found_rects, self.translation_groups, self.sentences_to_translate)
+        self.schedule_autosave()
+
+    def schedule_autosave(self):
+        self.autosave_timer.start()
+
+    def flush_rendered(self):
+        """Записує відтворену сторінку, змінену живим переглядом після останнього збереження."""
+        if self._rendered_unsaved and self.image_path:
+            self.project_store.save_rendered(self.image_path, self.translated_pixmap.toImage())
+        self._rendered_unsaved = False
+
+    def autosave(self):
+        try:
+            self.flush_rendered()
+            self.project_store.save()
+            paths = [self.page_list_widget.item(i).data(Qt.ItemDataRole.UserRole)
+                     for i in range(self.page_list_widget.count())]
+            self.project_store.save_session(paths)
+        except OSError as e:
+            self.status_bar.showMessage(f"Помилка автозбереження проєкту: {e}")
+
+    def offer_session_restore(self):
+        """Пропонує відкрити сторінки попередньої сесії (наприклад, після аварійного завершення)."""
+        if self.page_list_widget.count() > 0: return
+        paths = self.project_store.load_session()
+        if not paths: return
+        reply = QMessageBox.question(self, "Відновлення сесії",
+                                     f"Відкрити {len(paths)} сторінок з попередньої сесії?",
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                                     QMessageBox.StandardButton.Yes)
+        if reply == QMessageBox.StandardButton.Yes:
+            self.add_pages(paths)
+
+    def closeEvent(self, event):
+        self.render_pool.cancel_pending()
+        self.render_pool.wait()
+        self.autosave_timer.stop()
+        self.autosave()
+        self.project_store.wait_for_pending()
+        super().closeEvent(event)
+
     @pyqtSlot(int)
     def sync_scroll_from_original(self, value):
         if not self._is_scrolling:
@@ -776,34 +1097,48 @@ class ManhwaTranslatorApp(QMainWindow):
             self._is_scrolling = False
 
     def start_ocr_initialization(self):
-        self.set_buttons_enabled(False)
+        """Завантажує OCR-моделі у фоні. Повторний виклик під час завантаження нічого не робить."""
+        if self.ocr_reader is not None or self.ocr_thread is not None: return
+        self.btn_warmup_ocr.setEnabled(False)
         self.status_bar.showMessage("Завантаження OCR-моделей... Це може зайняти хвилину.")
-        self.progress_bar.setRange(0, 0); self.progress_bar.setFormat("Ініціалізація..."); self.progress_bar.show()
-        self.thread = QThread()
-        self.worker = Worker(self._initialize_ocr_task)
-        self.worker.moveToThread(self.thread)
-        self.worker.finished.connect(self.on_ocr_initialized)
-        self.thread.started.connect(self.worker.run)
-        self.worker.error.connect(self.on_task_error)
-        self.worker.finished.connect(self.thread.quit); self.worker.finished.connect(self.worker.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
-        self.thread.start()
+        self.progress_bar.setRange(0, 0); self.progress_bar.setFormat("Ініціалізація OCR..."); self.progress_bar.show()
+        self.ocr_thread = QThread(self)
+        self.ocr_worker = Worker(self._initialize_ocr_task)
+        self.ocr_worker.moveToThread(self.ocr_thread)
+        self.ocr_worker.finished.connect(self.on_ocr_initialized)
+        self.ocr_thread.started.connect(self.ocr_worker.run)
+        self.ocr_worker.error.connect(self.on_ocr_initialization_error)
+        self.ocr_worker.finished.connect(self.ocr_thread.quit); self.ocr_worker.finished.connect(self.ocr_worker.deleteLater)
+        self.ocr_worker.error.connect(self.ocr_thread.quit); self.ocr_worker.error.connect(self.ocr_worker.deleteLater)
+        self.ocr_thread.finished.connect(self.ocr_thread.deleteLater)
+        self.ocr_thread.start()
 
     def _initialize_ocr_task(self):
-        ocr_langs = ['ko', 'en']
-        try:
-            reader = easyocr.Reader(ocr_langs, gpu=True)
-            device = "GPU"
-        except Exception:
-            reader = easyocr.Reader(ocr_langs, gpu=False)
-            device = "CPU"
-        return reader, device, ocr_langs
+        # Модель, уже завантажена службою OCR (ocr_daemon.py), спільна для всіх запусків програми
+        client = None
+        if not self._ocr_daemon_failed:
+            client = start_daemon(langs=OCR_LANGS) if self.use_ocr_daemon else connect_daemon(langs=OCR_LANGS)
+        if client is not None:
+            return client, f"служба OCR, {client.device}", OCR_LANGS
+        reader, device = create_reader(OCR_LANGS)
+        return reader, device, OCR_LANGS
 
     def on_ocr_initialized(self, result):
         self.ocr_reader, device, ocr_langs = result
+        self.ocr_thread = None; self.ocr_worker = None
+        self.btn_warmup_ocr.setEnabled(False)
+        self.btn_warmup_ocr.setText("OCR готовий")
         self.progress_bar.hide()
         self.status_bar.showMessage(f"OCR завантажено для {ocr_langs} ({device}). Готово до роботи!")
-        self.set_buttons_enabled(True)
+        if self._process_after_ocr:
+            self._process_after_ocr = False
+            self.start_full_process()
+
+    def on_ocr_initialization_error(self, error_info):
+        self.ocr_thread = None; self.ocr_worker = None
+        self._process_after_ocr = False
+        self.btn_warmup_ocr.setEnabled(True)
+        self.on_task_error(error_info)
         
     def get_stylesheet(self):
         return """
@@ -832,18 +1167,6 @@ class ManhwaTranslatorApp(QMainWindow):
             QStatusBar { background-color: #23272a; }
         """
 
-    def load_fonts(self, fonts_dir):
-        loaded_font_families = []
-        if not os.path.isdir(fonts_dir): return []
-        for font_file in os.listdir(fonts_dir):
-            if font_file.lower().endswith(('.ttf', '.otf')):
-                font_path = os.path.join(fonts_dir, font_file)
-                font_id = QFontDatabase.addApplicationFont(font_path)
-                if font_id != -1:
-                    family = QFontDatabase.applicationFontFamilies(font_id)[0]
-                    loaded_font_families.append(family)
-        return loaded_font_families
-    
     def update_image_display_sizes(self):
         if self.current_pixmap.isNull():
             self.original_image_label.setFixedSize(0,0)
@@ -859,43 +1182,117 @@ class ManhwaTranslatorApp(QMainWindow):
         self.original_image_label.setFixedSize(display_width, display_height)
         self.translated_image_label.setFixedSize(display_width, display_height)
         self.original_image_label.update_scaled_display()
-        self.display_translated_image()
-        QApplication.processEvents()
+        self.translated_image_label.update_scaled_display()
         self.minimap.update_viewport()
 
+    def on_interactive_resize(self):
+        """Під час перетягування показуємо швидке масштабування, якісне — після паузи."""
+        self.original_image_label.set_fast_mode(True)
+        self.translated_image_label.set_fast_mode(True)
+        self.update_image_display_sizes()
+        self.resize_timer.start()
+
+    def finish_interactive_resize(self):
+        self.original_image_label.set_fast_mode(False)
+        self.translated_image_label.set_fast_mode(False)
+
+    def reset_render_state(self):
+        self.dirty_rects.clear()
+        self.rendered_bounds = None
+        self._rendered_unsaved = False
+        self.clean_image = QImage()
+
+    def on_text_removal_changed(self):
+        # Інший спосіб видалення тексту змінює всю сторінку — потрібне повне відтворення
+        self.rendered_bounds = None
+        if not self.translated_pixmap.isNull() and self.found_rects:
+            self.render_translated_image()
+
     def render_translated_image(self):
         if self.current_pixmap.isNull(): return
+        if self.rendered_bounds is not None and not self.translated_pixmap.isNull():
+            self.render_dirty_rects()
+            self.status_bar.showMessage("Відтворення завершено.")
+            return
         self.status_bar.showMessage("Виконується відтворення...")
-        QApplication.processEvents()
-        self.translated_pixmap = self.current_pixmap.copy()
+        self.store_page_state()
+        self.render_pool.submit(self.image_path, self.found_rects, self.page_cache.peek(self.image_path),
+                                self.text_removal_combo.currentData())
+
+    def render_all_pages(self):
+        """Відтворює всі перекладені сторінки розділу паралельно, не блокуючи інтерфейс."""
+        self.store_page_state()
+        jobs = []
+        for i in range(self.page_list_widget.count()):
+            path = self.page_list_widget.item(i).data(Qt.ItemDataRole.UserRole)
+            if path == self.image_path:
+                found_rects = self.found_rects
+            else:
+                state = self.project_store.get(path)
+                if not state: continue
+                found_rects = deserialize_rects(state['found_rects'])
+            if any(item.get('translated') for item in found_rects):
+                jobs.append((path, found_rects))
+        if not jobs:
+            self.status_bar.showMessage("Немає перекладених сторінок для відтворення.")
+            return
+        self.render_all_pending = {path for path, _ in jobs}
+        self.render_all_total = len(jobs)
+        self.btn_render_all.setEnabled(False)
+        self.status_bar.showMessage(f"Відтворення сторінок: 0/{self.render_all_total}...")
+        for path, found_rects in jobs:
+            self.render_pool.submit(path, found_rects, self.page_cache.peek(path), self.text_removal_combo.currentData())
+
+    def on_page_rendered(self, path, image, background, found_rects):
+        self.project_store.save_rendered(path, image)
+        self.schedule_autosave()
+        # Показуємо результат, лише якщо сторінка відкрита і її блоки не перерозпізнавали
+        if path == self.image_path and len(found_rects) == len(self.found_rects):
+            self.translated_pixmap = QPixmap.fromImage(image)
+            self.rendered_bounds = painted_bounds(found_rects)
+            self.clean_image = background
+            self._rendered_unsaved = False
+            self.display_translated_image()
+            # Правки, зроблені під час відтворення, домальовуємо інкрементно
+            self.dirty_rects = {i for i, (rendered, current) in enumerate(zip(found_rects, self.found_rects))
+                                if rendered != current}
+            self.render_dirty_rects()
+            self.update_button_states()
+        self._finish_render_job(path, "Відтворення завершено.")
+
+    def on_page_render_failed(self, path, message):
+        print(f"Помилка відтворення {path}: {message}")
+        self._finish_render_job(path, f"Помилка відтворення: {message}")
+
+    def _finish_render_job(self, path, message):
+        if path not in self.render_all_pending:
+            self.status_bar.showMessage(message)
+            return
+        self.render_all_pending.discard(path)
+        done = self.render_all_total - len(self.render_all_pending)
+        if self.render_all_pending:
+            self.status_bar.showMessage(f"Відтворення сторінок: {done}/{self.render_all_total}...")
+        else:
+            self.status_bar.showMessage(f"Відтворено сторінок: {done}.")
+            self.btn_render_all.setEnabled(True)
+
+    def render_dirty_rects(self):
+        """Перемальовує на відтвореній сторінці лише рамки, змінені з минулого відтворення."""
+        if not self.dirty_rects or self.translated_pixmap.isNull(): return
         painter = QPainter(self.translated_pixmap)
-        for item in self.found_rects:
-            if not item.get('translated', ''): continue
-            rect, text = item['rect'], item['translated']
-            font_name = item['font']
-            font_size = item['font_size']
-            font = QFont(font_name, font_size)
-            if "Badaboom" in font_name:
-                font.setLetterSpacing(QFont.SpacingType.AbsoluteSpacing, 3)
-            painter.setFont(font)
-            painter.fillRect(rect, Qt.GlobalColor.white)
-            painter.setPen(Qt.GlobalColor.black)
-            painter.drawText(rect, int(Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap), text)
+        region = redraw_dirty(painter, self.current_pixmap, self.found_rects, self.dirty_rects, self.rendered_bounds,
+                              None if self.clean_image.isNull() else self.clean_image)
         painter.end()
-        self.display_translated_image()
-        self.status_bar.showMessage("Відтворення завершено.")
+        self.dirty_rects.clear()
+        if region.isEmpty(): return
+        self.translated_image_label.update_pixmap_region(self.translated_pixmap, region.boundingRect())
+        # Файл відтвореної сторінки перезаписується разом з автозбереженням, а не на кожне натискання клавіші
+        self._rendered_unsaved = True
+        self.schedule_autosave()
         self.update_button_states()
 
     def display_translated_image(self):
-        if self.translated_pixmap.isNull() or self.translated_image_label.size().width() <= 0:
-            self.translated_image_label.setPixmap(QPixmap())
-            return
-        scaled_pixmap = self.translated_pixmap.scaled(
-            self.translated_image_label.size(),
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
-        self.translated_image_label.setPixmap(scaled_pixmap)
+        self.translated_image_label.set_pixmap(self.translated_pixmap)
 
     def save_translated_image(self):
         if self.translated_pixmap.isNull(): return
@@ -904,6 +1301,67 @@ class ManhwaTranslatorApp(QMainWindow):
             self.translated_pixmap.save(path)
             self.status_bar.showMessage(f"Збережено в: {path}")
 
+    def export_chapter_dialog(self):
+        """Експортує всі відтворені сторінки розділу у фоні. Під час експорту кнопка скасовує його."""
+        if self._export_cancelled is not None:
+            self._export_cancelled = True
+            self.btn_export.setEnabled(False)
+            self.btn_export.setText("Скасування...")
+            return
+        self.flush_rendered()
+        sources = []
+        for i in range(self.page_list_widget.count()):
+            source = self.project_store.rendered_source(self.page_list_widget.item(i).data(Qt.ItemDataRole.UserRole))
+            if source is not None:
+                sources.append(source)
+        if not sources:
+            QMessageBox.information(self, "Експорт розділу", "Немає відтворених сторінок. Спочатку відтворіть сторінки.")
+            return
+        default_dir = os.path.join(os.path.dirname(self.image_path), "export") if self.image_path else ""
+        dialog = ExportDialog(len(sources), default_dir, self)
+        if not dialog.exec(): return
+        output_dir = dialog.output_dir()
+
+        self._export_cancelled = False
+        self.btn_export.setText("Скасувати експорт")
+        self.export_progress = ProgressSignal(self)
+        self.export_progress.progress.connect(self.on_export_progress)
+        self.export_thread = QThread(self)
+        self.export_worker = Worker(export_chapter, sources, output_dir, dialog.options(),
+                                    progress=self.export_progress.progress.emit,
+                                    is_cancelled=lambda: self._export_cancelled)
+        self.export_worker.moveToThread(self.export_thread)
+        self.export_thread.started.connect(self.export_worker.run)
+        self.export_worker.finished.connect(lambda written: self.on_export_finished(written, output_dir))
+        self.export_worker.error.connect(self.on_export_error)
+        self.export_worker.finished.connect(self.export_thread.quit); self.export_worker.error.connect(self.export_thread.quit)
+        self.export_worker.finished.connect(self.export_worker.deleteLater)
+        self.export_thread.finished.connect(self.export_thread.deleteLater)
+        self.status_bar.showMessage(f"Експорт {len(sources)} сторінок...")
+        self.export_thread.start()
+
+    def on_export_progress(self, done, total):
+        self.status_bar.showMessage(f"Експорт: {done}/{total} файлів...")
+
+    def on_export_finished(self, written, output_dir):
+        if self._export_cancelled:
+            self.status_bar.showMessage(f"Експорт скасовано, записано файлів: {len(written)} у {output_dir}")
+        else:
+            self.status_bar.showMessage(f"Експортовано файлів: {len(written)} у {output_dir}")
+        self._reset_export_button()
+
+    def on_export_error(self, error_info):
+        exctype, value, tb_str = error_info
+        print(tb_str)
+        self._reset_export_button()
+        QMessageBox.critical(self, "Помилка експорту", str(value))
+        self.status_bar.showMessage(f"Помилка експорту: {value}")
+
+    def _reset_export_button(self):
+        self._export_cancelled = None
+        self.btn_export.setText("Експортувати розділ")
+        self.btn_export.setEnabled(True)
+
     def balance_image_splitter(self):
         total_width = self.image_splitter.width()
         sizes = [total_width // 2, total_width - (total_width // 2)]
@@ -912,12 +1370,13 @@ class ManhwaTranslatorApp(QMainWindow):
     def resizeEvent(self, event):
         super().resizeEvent(event)
         self.balance_image_splitter()
-        self.update_image_display_sizes()
+        self.on_interactive_resize()
         if hasattr(self, 'minimap'):
             self.minimap.update_viewport()
             
     def update_data_from_panel(self):
         # ЗМІНЕНО: Оновлює дані для всієї групи
+        if self._loading_panel: return
         current_item = self.text_list.currentItem()
         if not current_item: return
         
@@ -926,20 +1385,31 @@ class ManhwaTranslatorApp(QMainWindow):
             # 1. Застосовуємо шрифт і розмір до всіх блоків у групі
             new_font = self.font_combo.currentText()
             new_size = self.font_size_spin.value()
+            auto_fit = self.auto_fit_check.isChecked()
+            self.font_size_spin.setEnabled(not auto_fit)
             group_indices = self.translation_groups[group_index]
             for idx in group_indices:
                 self.found_rects[idx]['font'] = new_font
-                self.found_rects[idx]['font_size'] = new_size
+                self.found_rects[idx]['auto_fit'] = auto_fit
+                # Підібраний розмір не записуємо: він залежить від тексту й перераховується при відтворенні
+                if not auto_fit:
+                    self.found_rects[idx]['font_size'] = new_size
+            self.dirty_rects.update(group_indices)
 
             # 2. Розподіляємо відредагований переклад по блоках групи
             new_translated_text = self.translated_text.toPlainText()
             self._distribute_text_to_group(group_index, new_translated_text)
+            self.store_page_state()
+            # Живий перегляд: якщо сторінку вже відтворено, одразу перемальовуємо змінені рамки
+            if self.rendered_bounds is not None:
+                self.render_dirty_rects()
 
             self.update_button_states()
 
     def update_edit_panel(self, current_row):
         # ЗМІНЕНО: Показує дані для всієї групи
         if 0 <= current_row < len(self.translation_groups):
+            self._loading_panel = True
             group_index = current_row
             group_indices = self.translation_groups[group_index]
             
@@ -957,97 +1427,107 @@ class ManhwaTranslatorApp(QMainWindow):
             first_item_data = self.found_rects[group_indices[0]]
             font_name = first_item_data.get('font', self.loaded_fonts[0] if self.loaded_fonts else "Arial")
             self.font_combo.setCurrentText(font_name)
-            self.font_size_spin.setValue(first_item_data.get('font_size', 14))
+            auto_fit = first_item_data.get('auto_fit', False)
+            self.auto_fit_check.setChecked(auto_fit)
+            self.font_size_spin.setEnabled(not auto_fit)
+            self.font_size_spin.setValue(font_size_for(first_item_data))
+            self._loading_panel = False
 
     def on_task_error(self, error_info):
         exctype, value, tb_str = error_info
         print(tb_str)
         QMessageBox.critical(self, "Помилка виконання", f"Сталася помилка:\n{value}\n\nДеталі в консолі.")
         self.status_bar.showMessage(f"Помилка: {value}")
+        self.processing_path = None
         self.progress_bar.hide()
         self.set_buttons_enabled(True)
 
     def start_full_process(self):
-        if not self.image_path or not self.ocr_reader: return
+        if not self.image_path: return
         self.set_buttons_enabled(False)
+        if self.ocr_reader is None:
+            # Перше розпізнавання: спершу завантажуємо модель, потім продовжуємо з on_ocr_initialized
+            self._process_after_ocr = True
+            self.start_ocr_initialization()
+            return
+        self.processing_path = self.image_path
         self.status_bar.showMessage("Крок 1/2: Розпізнавання тексту...")
         self.progress_bar.setRange(0, 0); self.progress_bar.setFormat("Аналіз зображення..."); self.progress_bar.show()
-        self.thread = QThread()
-        self.worker = Worker(self.ocr_reader.readtext, self.image_path)
+        self.thread = QThread(self)
+        self.worker = Worker(cached_ocr, self.ocr_reader, self.image_path, self.ocr_cache, self._group_text_bubbles)
         self.worker.moveToThread(self.thread)
         self.worker.finished.connect(self.on_detection_finished_and_start_translation)
         self.thread.started.connect(self.worker.run)
-        self.worker.error.connect(self.on_task_error)
+        self.worker.error.connect(self.on_ocr_error); self.worker.error.connect(self.thread.quit)
         self.worker.finished.connect(self.thread.quit); self.worker.finished.connect(self.worker.deleteLater)
         self.thread.finished.connect(self.thread.deleteLater)
         self.thread.start()
 
-    def _group_text_bubbles(self, ocr_results, max_distance=70):
-        if not ocr_results: return []
-        sorted_blocks = sorted(
-            [{
-                'id': i,
-                'rect': QRect(int(bbox[0][0]), int(bbox[0][1]), int(bbox[1][0] - bbox[0][0]), int(bbox[2][1] - bbox[1][1])),
-                'text': text
-            } for i, (bbox, text, prob) in enumerate(ocr_results)],
-            key=lambda b: (b['rect'].center().y(), b['rect'].center().x())
-        )
-        if not sorted_blocks: return []
-        groups = []
-        current_group = [sorted_blocks[0]['id']]
-        for i in range(1, len(sorted_blocks)):
-            prev_box = sorted_blocks[i-1]
-            current_box = sorted_blocks[i]
-            vertical_distance = current_box['rect'].top() - prev_box['rect'].bottom()
-            if 0 <= vertical_distance < max_distance:
-                current_group.append(current_box['id'])
+    def on_ocr_error(self, error_info):
+        exctype = error_info[0]
+        if isinstance(self.ocr_reader, OcrDaemonClient) and issubclass(exctype, OSError):
+            # Служба OCR зупинилася (простій, --stop) і не перезапустилася: повертаємо кнопку
+            # підготовки OCR і повторюємо розпізнавання з локальною моделлю
+            print(error_info[2])
+            self.ocr_reader.close()
+            self.ocr_reader = None
+            self._ocr_daemon_failed = True
+            self.btn_warmup_ocr.setText("Підготувати OCR")
+            self.btn_warmup_ocr.setEnabled(True)
+            retry = self.processing_path == self.image_path
+            self.processing_path = None
+            if retry:
+                self.status_bar.showMessage("Служба OCR недоступна, завантажуємо локальну модель...")
+                self.start_full_process()
             else:
-                groups.append(current_group)
-                current_group = [current_box['id']]
-        groups.append(current_group)
-        return groups
+                self.status_bar.showMessage("Служба OCR недоступна, наступне розпізнавання використає локальну модель.")
+                self.progress_bar.hide()
+                self.set_buttons_enabled(True)
+            return
+        self.on_task_error(error_info)
 
-    def on_detection_finished_and_start_translation(self, results):
-        self.found_rects = []
+    def _group_text_bubbles(self, ocr_results, max_distance=70):
+        return group_text_bubbles(ocr_results, max_distance)
+
+    def on_detection_finished_and_start_translation(self, ocr_output):
+        results, groups = ocr_output
+        found_rects = []
         for (bbox, text, prob) in results:
-            top_left, _, bottom_right, _ = bbox
-            rect = QRect(int(top_left[0]), int(top_left[1]), int(bottom_right[0] - top_left[0]), int(bottom_right[1] - top_left[1]))
+            rect = QRect(*bbox_to_rect(bbox))
             default_font = self.loaded_fonts[0] if self.loaded_fonts else "Arial"
-            self.found_rects.append({'rect': rect, 'text': text, 'translated': '', 'font': default_font, 'font_size': 14})
-        
-        self.translation_groups = self._group_text_bubbles(results)
-        self.sentences_to_translate = []
-        for group_idx, group in enumerate(self.translation_groups):
-            combined_text = " ".join(self.found_rects[i]['text'] for i in group)
-            self.sentences_to_translate.append(combined_text)
-
-        self.original_image_label.set_rects(self.found_rects)
-        self.text_list.clear()
-        
-        # ЗМІНЕНО: Заповнюємо список реченнями, а не блоками
-        for i, sentence in enumerate(self.sentences_to_translate):
-            item = QListWidgetItem(f"{i+1}. {sentence[:60]}...")
-            item.setData(Qt.ItemDataRole.UserRole, i) # Зберігаємо індекс групи
-            self.text_list.addItem(item)
-        
-        self.status_bar.showMessage(f"Розпізнано {len(self.found_rects)} блоків, згруповано в {len(self.translation_groups)} речень. Переклад...")
+            found_rects.append({'rect': rect, 'text': text, 'translated': '', 'font': default_font, 'font_size': 14,
+                                'auto_fit': True})
+        sentences = group_sentences(found_rects, groups)
+        # Користувач міг перейти на іншу сторінку, поки йшло розпізнавання:
+        # результат належить сторінці, для якої його запускали
+        self.project_store.put(self.processing_path, found_rects, groups, sentences)
+        self.schedule_autosave()
+
+        if self.processing_path == self.image_path:
+            self.found_rects = found_rects
+            self.reset_render_state()
+            self.translation_groups = groups
+            self.sentences_to_translate = sentences
+            self.original_image_label.set_rects(self.found_rects)
+            # ЗМІНЕНО: Заповнюємо список реченнями, а не блоками
+            self.populate_text_list()
+
+        self.status_bar.showMessage(f"Розпізнано {len(found_rects)} блоків, згруповано в {len(groups)} речень. Переклад...")
         self.progress_bar.setFormat("Переклад речень...")
         QApplication.processEvents()
-        self.translate_all_blocks()
+        self.translate_all_blocks(sentences)
 
-    def _translation_task(self, items, src_lang, dest_lang, service, api_key=""):
+    def _translation_task(self, items, src_lang, dest_lang, service, api_key="", model=None):
         try:
-            translator = None
-            if service == 'deepl':
-                translator = DeepLTranslator(api_key)
-            else:
-                translator = GoogleTranslator()
+            translator = get_translator(service, api_key, model)
+            translator = CachedTranslator(translator, self.translation_memory, service)
             return translator.translate_batch(items, src_lang, dest_lang)
         except Exception as e:
             raise e
 
-    def translate_all_blocks(self):
-        if not self.sentences_to_translate:
+    def translate_all_blocks(self, sentences):
+        if not sentences:
+            self.processing_path = None
             self.progress_bar.hide()
             self.set_buttons_enabled(True)
             return
@@ -1055,24 +1535,27 @@ class ManhwaTranslatorApp(QMainWindow):
         source_lang_code = self.source_lang_combo.currentData()
         target_lang_code = self.target_lang_combo.currentData()
         api_key = None
-        if service != 'google':
-            key_manager = ApiKeyManager()
-            api_key = key_manager.get_active_key(service)
+        if service not in KEYLESS_SERVICES:
+            # Усі ключі сервісу: перекладач розподіляє між ними запити і перемикається при вичерпанні квоти
+            api_key = tuple(ApiKeyManager().get_key_pool(service))
             if not api_key:
                 QMessageBox.warning(self, f"Немає API ключа",
                                     f"Для сервісу '{service.capitalize()}' не обрано активний API ключ.")
+                self.processing_path = None
                 self.progress_bar.hide()
                 self.set_buttons_enabled(True)
                 self.open_settings_dialog()
                 return
-        items_to_translate = [{'text': sentence} for sentence in self.sentences_to_translate]
-        self.thread = QThread()
+        items_to_translate = [{'text': sentence} for sentence in sentences]
+        self.translation_memory.reset_counters()
+        self.thread = QThread(self)
         self.worker = Worker(self._translation_task,
                              items_to_translate,
                              source_lang_code,
                              target_lang_code,
                              service,
-                             api_key=api_key)
+                             api_key=api_key,
+                             model=ApiKeyManager().get_model(service))
         self.worker.moveToThread(self.thread)
         self.thread.started.connect(self.worker.run)
         self.worker.finished.connect(self.on_translation_finished)
@@ -1084,10 +1567,24 @@ class ManhwaTranslatorApp(QMainWindow):
 
     def on_translation_finished(self, translated_sentences_items):
         translated_sentences = [item['translated'] for item in translated_sentences_items]
-        for i, group_indices in enumerate(self.translation_groups):
-            self._distribute_text_to_group(i, translated_sentences[i])
-        
-        self.status_bar.showMessage("Розпізнавання та переклад завершено.")
+        path, self.processing_path = self.processing_path, None
+        if path == self.image_path:
+            for i, group_indices in enumerate(self.translation_groups):
+                self._distribute_text_to_group(i, translated_sentences[i])
+            self.store_page_state()
+        else:
+            # Сторінку вже перемкнули — записуємо переклад прямо у збережений стан
+            state = self.project_store.get(path)
+            if state:
+                found_rects = deserialize_rects(state['found_rects'])
+                for group_indices, text in zip(state['groups'], translated_sentences):
+                    distribute_text_to_group(found_rects, group_indices, text)
+                self.project_store.put(path, found_rects, state['groups'], state['sentences'])
+                self.schedule_autosave()
+
+        stats = self.translation_memory.stats()
+        self.status_bar.showMessage(f"Розпізнавання та переклад завершено. "
+                                    f"З кешу: {stats['hits']}, через мережу: {stats['misses']}.")
         if self.text_list.currentRow() != -1:
             self.update_edit_panel(self.text_list.currentRow())
         self.progress_bar.hide()
@@ -1101,12 +1598,10 @@ class ManhwaTranslatorApp(QMainWindow):
         self.original_image_label.set_selected_indices([])
 
     def set_buttons_enabled(self, enabled):
-        is_ocr_ready = self.ocr_reader is not None
-        master_enabled = enabled and is_ocr_ready
-        self.btn_process.setEnabled(master_enabled)
-        self.btn_render.setEnabled(master_enabled)
-        self.btn_save.setEnabled(master_enabled)
-        if master_enabled:
+        self.btn_process.setEnabled(enabled)
+        self.btn_render.setEnabled(enabled)
+        self.btn_save.setEnabled(enabled)
+        if enabled:
             self.update_button_states()
         else:
             self.btn_process.setEnabled(False)
@@ -1114,14 +1609,12 @@ class ManhwaTranslatorApp(QMainWindow):
             self.btn_save.setEnabled(False)
 
     def update_button_states(self):
-        if self.ocr_reader is None:
-            self.set_buttons_enabled(False)
-            return
         has_image = not self.current_pixmap.isNull()
         has_rects = bool(self.found_rects)
         has_translations = has_rects and any(item.get('translated') for item in self.found_rects)
         has_rendered_image = not self.translated_pixmap.isNull()
-        self.btn_process.setEnabled(has_image)
+        # Поки завантажується OCR для розпізнавання, повторно запускати його не можна
+        self.btn_process.setEnabled(has_image and not self._process_after_ocr)
         self.btn_render.setEnabled(has_translations)
         self.btn_save.setEnabled(has_rendered_image)
         self.update_page_control_buttons()
@@ -1145,7 +1638,11 @@ class ManhwaTranslatorApp(QMainWindow):
         self.btn_to_end.setEnabled(is_not_last)
 
 if __name__ == '__main__':
-    required_files = ['translators.py', 'api_manager.py', 'settings_dialog.py', 'check_dialog.py']
+    required_files = ['translators.py', 'api_manager.py', 'settings_dialog.py', 'check_dialog.py',
+                      'translation_memory.py', 'ocr_engine.py', 'ocr_cache.py', 'text_grouping.py', 'renderer.py',
+                      'thumbnails.py', 'page_cache.py', 'project_state.py',
+                      'text_layout.py', 'render_pool.py', 'exporter.py', 'export_dialog.py', 'text_removal.py',
+                      'ocr_daemon.py', 'llm_translators.py']
     missing_files = [f for f in required_files if not os.path.exists(f)]
     
     if missing_files:
@@ -1156,6 +1653,8 @@ if __name__ == '__main__':
         sys.exit(1)
         
     app = QApplication(sys.argv)
-    window = ManhwaTranslatorApp()
+    window = ManhwaTranslatorApp(use_ocr_daemon="--ocr-daemon" in sys.argv)
     window.show()
+    if "--preload-ocr" in sys.argv:
+        window.start_ocr_initialization()
     sys.exit(app.exec())
\ No newline at end of file
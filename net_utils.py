@@ -0,0 +1,153 @@
+# net_utils.py
+# Спільні мережеві утиліти для перекладачів: обмеження частоти запитів, повтори з паузою
+# і HTTP-з'єднання, що залишаються відкритими між запитами.
+import http.client
+import io
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+
+
+class RateLimiter:
+    """Token bucket: не більше rate запитів за секунду з можливим сплеском до burst."""
+
+    def __init__(self, rate: float, burst: int = None):
+        if rate <= 0:
+            raise ValueError("Частота запитів повинна бути додатною.")
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Блокує потік, доки не з'явиться вільний токен."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# HTTP-коди, після яких має сенс повторити запит
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+def is_retryable_error(error: Exception) -> bool:
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (urllib.error.URLError, TimeoutError, ConnectionError))
+
+
+def retry_with_backoff(fn, max_retries=4, base_delay=0.5, max_delay=8.0, is_retryable=is_retryable_error):
+    """Викликає fn(), повторюючи при тимчасових помилках з експоненційною паузою та випадковим розкидом."""
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            delay = min(max_delay, base_delay * (2 ** attempt))
+            time.sleep(delay * random.uniform(0.5, 1.0))
+            attempt += 1
+
+
+class ConnectionPool:
+    """HTTP(S)-з'єднання з keep-alive: по одному на потік і хост.
+
+    На відміну від urllib.request.urlopen, наступні запити до того самого хоста не
+    платять за TCP- і TLS-рукостискання. Помилки HTTP піднімаються як urllib.error.HTTPError,
+    тож retry_with_backoff працює з ними так само, а мережеві збої (обірване з'єднання,
+    неповна відповідь, помилка DNS) — як urllib.error.URLError, як і в urlopen."""
+
+    def __init__(self, timeout=10.0):
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connections(self):
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+        return connections
+
+    def _connect(self, scheme, netloc):
+        connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return connection_class(netloc, timeout=self.timeout)
+
+    def request(self, method, url, body=None, headers=None) -> bytes:
+        """Виконує запит і повертає тіло відповіді."""
+        key, response = self._send(method, url, body, headers)
+        try:
+            data = response.read()
+        except (http.client.HTTPException, OSError) as e:
+            self._drop(key)
+            raise urllib.error.URLError(e) from e
+        return self._finish(key, url, response, data)
+
+    def stream_lines(self, method, url, body=None, headers=None):
+        """Виконує запит і віддає рядки тіла відповіді в міру надходження (для потокових відповідей)."""
+        key, response = self._send(method, url, body, headers)
+        if response.status >= 400:
+            self._finish(key, url, response, response.read())
+        try:
+            while True:
+                line = response.readline()
+                if not line:
+                    break
+                yield line.decode('utf-8').rstrip("\r\n")
+            # read() закриває відповідь — без цього http.client не дозволить наступний запит у з'єднанні
+            data = response.read()
+        except (http.client.HTTPException, OSError) as e:
+            self._drop(key)
+            raise urllib.error.URLError(e) from e
+        except BaseException:
+            # Відповідь прочитано не до кінця — з'єднання не можна використати повторно
+            self._drop(key)
+            raise
+        self._finish(key, url, response, data)
+
+    def _drop(self, key):
+        connection = self._connections().pop(key, None)
+        if connection is not None:
+            connection.close()
+
+    def _finish(self, key, url, response, data) -> bytes:
+        if response.will_close:
+            self._drop(key)
+        if response.status >= 400:
+            raise urllib.error.HTTPError(url, response.status, response.reason, response.headers, io.BytesIO(data))
+        return data
+
+    def _send(self, method, url, body, headers):
+        """Надсилає запит і повертає (ключ з'єднання, відповідь з непрочитаним тілом)."""
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        connections = self._connections()
+        while True:
+            connection = connections.get(key)
+            reused = connection is not None
+            if not reused:
+                connection = connections[key] = self._connect(*key)
+            try:
+                connection.request(method, path, body=body, headers=headers or {})
+                return key, connection.getresponse()
+            except (http.client.HTTPException, OSError) as e:
+                self._drop(key)
+                # Сервер міг закрити з'єднання, що простоювало: одна повторна спроба з новим
+                if not reused:
+                    raise urllib.error.URLError(e) from e
+
+    def close(self):
+        """Закриває з'єднання поточного потоку."""
+        for connection in self._connections().values():
+            connection.close()
+        self._local.connections = {}
@@ -0,0 +1,122 @@
+# ocr_cache.py
+# Дисковий кеш результатів OCR. Ключ — хеш вмісту зображення разом з мовами
+# та версією моделі, тож повторне відкриття сторінки, повторне відтворення
+# чи зміна мови перекладу не запускають розпізнавання вдруге.
+import hashlib
+import json
+import os
+import threading
+
+from text_grouping import GROUPING_VERSION
+from ocr_engine import OCR_LANGS, DEFAULT_STRIP_HEIGHT, DEFAULT_STRIP_OVERLAP, ocr_model_version, readtext_tiled
+
+DEFAULT_CACHE_DIR = os.path.join("cache", "ocr")
+
+
+def hash_file(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class OcrCache:
+    """Кеш у вигляді JSON-файлів з обмеженням загального розміру і витісненням найдавніше використаних."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=256 * 1024 * 1024, langs=None, model_version=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.langs = langs or OCR_LANGS
+        # Версію моделі шукаємо в метаданих пакетів лише під час першого звернення до кешу
+        self._model_version = model_version
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @property
+    def model_version(self):
+        if self._model_version is None:
+            self._model_version = ocr_model_version()
+        return self._model_version
+
+    def key_for(self, image_path, variant=""):
+        """Ключ запису. variant відрізняє різні режими розпізнавання того самого зображення."""
+        parts = [hash_file(image_path), ",".join(self.langs), self.model_version, variant]
+        return hashlib.sha256("|".join(parts).encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """Повертає (ocr_results, groups) або None, якщо запису немає."""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+        # Оновлюємо час доступу для LRU-витіснення
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        results = [(bbox, text, prob) for bbox, text, prob in data['results']]
+        return results, data['groups']
+
+    def put(self, key, ocr_results, groups):
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'results': ocr_results, 'groups': groups}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            total = 0
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith('.json'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+            if total <= self.max_bytes:
+                return
+            for _, size, path in sorted(entries):
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                if total <= self.max_bytes * 0.9:
+                    break
+
+    def clear(self):
+        with self._lock:
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith('.json'):
+                    os.remove(entry.path)
+
+
+def cached_ocr(reader, image_path, cache, group_fn,
+               strip_height=DEFAULT_STRIP_HEIGHT, overlap=DEFAULT_STRIP_OVERLAP, workers=1):
+    """Розпізнає сторінку (довгі — смугами) та групує блоки, використовуючи кеш, якщо він переданий."""
+    variant = f"groups:{GROUPING_VERSION}"
+    if strip_height:
+        variant += f"|strips:{strip_height}:{overlap}"
+    key = cache.key_for(image_path, variant) if cache else None
+    if cache:
+        cached = cache.get(key)
+        if cached:
+            return cached
+    results = readtext_tiled(reader, image_path, strip_height, overlap, workers)
+    groups = group_fn(results)
+    if cache:
+        cache.put(key, results, groups)
+    return results, groups
@@ -0,0 +1,388 @@
+# ocr_daemon.py
+# Локальна служба OCR: довгоживучий процес, що один раз завантажує easyocr.Reader
+# і обслуговує запити readtext від вікон програми та консольної обробки. Кілька
+# запущених програм користуються однією «теплою» моделлю замість того, щоб кожна
+# завантажувала свою.
+#   python ocr_daemon.py                 # запустити службу
+#   python ocr_daemon.py --status        # перевірити, чи працює
+#   python ocr_daemon.py --stop          # зупинити
+#
+# Протокол — рядки JSON через TCP на 127.0.0.1. Запит: {"op": ..., "token": ..., ...}\n, для
+# масиву пікселів за рядком ідуть "size" байтів сирих даних. Відповідь:
+# {"ok": true, ...}\n або {"ok": false, "error": "..."}\n.
+# token — секрет, який служба під час запуску записує у файл, доступний лише
+# користувачеві; без нього інші локальні процеси не можуть ні зупинити службу,
+# ні змусити її читати файли.
+import argparse
+import hmac
+import json
+import os
+import secrets
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+
+from ocr_engine import OCR_LANGS, create_reader, ocr_model_version, to_plain_results
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 47719
+# Служба, запущена автоматично, завершується, якщо до неї стільки секунд ніхто не звертався
+DEFAULT_IDLE_TIMEOUT = 30 * 60
+CONNECT_TIMEOUT = 2.0
+# Шляхи прив'язані до папки модуля, а не до робочої папки того, хто запускає службу
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+LOG_PATH = os.path.join(CACHE_DIR, "ocr_daemon.log")
+TOKEN_PATH = os.path.join(CACHE_DIR, "ocr_daemon.token")
+
+
+# ======================================================================
+# СЛУЖБА
+# ======================================================================
+class OcrDaemon:
+    """Стан служби: модель, що завантажується у фоні, і замок — Reader не розрахований на паралельні виклики."""
+
+    def __init__(self, langs=None, gpu=True):
+        self.langs = langs or OCR_LANGS
+        self.gpu = gpu
+        self.reader = None
+        self.device = None
+        self.error = None
+        self.ready = threading.Event()
+        self.last_activity = time.monotonic()
+        self._lock = threading.Lock()
+
+    def load(self):
+        try:
+            self.reader, self.device = create_reader(self.langs, gpu=self.gpu)
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+        self.ready.set()
+
+    def _require_reader(self):
+        self.ready.wait()
+        if self.error:
+            raise RuntimeError(f"OCR-модель не завантажено: {self.error}")
+
+    def handle(self, request, rfile):
+        self.last_activity = time.monotonic()
+        op = request.get('op')
+        if op == 'ping':
+            if request.get('wait'):
+                self.ready.wait()
+            return {'ok': self.error is None, 'error': self.error, 'ready': self.ready.is_set(),
+                    'langs': self.langs, 'device': self.device, 'pid': os.getpid(),
+                    'model_version': ocr_model_version()}
+        if op == 'readtext':
+            image = request.get('path')
+            if image is None:
+                import numpy as np
+                payload = rfile.read(request['size'])
+                if len(payload) != request['size']:
+                    raise ConnectionError("з'єднання обірвалося під час передачі зображення")
+                image = np.frombuffer(payload, dtype=request['dtype']).reshape(request['shape'])
+            self._require_reader()
+            with self._lock:
+                results = to_plain_results(self.reader.readtext(image))
+            self.last_activity = time.monotonic()
+            return {'ok': True, 'results': results}
+        raise ValueError(f"Невідома операція: {op}")
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        daemon = self.server.daemon
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError:
+                # Після зіпсованого заголовка невідомо, де починається наступний запит
+                self._send({'ok': False, 'error': "некоректний запит"})
+                return
+            # compare_digest приймає рядки лише з ASCII, тож порівнюються байти
+            token = str(request.get('token', '')).encode('utf-8')
+            if not hmac.compare_digest(token, self.server.token.encode('utf-8')):
+                self._send({'ok': False, 'error': "доступ заборонено: невірний токен"})
+                return
+            if request.get('op') == 'shutdown':
+                self._send({'ok': True})
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+            try:
+                response = daemon.handle(request, self.rfile)
+            except ConnectionError:
+                return
+            except Exception as e:
+                response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+            self._send(response)
+
+    def _send(self, response):
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b"\n")
+        self.wfile.flush()
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = sys.platform != "win32"
+
+
+def _write_token(token):
+    """Записує токен у файл, який може читати лише поточний користувач."""
+    os.makedirs(os.path.dirname(TOKEN_PATH), exist_ok=True)
+    fd = os.open(TOKEN_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    # Права нового файлу задає O_CREAT, а файлу від попереднього запуску — chmod
+    os.chmod(TOKEN_PATH, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(token)
+
+
+def _remove_token(token):
+    try:
+        with open(TOKEN_PATH, encoding='utf-8') as f:
+            if f.read().strip() != token:
+                # Файл уже належить іншій копії служби
+                return
+        os.remove(TOKEN_PATH)
+    except OSError:
+        pass
+
+
+def _read_token():
+    try:
+        with open(TOKEN_PATH, encoding='utf-8') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _watch_idle(server, daemon, idle_timeout):
+    while True:
+        time.sleep(min(60, idle_timeout))
+        if time.monotonic() - daemon.last_activity > idle_timeout:
+            print("Служба OCR простоювала надто довго і завершує роботу.")
+            server.shutdown()
+            return
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, langs=None, gpu=True, idle_timeout=0):
+    """Запускає службу і блокує потік до її зупинки.
+
+    Порт відкривається одразу, а модель завантажується у фоні: клієнти можуть
+    під'єднатися й чекати на готовність (ping з wait)."""
+    daemon = OcrDaemon(langs, gpu)
+    try:
+        server = _Server((host, port), _RequestHandler)
+    except OSError as e:
+        print(f"Не вдалося відкрити {host}:{port} ({e}). Можливо, служба OCR вже працює.")
+        return 1
+    server.daemon = daemon
+    # Токен пишеться лише після того, як порт зайнято, щоб не затерти токен уже запущеної служби
+    server.token = secrets.token_hex(32)
+    _write_token(server.token)
+
+    def load():
+        daemon.load()
+        if daemon.error:
+            print(f"Не вдалося завантажити OCR-модель: {daemon.error}")
+            server.shutdown()
+        else:
+            print(f"OCR-модель завантажено ({daemon.device}).")
+    threading.Thread(target=load, daemon=True).start()
+    if idle_timeout > 0:
+        threading.Thread(target=_watch_idle, args=(server, daemon, idle_timeout), daemon=True).start()
+    print(f"Служба OCR слухає {host}:{port} (мови: {daemon.langs}, pid {os.getpid()}).")
+    try:
+        with server:
+            server.serve_forever()
+    finally:
+        _remove_token(server.token)
+    return 0
+
+
+# ======================================================================
+# КЛІЄНТ
+# ======================================================================
+class OcrDaemonClient:
+    """Клієнт служби OCR. Має метод readtext, тож його можна передавати замість Reader.
+
+    Кожен потік тримає власне з'єднання; розірване з'єднання відновлюється один раз.
+    Клієнт, отриманий від start_daemon, запускає службу знову, якщо вона встигла
+    завершитися (наприклад, після простою)."""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self.device = None
+        # Параметри start_daemon для перезапуску служби; None — клієнт службою не керує
+        self.launch_options = None
+        self._local = threading.local()
+
+    def _connection(self):
+        stream = getattr(self._local, 'stream', None)
+        if stream is None:
+            sock = socket.create_connection((self.host, self.port), timeout=CONNECT_TIMEOUT)
+            # Розпізнавання може тривати довго, тож після під'єднання тайм-аут знімається
+            sock.settimeout(None)
+            stream = self._local.stream = sock.makefile('rwb')
+            self._local.sock = sock
+            # Після перезапуску служби токен інший, тому він читається для кожного нового з'єднання
+            self._local.token = _read_token()
+        return stream
+
+    def _request(self, header, payload=b""):
+        try:
+            line = self._exchange(header, payload)
+        except OSError:
+            if self.launch_options is None:
+                raise
+            print("Служба OCR недоступна, запускаємо її знову...")
+            start_daemon(self.host, self.port, **self.launch_options).close()
+            line = self._exchange(header, payload)
+        response = json.loads(line)
+        if not response.get('ok'):
+            raise RuntimeError(f"Служба OCR: {response.get('error')}")
+        return response
+
+    def _exchange(self, header, payload):
+        for attempt in range(2):
+            try:
+                stream = self._connection()
+                stream.write(json.dumps(dict(header, token=self._local.token)).encode('utf-8') + b"\n")
+                if payload:
+                    stream.write(payload)
+                stream.flush()
+                line = stream.readline()
+                if not line:
+                    raise ConnectionError("служба OCR закрила з'єднання")
+                return line
+            except OSError:
+                self.close()
+                if attempt:
+                    raise
+
+    def ping(self, wait=False):
+        response = self._request({'op': 'ping', 'wait': wait})
+        self.device = response.get('device')
+        return response
+
+    def readtext(self, image):
+        """Розпізнає шлях до файлу (доступний службі) або RGB-масив numpy."""
+        if isinstance(image, str):
+            return self._request({'op': 'readtext', 'path': os.path.abspath(image)})['results']
+        import numpy as np
+        data = np.ascontiguousarray(image)
+        header = {'op': 'readtext', 'shape': list(data.shape), 'dtype': data.dtype.str, 'size': data.nbytes}
+        return self._request(header, data.tobytes())['results']
+
+    def shutdown_daemon(self):
+        self._request({'op': 'shutdown'})
+        self.close()
+
+    def close(self):
+        stream = getattr(self._local, 'stream', None)
+        if stream is not None:
+            for closable in (stream, self._local.sock):
+                try:
+                    closable.close()
+                except OSError:
+                    pass
+            self._local.stream = self._local.sock = None
+
+
+def connect_daemon(host=DEFAULT_HOST, port=DEFAULT_PORT, langs=None, wait=True):
+    """Повертає клієнта запущеної служби з тими самими мовами або None, якщо служби немає."""
+    client = OcrDaemonClient(host, port)
+    try:
+        info = client.ping(wait=wait)
+    except (OSError, RuntimeError, ValueError):
+        client.close()
+        return None
+    if list(info.get('langs') or []) != list(langs or OCR_LANGS):
+        print(f"Служба OCR на {host}:{port} працює з мовами {info.get('langs')}, а потрібні {langs or OCR_LANGS}.")
+        client.close()
+        return None
+    return client
+
+
+def start_daemon(host=DEFAULT_HOST, port=DEFAULT_PORT, langs=None, gpu=True,
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT, startup_timeout=60.0):
+    """Під'єднується до служби, за потреби запускаючи її окремим процесом. Повертає клієнта.
+
+    Процес служби не залежить від того, хто його запустив, і переживає закриття програми.
+    Якщо служба згодом завершиться, клієнт запустить її знову з тими самими параметрами."""
+    langs = langs or OCR_LANGS
+    launch_options = {'langs': langs, 'gpu': gpu, 'idle_timeout': idle_timeout, 'startup_timeout': startup_timeout}
+    client = connect_daemon(host, port, langs)
+    if client is not None:
+        client.launch_options = launch_options
+        return client
+    command = [sys.executable, "-u", os.path.abspath(__file__), "--host", host, "--port", str(port),
+               "--langs", ",".join(langs), "--idle-timeout", str(idle_timeout)]
+    if not gpu:
+        command.append("--cpu")
+    os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
+    kwargs = {}
+    if sys.platform == "win32":
+        kwargs['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs['start_new_session'] = True
+    with open(LOG_PATH, 'a', encoding='utf-8') as log:
+        process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                                   cwd=os.path.dirname(os.path.abspath(__file__)), **kwargs)
+    # Порт відкривається до завантаження моделі, тож чекаємо лише на запуск інтерпретатора
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        # Одночасно запущена інша копія могла зайняти порт — тоді під'єднуємося до неї
+        client = connect_daemon(host, port, langs)
+        if client is not None:
+            client.launch_options = launch_options
+            return client
+        if process.poll() is not None and connect_daemon(host, port, langs, wait=False) is None:
+            break
+        time.sleep(0.2)
+    raise ConnectionError(f"Не вдалося запустити службу OCR на {host}:{port}. Подробиці в {LOG_PATH}.")
+
+
+# ======================================================================
+# ЗАПУСК З КОМАНДНОГО РЯДКА
+# ======================================================================
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Локальна служба OCR, спільна для кількох запусків програми.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Адреса (лише локальна)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Порт")
+    parser.add_argument("--langs", default=",".join(OCR_LANGS), help="Мови OCR через кому")
+    parser.add_argument("--cpu", action="store_true", help="Не намагатися використовувати GPU")
+    parser.add_argument("--idle-timeout", type=int, default=0,
+                        help="Завершити роботу після стількох секунд без запитів (0 — ніколи)")
+    parser.add_argument("--status", action="store_true", help="Показати стан запущеної служби")
+    parser.add_argument("--stop", action="store_true", help="Зупинити запущену службу")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    langs = [lang.strip() for lang in args.langs.split(",") if lang.strip()]
+    if args.status or args.stop:
+        client = OcrDaemonClient(args.host, args.port)
+        try:
+            info = client.ping()
+            if args.stop:
+                client.shutdown_daemon()
+                print(f"Службу OCR (pid {info['pid']}) зупинено.")
+            else:
+                state = f"готова ({info['device']})" if info['ready'] else "завантажує модель"
+                print(f"Служба OCR pid {info['pid']}: {state}, мови {info['langs']}, easyocr {info['model_version']}.")
+        except (OSError, RuntimeError) as e:
+            print(f"Служба OCR на {args.host}:{args.port} недоступна: {e}")
+            return 1
+        return 0
+    return serve(args.host, args.port, langs, gpu=not args.cpu, idle_timeout=args.idle_timeout)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
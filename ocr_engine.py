@@ -0,0 +1,159 @@
+# ocr_engine.py
+
+from concurrent.futures import ThreadPoolExecutor
+
+# Мови OCR за замовчуванням (корейська манхва з англійськими вставками)
+OCR_LANGS = ['ko', 'en']
+
+# Параметри розбиття довгих сторінок на смуги. Перекриття має бути більшим
+# за висоту рядка тексту, щоб кожен рядок цілком потрапив хоча б в одну смугу.
+DEFAULT_STRIP_HEIGHT = 2400
+DEFAULT_STRIP_OVERLAP = 200
+
+
+def cuda_available():
+    """Чи бачить PyTorch GPU. Без перевірки спроба gpu=True на CPU-машині спершу падає."""
+    try:
+        import torch
+        return torch.cuda.is_available()
+    except Exception:
+        return False
+
+
+def create_reader(langs=None, gpu=True):
+    """Створює easyocr.Reader, за потреби відкочуючись на CPU. Повертає (reader, device)."""
+    import easyocr
+    langs = langs or OCR_LANGS
+    if gpu and cuda_available():
+        try:
+            return easyocr.Reader(langs, gpu=True), "GPU"
+        except Exception:
+            pass
+    return easyocr.Reader(langs, gpu=False), "CPU"
+
+
+def to_plain_results(results):
+    """Перетворює результати readtext (з numpy-типами) у прості кортежі (bbox, text, prob)."""
+    return [
+        ([[float(x), float(y)] for x, y in bbox], str(text), float(prob))
+        for bbox, text, prob in results
+    ]
+
+
+def readtext(reader, image):
+    """Розпізнає текст на зображенні (шлях або масив) і повертає прості кортежі."""
+    return to_plain_results(reader.readtext(image))
+
+
+def ocr_model_version():
+    """Версія easyocr без імпорту самої бібліотеки (та torch)."""
+    from importlib import metadata
+    try:
+        return metadata.version("easyocr")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+# ======================================================================
+# РОЗПІЗНАВАННЯ ДОВГИХ СТОРІНОК СМУГАМИ
+# ======================================================================
+def load_image(path):
+    """Декодує зображення у RGB-масив (працює і з не-ASCII шляхами)."""
+    import cv2
+    import numpy as np
+    image = cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise IOError(f"Не вдалося завантажити зображення {path}")
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+
+def strip_ranges(height, strip_height, overlap):
+    """Повертає межі (top, bottom) смуг, що перекриваються на overlap пікселів."""
+    if height <= strip_height:
+        return [(0, height)]
+    step = strip_height - overlap
+    ranges = []
+    top = 0
+    while True:
+        bottom = min(top + strip_height, height)
+        ranges.append((top, bottom))
+        if bottom >= height:
+            return ranges
+        top += step
+
+
+def _box_bounds(bbox):
+    xs = [point[0] for point in bbox]
+    ys = [point[1] for point in bbox]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _overlap_ratio(a, b):
+    """Частка площі меншого прямокутника, що перетинається з іншим."""
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    smaller = min((a[2] - a[0]) * (a[3] - a[1]), (b[2] - b[0]) * (b[3] - b[1]))
+    return (width * height) / smaller if smaller > 0 else 0.0
+
+
+def _merge_strip_results(strip_results, min_overlap=0.6):
+    """Об'єднує результати сусідніх смуг, прибираючи дублікати з зон перекриття.
+
+    З двох блоків, що майже збігаються, залишається більший: менший зазвичай
+    обрізаний краєм смуги.
+    """
+    merged = []
+    previous = []
+    for results in strip_results:
+        current = [(result, _box_bounds(result[0])) for result in results]
+        drop_previous, drop_current = set(), set()
+        for i, (prev_result, prev_bounds) in enumerate(previous):
+            for j, (cur_result, cur_bounds) in enumerate(current):
+                if j in drop_current or _overlap_ratio(prev_bounds, cur_bounds) < min_overlap:
+                    continue
+                prev_key = ((prev_bounds[2] - prev_bounds[0]) * (prev_bounds[3] - prev_bounds[1]), prev_result[2])
+                cur_key = ((cur_bounds[2] - cur_bounds[0]) * (cur_bounds[3] - cur_bounds[1]), cur_result[2])
+                if cur_key > prev_key:
+                    drop_previous.add(i)
+                    break
+                drop_current.add(j)
+        merged.extend(result for i, (result, _) in enumerate(previous) if i not in drop_previous)
+        previous = [entry for j, entry in enumerate(current) if j not in drop_current]
+    merged.extend(result for result, _ in previous)
+    return merged
+
+
+def readtext_tiled(reader, image, strip_height=DEFAULT_STRIP_HEIGHT, overlap=DEFAULT_STRIP_OVERLAP, workers=1):
+    """Розпізнає довгу сторінку смугами і повертає результати в координатах сторінки.
+
+    Детектор бачить лише одну смугу за раз, тож пам'ять не росте з висотою сторінки,
+    а дрібний текст не губиться через зменшення. Якщо reader — пул процесів (має map),
+    смуги розподіляються між процесами, інакше — між workers потоками.
+    """
+    if not strip_height:
+        return readtext(reader, image)
+    if isinstance(image, str):
+        image = load_image(image)
+    ranges = strip_ranges(image.shape[0], strip_height, overlap)
+    if len(ranges) == 1:
+        return readtext(reader, image)
+
+    # Зрізи numpy — це представлення без копіювання пікселів
+    strips = [image[top:bottom] for top, bottom in ranges]
+    if hasattr(reader, 'map'):
+        strip_results = reader.map(strips)
+    elif workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            strip_results = list(executor.map(lambda strip: readtext(reader, strip), strips))
+    else:
+        strip_results = [readtext(reader, strip) for strip in strips]
+
+    for (top, _), results in zip(ranges, strip_results):
+        for bbox, _, _ in results:
+            for point in bbox:
+                point[1] += top
+    merged = _merge_strip_results(strip_results)
+    merged.sort(key=lambda result: (_box_bounds(result[0])[1], _box_bounds(result[0])[0]))
+    return merged
@@ -0,0 +1,77 @@
+# ocr_pool.py
+# Пул процесів для OCR на машинах без GPU. Кожен процес один раз завантажує
+# easyocr.Reader і обмежує кількість потоків PyTorch, щоб процеси не змагалися
+# за ядра. Сторінки розподіляються між процесами, а назад повертаються прості
+# кортежі (bbox, text, prob).
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from ocr_engine import OCR_LANGS, create_reader, readtext
+
+# Reader, завантажений у поточному робочому процесі
+_worker_reader = None
+
+
+def _init_worker(langs, threads):
+    global _worker_reader
+    # Змінні середовища мають бути встановлені до імпорту torch
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    import torch
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
+    _worker_reader, _ = create_reader(langs, gpu=False)
+
+
+def _readtext_in_worker(image):
+    return readtext(_worker_reader, image)
+
+
+def _warmup_in_worker():
+    return os.getpid()
+
+
+class OcrProcessPool:
+    """Пул процесів з OCR-моделями. Має метод readtext, тож його можна передавати замість Reader."""
+
+    def __init__(self, processes=None, langs=None, threads_per_worker=None):
+        cpu_count = os.cpu_count() or 1
+        self.processes = processes or max(1, cpu_count // 2)
+        self.threads_per_worker = threads_per_worker or max(1, cpu_count // self.processes)
+        self.langs = langs or OCR_LANGS
+        # spawn замість fork: PyTorch погано переносить fork після ініціалізації потоків
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.langs, self.threads_per_worker)
+        )
+
+    def warmup(self):
+        """Запускає всі процеси і чекає, доки кожен завантажить модель."""
+        futures = [self._executor.submit(_warmup_in_worker) for _ in range(self.processes)]
+        return {future.result() for future in futures}
+
+    def submit(self, image):
+        """Відправляє сторінку (шлях або масив) на розпізнавання. Повертає Future."""
+        return self._executor.submit(_readtext_in_worker, image)
+
+    def readtext(self, image):
+        return self.submit(image).result()
+
+    def map(self, images):
+        """Розпізнає кілька сторінок паралельно, зберігаючи порядок."""
+        return list(self._executor.map(_readtext_in_worker, images))
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.shutdown()
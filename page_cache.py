@@ -0,0 +1,91 @@
+# page_cache.py
+# LRU-кеш декодованих сторінок з обмеженням за обсягом пам'яті та фоновим
+# попереднім завантаженням сусідніх сторінок. Зберігаються QImage: їх можна
+# декодувати в робочих потоках, а в QPixmap перетворювати вже в GUI-потоці.
+import os
+from collections import OrderedDict
+
+from PyQt6.QtGui import QImage
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+DEFAULT_BUDGET_BYTES = 768 * 1024 * 1024
+
+
+def _cache_key(path):
+    try:
+        return path, os.stat(path).st_mtime_ns
+    except OSError:
+        return path, None
+
+
+class _LoadSignals(QObject):
+    finished = pyqtSignal(object, QImage)
+
+
+class _LoadTask(QRunnable):
+    def __init__(self, key, signals):
+        super().__init__()
+        self.key = key
+        self.signals = signals
+
+    def run(self):
+        self.signals.finished.emit(self.key, QImage(self.key[0]))
+
+
+class PageImageCache(QObject):
+    """Кеш сторінок. Усі зміни кешу відбуваються в GUI-потоці, фонові потоки лише декодують."""
+
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_BYTES, max_threads=2, parent=None):
+        super().__init__(parent)
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self._images = OrderedDict()
+        self._pending = set()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._signals = _LoadSignals(self)
+        self._signals.finished.connect(self._on_loaded)
+
+    def load(self, path) -> QImage:
+        """Повертає сторінку з кешу або декодує її синхронно."""
+        key = _cache_key(path)
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            return image
+        image = QImage(path)
+        if not image.isNull():
+            self._put(key, image)
+        return image
+
+    def peek(self, path):
+        """Повертає сторінку, лише якщо вона вже є в кеші (без декодування)."""
+        return self._images.get(_cache_key(path))
+
+    def prefetch(self, paths):
+        """Декодує сторінки у фоні, якщо їх ще немає в кеші."""
+        for path in paths:
+            key = _cache_key(path)
+            if key in self._images or key in self._pending:
+                continue
+            self._pending.add(key)
+            self.pool.start(_LoadTask(key, self._signals))
+
+    def _on_loaded(self, key, image):
+        self._pending.discard(key)
+        if not image.isNull() and key not in self._images:
+            self._put(key, image)
+
+    def _put(self, key, image):
+        self._images[key] = image
+        self.used_bytes += image.sizeInBytes()
+        # Остання використана сторінка залишається навіть якщо сама перевищує бюджет
+        while self.used_bytes > self.budget_bytes and len(self._images) > 1:
+            _, evicted = self._images.popitem(last=False)
+            self.used_bytes -= evicted.sizeInBytes()
+
+    def clear(self):
+        self.pool.clear()
+        self._images.clear()
+        self._pending.clear()
+        self.used_bytes = 0
@@ -0,0 +1,124 @@
+# pipeline.py
+# Конвеєр обробки сторінок: кожен етап (OCR, переклад, відтворення) має власні
+# робочі потоки, а між етапами стоять обмежені черги. Поки сторінка N
+# перекладається, сторінка N+1 вже розпізнається, а N-1 — відтворюється,
+# тож загальна швидкість визначається найповільнішим етапом.
+import queue
+import threading
+import time
+import traceback
+
+_STOP = object()
+
+
+class PipelineStage:
+    def __init__(self, name, fn, workers=1):
+        if workers < 1:
+            raise ValueError(f"Етап '{name}' повинен мати хоча б один робочий потік.")
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.busy_time = 0.0
+        self.processed = 0
+
+
+class PipelineResult:
+    def __init__(self, index, item=None, error=None, stage=None):
+        self.index = index
+        self.item = item
+        self.error = error    # (exctype, value, traceback_str) якщо сторінку не оброблено
+        self.stage = stage    # етап, на якому сталася помилка
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class PagePipeline:
+    def __init__(self, stages: list[PipelineStage], queue_size=2):
+        if not stages:
+            raise ValueError("Конвеєр повинен мати хоча б один етап.")
+        self.stages = stages
+        self.queue_size = queue_size
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Зупиняє подачу нових сторінок. Сторінки, що вже в обробці, буде завершено."""
+        self._cancel.set()
+
+    def run(self, inputs, on_result=None) -> list[PipelineResult]:
+        """Проганяє всі вхідні елементи через етапи. Результати повертаються в порядку входу.
+
+        on_result викликається в потоці, що запустив run, щойно елемент пройде всі етапи.
+        """
+        self._cancel.clear()
+        for stage in self.stages:
+            stage.busy_time = 0.0
+            stage.processed = 0
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        output = queue.Queue()
+        threads = []
+
+        feeder = threading.Thread(target=self._feed, args=(inputs, queues[0], self.stages[0].workers), daemon=True)
+        threads.append(feeder)
+        for i, stage in enumerate(self.stages):
+            is_last = i == len(self.stages) - 1
+            next_queue = output if is_last else queues[i + 1]
+            next_workers = 1 if is_last else self.stages[i + 1].workers
+            remaining = [stage.workers]
+            lock = threading.Lock()
+            for _ in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._work,
+                    args=(stage, queues[i], next_queue, output, next_workers, remaining, lock),
+                    daemon=True
+                ))
+        for thread in threads:
+            thread.start()
+
+        results = {}
+        while True:
+            entry = output.get()
+            if entry is _STOP:
+                break
+            results[entry.index] = entry
+            if on_result:
+                on_result(entry)
+        for thread in threads:
+            thread.join()
+        return [results[i] for i in sorted(results)]
+
+    def _feed(self, inputs, first_queue, workers):
+        for index, item in enumerate(inputs):
+            if self._cancel.is_set():
+                break
+            first_queue.put(PipelineResult(index, item))
+        for _ in range(workers):
+            first_queue.put(_STOP)
+
+    def _work(self, stage, in_queue, next_queue, output, next_workers, remaining, lock):
+        while True:
+            entry = in_queue.get()
+            if entry is _STOP:
+                break
+            started = time.perf_counter()
+            try:
+                entry.item = stage.fn(entry.item)
+            except Exception as e:
+                entry.error = (type(e), e, traceback.format_exc())
+                entry.stage = stage.name
+            with lock:
+                stage.busy_time += time.perf_counter() - started
+                stage.processed += 1
+            # Помилкові сторінки одразу йдуть у результат, минаючи наступні етапи
+            (next_queue if entry.ok else output).put(entry)
+        with lock:
+            remaining[0] -= 1
+            is_last_worker = remaining[0] == 0
+        if is_last_worker:
+            for _ in range(next_workers):
+                next_queue.put(_STOP)
+
+    def stage_stats(self) -> dict:
+        return {stage.name: {'processed': stage.processed, 'busy_time': stage.busy_time, 'workers': stage.workers}
+                for stage in self.stages}
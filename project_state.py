@@ -0,0 +1,208 @@
+# project_state.py
+# Стан кожної сторінки (знайдені блоки, групи, переклади, шрифти, результат
+# відтворення), що зберігається між перемиканнями сторінок і між сесіями.
+# Один JSON-файл проєкту на розділ (папку зі сторінками), відтворені сторінки —
+# PNG-файли поруч з ним.
+import hashlib
+import json
+import os
+
+from PyQt6.QtGui import QImage
+from PyQt6.QtCore import QObject, QRect, QRunnable, QThreadPool, pyqtSignal
+
+DEFAULT_PROJECTS_DIR = os.path.join("cache", "projects")
+PROJECT_VERSION = 1
+
+
+def serialize_rects(found_rects):
+    """Перетворює found_rects (з QRect) у JSON-сумісні словники."""
+    result = []
+    for item in found_rects:
+        data = dict(item)
+        rect = item['rect']
+        data['rect'] = [rect.x(), rect.y(), rect.width(), rect.height()]
+        result.append(data)
+    return result
+
+
+def deserialize_rects(data):
+    result = []
+    for item in data:
+        restored = dict(item)
+        restored['rect'] = QRect(*item['rect'])
+        result.append(restored)
+    return result
+
+
+def _file_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class _SaveSignals(QObject):
+    finished = pyqtSignal(str, int)
+
+
+class _SaveImageTask(QRunnable):
+    def __init__(self, image, path, generation, signals):
+        super().__init__()
+        self.image = image
+        self.path = path
+        self.generation = generation
+        self.signals = signals
+
+    def run(self):
+        tmp_path = f"{self.path}.tmp.png"
+        if self.image.save(tmp_path):
+            os.replace(tmp_path, self.path)
+        self.signals.finished.emit(self.path, self.generation)
+
+
+class ProjectStore(QObject):
+    """Сховище стану сторінок. Дані зберігаються у вигляді, готовому до запису в JSON."""
+
+    def __init__(self, projects_dir=DEFAULT_PROJECTS_DIR, parent=None):
+        super().__init__(parent)
+        self.projects_dir = projects_dir
+        os.makedirs(projects_dir, exist_ok=True)
+        self._chapters = {}       # chapter_id -> {'pages': {path: state}}
+        self._dirty = set()
+        # Відтворені сторінки, що ще записуються на диск у фоні: шлях -> (номер запису, зображення).
+        # Номер відрізняє останній запис сторінки від попередніх, що ще стоять у черзі
+        self._pending_images = {}
+        self._save_generation = 0
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._signals = _SaveSignals(self)
+        self._signals.finished.connect(self._on_image_saved)
+
+    # --- розташування файлів ---
+    def _chapter_id(self, page_path):
+        chapter_dir = os.path.dirname(os.path.abspath(page_path))
+        return hashlib.sha1(chapter_dir.encode('utf-8')).hexdigest()[:16]
+
+    def _project_file(self, chapter_id):
+        return os.path.join(self.projects_dir, f"{chapter_id}.json")
+
+    def _rendered_file(self, page_path):
+        chapter_id = self._chapter_id(page_path)
+        stem = hashlib.sha1(os.path.abspath(page_path).encode('utf-8')).hexdigest()[:16]
+        directory = os.path.join(self.projects_dir, chapter_id)
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, f"{stem}.png")
+
+    def _chapter(self, page_path):
+        chapter_id = self._chapter_id(page_path)
+        if chapter_id not in self._chapters:
+            chapter = {'version': PROJECT_VERSION, 'pages': {}}
+            try:
+                with open(self._project_file(chapter_id), 'r', encoding='utf-8') as f:
+                    loaded = json.load(f)
+                if loaded.get('version') == PROJECT_VERSION:
+                    chapter = loaded
+            except (OSError, json.JSONDecodeError):
+                pass
+            self._chapters[chapter_id] = chapter
+        return chapter_id, self._chapters[chapter_id]
+
+    # --- стан сторінок ---
+    def get(self, page_path):
+        """Повертає збережений стан сторінки або None. Стан змінених на диску зображень відкидається."""
+        _, chapter = self._chapter(page_path)
+        state = chapter['pages'].get(os.path.abspath(page_path))
+        if state and state.get('mtime') != _file_mtime(page_path):
+            return None
+        return state
+
+    def put(self, page_path, found_rects, groups, sentences):
+        chapter_id, chapter = self._chapter(page_path)
+        key = os.path.abspath(page_path)
+        previous = chapter['pages'].get(key) or {}
+        chapter['pages'][key] = {
+            'mtime': _file_mtime(page_path),
+            'found_rects': serialize_rects(found_rects),
+            'groups': groups,
+            'sentences': sentences,
+            'rendered': previous.get('rendered'),
+        }
+        self._dirty.add(chapter_id)
+
+    def remove(self, page_path):
+        chapter_id, chapter = self._chapter(page_path)
+        if chapter['pages'].pop(os.path.abspath(page_path), None) is not None:
+            self._dirty.add(chapter_id)
+
+    # --- відтворені сторінки ---
+    def save_rendered(self, page_path, image: QImage):
+        """Записує відтворену сторінку у фоні. До завершення запису вона доступна з пам'яті."""
+        chapter_id, chapter = self._chapter(page_path)
+        state = chapter['pages'].get(os.path.abspath(page_path))
+        if state is None:
+            return
+        rendered_path = self._rendered_file(page_path)
+        state['rendered'] = rendered_path
+        self._dirty.add(chapter_id)
+        self._save_generation += 1
+        self._pending_images[rendered_path] = (self._save_generation, image)
+        self.pool.start(_SaveImageTask(image, rendered_path, self._save_generation, self._signals))
+
+    def load_rendered(self, page_path) -> QImage:
+        state = self.get(page_path)
+        rendered_path = state.get('rendered') if state else None
+        if not rendered_path:
+            return QImage()
+        if rendered_path in self._pending_images:
+            return self._pending_images[rendered_path][1]
+        return QImage(rendered_path) if os.path.exists(rendered_path) else QImage()
+
+    def rendered_source(self, page_path):
+        """Відтворена сторінка для фонової обробки без читання з диска в GUI-потоці:
+        QImage, якщо запис ще триває, шлях до файлу або None."""
+        state = self.get(page_path)
+        rendered_path = state.get('rendered') if state else None
+        if not rendered_path:
+            return None
+        if rendered_path in self._pending_images:
+            return self._pending_images[rendered_path][1]
+        return rendered_path if os.path.exists(rendered_path) else None
+
+    def _on_image_saved(self, rendered_path, generation):
+        # Пізніший запис тієї самої сторінки ще в черзі — її зображення лишається в пам'яті
+        pending = self._pending_images.get(rendered_path)
+        if pending is not None and pending[0] == generation:
+            del self._pending_images[rendered_path]
+
+    # --- запис на диск ---
+    def save(self):
+        """Записує змінені файли проєктів (атомарно, через тимчасовий файл)."""
+        for chapter_id in list(self._dirty):
+            path = self._project_file(chapter_id)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._chapters[chapter_id], f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        self._dirty.clear()
+
+    def wait_for_pending(self):
+        self.pool.waitForDone()
+
+    # --- сесія ---
+    def _session_file(self):
+        return os.path.join(self.projects_dir, "last_session.json")
+
+    def save_session(self, page_paths):
+        """Запам'ятовує відкриті сторінки в поточному порядку для відновлення після збою."""
+        path = self._session_file()
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump({'pages': [os.path.abspath(p) for p in page_paths]}, f, ensure_ascii=False)
+        os.replace(f"{path}.tmp", path)
+
+    def load_session(self):
+        try:
+            with open(self._session_file(), 'r', encoding='utf-8') as f:
+                pages = json.load(f).get('pages', [])
+        except (OSError, json.JSONDecodeError):
+            return []
+        return [p for p in pages if os.path.exists(p)]
@@ -0,0 +1,76 @@
+# render_pool.py
+# Паралельне відтворення сторінок у пулі потоків. Малювання відбувається на QImage,
+# яке, на відміну від QPixmap, можна використовувати поза GUI-потоком; у GUI
+# повертається лише готове зображення для показу.
+from PyQt6.QtGui import QImage
+from PyQt6.QtCore import QObject, QRect, QRunnable, QThread, QThreadPool, pyqtSignal
+
+from renderer import render_page, DEFAULT_FONT
+from text_layout import ensure_font
+from text_removal import remove_text, DEFAULT_TEXT_REMOVAL
+
+
+def snapshot_rects(found_rects):
+    """Копія found_rects для фонового потоку: GUI може змінювати оригінал під час відтворення."""
+    return [dict(item, rect=QRect(item['rect'])) for item in found_rects]
+
+
+class _RenderSignals(QObject):
+    finished = pyqtSignal(str, QImage, QImage, object)
+    failed = pyqtSignal(str, str)
+
+
+class _RenderTask(QRunnable):
+    def __init__(self, path, found_rects, image, text_removal, signals):
+        super().__init__()
+        self.path = path
+        self.found_rects = found_rects
+        self.image = image
+        self.text_removal = text_removal
+        self.signals = signals
+
+    def run(self):
+        try:
+            image = self.image if self.image is not None else QImage(self.path)
+            if image.isNull():
+                raise OSError(f"не вдалося завантажити {self.path}")
+            # Текст прибирається з усіх блоків, а не лише перекладених, щоб очищену сторінку
+            # можна було використати для подальших інкрементних перемальовувань у GUI
+            background = QImage()
+            if self.text_removal != 'white':
+                background = remove_text(image, [item['rect'] for item in self.found_rects], self.text_removal)
+            result = render_page(image, self.found_rects, self.text_removal,
+                                 None if background.isNull() else background)
+        except Exception as e:
+            self.signals.failed.emit(self.path, str(e))
+        else:
+            self.signals.finished.emit(self.path, result, background, self.found_rects)
+
+
+class RenderPool(QObject):
+    """Відтворює сторінки в кількох потоках.
+    page_rendered(шлях, відтворена сторінка, очищена сторінка, found_rects) надходить у GUI-потоці;
+    очищена сторінка порожня, якщо текст заливається білим."""
+    page_rendered = pyqtSignal(str, QImage, QImage, object)
+    page_failed = pyqtSignal(str, str)
+
+    def __init__(self, max_threads=None, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads or QThread.idealThreadCount())
+        self._signals = _RenderSignals(self)
+        self._signals.finished.connect(self.page_rendered)
+        self._signals.failed.connect(self.page_failed)
+
+    def submit(self, path, found_rects, image: QImage = None, text_removal=DEFAULT_TEXT_REMOVAL):
+        """Ставить сторінку в чергу. found_rects копіюються; image — вже декодована сторінка, якщо є."""
+        # Відкладені шрифти реєструються тут, у потоці GUI, а не в робочих потоках
+        for family in {item.get('font', DEFAULT_FONT) for item in found_rects}:
+            ensure_font(family)
+        self.pool.start(_RenderTask(path, snapshot_rects(found_rects), image, text_removal, self._signals))
+
+    def cancel_pending(self):
+        self.pool.clear()
+
+    def wait(self):
+        self.pool.waitForDone()
@@ -0,0 +1,94 @@
+# renderer.py
+# Відтворення перекладу поверх сторінки. Працює з будь-яким QPaintDevice,
+# тому використовується і вікном програми (QPixmap), і консольною обробкою (QImage).
+from PyQt6.QtGui import QPainter, QImage, QRegion
+from PyQt6.QtCore import Qt, QRect
+
+from text_layout import TEXT_FLAGS, load_fonts, make_font, font_metrics, letter_spacing_for, fit_font_size
+from text_removal import remove_text, DEFAULT_TEXT_REMOVAL, ERASE_MARGIN
+
+DEFAULT_FONT = "Arial"
+DEFAULT_FONT_SIZE = 14
+
+
+def font_size_for(item):
+    """Розмір шрифту рамки: підібраний під рамку, якщо увімкнено auto_fit, інакше заданий вручну."""
+    if item.get('auto_fit') and item.get('translated', ''):
+        return fit_font_size(item['translated'], item['rect'], item.get('font', DEFAULT_FONT))
+    return item.get('font_size', DEFAULT_FONT_SIZE)
+
+
+def _erase_rect(rect):
+    return rect.adjusted(-ERASE_MARGIN, -ERASE_MARGIN, ERASE_MARGIN, ERASE_MARGIN)
+
+
+def draw_translations(painter: QPainter, found_rects, background: QImage = None):
+    """Прибирає оригінальний текст і малює переклад у кожній рамці.
+    background — сторінка з уже видаленим текстом (text_removal); без неї рамка заливається білим."""
+    for item in found_rects:
+        if not item.get('translated', ''): continue
+        rect, text = item['rect'], item['translated']
+        painter.setFont(make_font(item.get('font', DEFAULT_FONT), font_size_for(item)))
+        if background is None:
+            painter.fillRect(rect, Qt.GlobalColor.white)
+        else:
+            painter.drawImage(_erase_rect(rect), background, _erase_rect(rect))
+        painter.setPen(Qt.GlobalColor.black)
+        painter.drawText(rect, TEXT_FLAGS, text)
+
+
+def translation_bounds(item) -> QRect:
+    """Область, яку змінює відтворення рамки: сама рамка плюс текст, що з неї виходить."""
+    if not item.get('translated', ''): return QRect()
+    family = item.get('font', DEFAULT_FONT)
+    metrics = font_metrics(family, font_size_for(item), letter_spacing_for(family))
+    text_bounds = metrics.boundingRect(item['rect'], TEXT_FLAGS, item['translated'])
+    return _erase_rect(item['rect']).united(text_bounds).adjusted(-1, -1, 1, 1)
+
+
+def painted_bounds(found_rects):
+    """Межі всіх намальованих рамок після повного відтворення: {індекс: QRect}."""
+    return {i: translation_bounds(item) for i, item in enumerate(found_rects) if item.get('translated', '')}
+
+
+def redraw_dirty(painter: QPainter, source, found_rects, dirty_indices, bounds, background: QImage = None) -> QRegion:
+    """Перемальовує лише змінені рамки поверх уже відтвореної сторінки.
+
+    Старі та нові межі змінених рамок відновлюються з оригіналу source, після чого в цій
+    області наново малюються всі рамки, що її перетинають (сусідні теж). bounds — межі
+    з попереднього відтворення, оновлюються на місці. Повертає перемальовану область."""
+    region, restore_rects = QRegion(), []
+    for i in dirty_indices:
+        new_bounds = translation_bounds(found_rects[i])
+        for rect in (bounds.get(i, QRect()), new_bounds):
+            if rect.isEmpty(): continue
+            region = region.united(rect)
+            restore_rects.append(rect)
+        if new_bounds.isEmpty():
+            bounds.pop(i, None)
+        else:
+            bounds[i] = new_bounds
+    if region.isEmpty(): return region
+
+    painter.save()
+    painter.setClipRegion(region)
+    for rect in restore_rects:
+        if isinstance(source, QImage):
+            painter.drawImage(rect, source, rect)
+        else:
+            painter.drawPixmap(rect, source, rect)
+    draw_translations(painter, [found_rects[i] for i in sorted(bounds) if region.intersects(bounds[i])], background)
+    painter.restore()
+    return region
+
+
+def render_page(image: QImage, found_rects, text_removal=DEFAULT_TEXT_REMOVAL, background: QImage = None) -> QImage:
+    """Повертає копію сторінки з намальованим перекладом.
+    background — вже очищена сторінка; якщо не задана, текст прибирається методом text_removal."""
+    result = image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+    if background is None and text_removal != 'white':
+        background = remove_text(image, [item['rect'] for item in found_rects if item.get('translated', '')], text_removal)
+    painter = QPainter(result)
+    draw_translations(painter, found_rects, background)
+    painter.end()
+    return result
@@ -2,11 +2,16 @@
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QTabWidget, QWidget, QPushButton, QListWidget, 
     QHBoxLayout, QMessageBox, QDialogButtonBox, QInputDialog,
-    QListWidgetItem, QLabel
+    QListWidgetItem, QLabel, QLineEdit
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 from api_manager import ApiKeyManager
+from llm_translators import DEFAULT_GEMINI_MODEL, DEFAULT_OPENAI_MODEL
+from translators import invalidate_translators
+
+# Сервіси, для яких у налаштуваннях можна обрати модель
+DEFAULT_MODELS = {'gpt': DEFAULT_OPENAI_MODEL, 'gemini': DEFAULT_GEMINI_MODEL}
 
 class SettingsDialog(QDialog):
     def __init__(self, parent=None):
@@ -49,6 +54,14 @@ class SettingsDialog(QDialog):
         button_panel.addStretch()
         button_panel.addWidget(QLabel("Обраний ключ буде\nвикористовуватись\nдля перекладу:"))
         button_panel.addWidget(btn_set_active)
+        if service_name in DEFAULT_MODELS:
+            model_edit = QLineEdit(self.key_manager.get_model(service_name) or "")
+            model_edit.setPlaceholderText(DEFAULT_MODELS[service_name])
+            model_edit.setToolTip("Порожнє поле — модель за замовчуванням")
+            model_edit.editingFinished.connect(
+                lambda: self.key_manager.set_model(service_name, model_edit.text().strip()))
+            button_panel.addWidget(QLabel("Модель:"))
+            button_panel.addWidget(model_edit)
         
         tab_layout.addLayout(button_panel, 1)
         self.tabs.addTab(tab, service_name.capitalize())
@@ -116,6 +129,8 @@ class SettingsDialog(QDialog):
         new_key, ok = QInputDialog.getText(self, "Редагувати API Ключ", "Відредагуйте ключ:", text=old_key)
         if ok and new_key and new_key != old_key:
             self.key_manager.update_key(service_name, old_key, new_key)
+            # Перекладач зі старим ключем більше не потрібен — закриваємо його з'єднання
+            invalidate_translators(service_name, old_key)
             self.update_key_list(service_name)
 
     def delete_key(self, service_name):
@@ -128,6 +143,7 @@ class SettingsDialog(QDialog):
         reply = QMessageBox.question(self, "Підтвердження", f"Ви впевнені, що хочете видалити ключ '{masked_key}'?")
         if reply == QMessageBox.StandardButton.Yes:
             self.key_manager.delete_key(service_name, key_to_delete)
+            invalidate_translators(service_name, key_to_delete)
             self.update_key_list(service_name)
 
     def set_active_key(self, service_name):
@@ -0,0 +1,158 @@
+# text_grouping.py
+# Групування OCR-блоків у речення. Модуль не залежить від Qt,
+# тому його можна використовувати і в GUI, і в консольній обробці,
+# і в робочих процесах. numpy імпортується у функціях, щоб не сповільнювати запуск GUI.
+
+# Блоки, що лежать поруч по горизонталі, вважаються однією бульбашкою,
+# якщо проміжок між ними менший за стільки висот рядка
+DEFAULT_HORIZONTAL_GAP_FACTOR = 1.5
+# Змінюється разом з алгоритмом групування, щоб кеш OCR не повертав групи старої версії
+GROUPING_VERSION = 2
+
+
+def bbox_to_rect(bbox):
+    """Перетворює bbox easyocr (4 точки) у кортеж (x, y, width, height)."""
+    top_left, top_right, bottom_right, _ = bbox
+    return (int(top_left[0]), int(top_left[1]),
+            int(bottom_right[0] - top_left[0]), int(bottom_right[1] - top_left[1]))
+
+
+def group_text_bubbles(ocr_results, max_distance=70, horizontal_gap_factor=DEFAULT_HORIZONTAL_GAP_FACTOR):
+    """Об'єднує близькі блоки у групи (бульбашки). Повертає списки індексів блоків.
+
+    Два блоки пов'язані, якщо вертикальний проміжок між ними менший за max_distance,
+    а горизонтальний — менший за horizontal_gap_factor висот меншого з рядків.
+    Групи — це компоненти зв'язності графа близькості, тож дві бульбашки поруч
+    не злипаються, навіть якщо їхні рядки чергуються при сортуванні за висотою.
+    """
+    if not ocr_results: return []
+    boxes = boxes_to_array(ocr_results)
+    labels = _connected_components(len(boxes), _proximity_edges(boxes, max_distance, horizontal_gap_factor))
+    return _ordered_groups(boxes, labels)
+
+
+def boxes_to_array(ocr_results):
+    """Перетворює bbox easyocr у масив (n, 4) з колонками left, top, right, bottom.
+
+    Як і bbox_to_rect, бере лівий верхній і правий нижній кути: так не доводиться
+    перетворювати в масив усі чотири точки кожного блоку."""
+    import numpy as np
+    return np.array([(bbox[0][0], bbox[0][1], bbox[2][0], bbox[2][1]) for bbox, _, _ in ocr_results],
+                    dtype=np.float64).reshape(-1, 4)
+
+
+def _proximity_edges(boxes, max_distance, horizontal_gap_factor):
+    """Знаходить пари близьких блоків. Повертає два масиви індексів (i, j).
+
+    Sort-and-sweep: після сортування за верхнім краєм кандидати для блоку — лише
+    наступні блоки, що починаються вище за його bottom + max_distance. Пари з цих
+    вікон генеруються одним масивом, тож робота пропорційна кількості сусідів, а не n².
+    """
+    import numpy as np
+    count = len(boxes)
+    order = np.argsort(boxes[:, 1], kind='stable')
+    left, top, right, bottom = boxes[order].T
+    stop = np.searchsorted(top, bottom + max_distance, side='left')
+    window = np.maximum(stop - np.arange(1, count + 1), 0)
+    i = np.repeat(np.arange(count), window)
+    # Номер пари всередині вікна свого блоку: 0, 1, ... window[i] - 1
+    offset = np.arange(len(i)) - np.repeat(np.cumsum(window) - window, window)
+    j = i + 1 + offset
+    # top[j] >= top[i], тож вертикальну умову вже забезпечило вікно
+    horizontal_gap = np.maximum(left[j] - right[i], left[i] - right[j])
+    line_height = np.minimum(bottom[i] - top[i], bottom[j] - top[j])
+    linked = horizontal_gap < horizontal_gap_factor * line_height
+    return order[i[linked]], order[j[linked]]
+
+
+def _connected_components(count, edges):
+    """Union-find на масивах: мітка кожного блоку — найменший індекс у його компоненті."""
+    import numpy as np
+    labels = np.arange(count)
+    edges_i, edges_j = edges
+    if len(edges_i) == 0:
+        return labels
+    while True:
+        smaller = np.minimum(labels[edges_i], labels[edges_j])
+        updated = labels.copy()
+        np.minimum.at(updated, edges_i, smaller)
+        np.minimum.at(updated, edges_j, smaller)
+        # Стиснення шляхів: кожен блок одразу посилається на корінь
+        while True:
+            jumped = updated[updated]
+            if np.array_equal(jumped, updated):
+                break
+            updated = jumped
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def _ordered_groups(boxes, labels):
+    """Формує групи в порядку читання: зверху вниз, зліва направо (за центрами блоків)."""
+    import numpy as np
+    # Подвоєні центри: порядок той самий, а ділення не потрібне
+    order = np.lexsort((boxes[:, 0] + boxes[:, 2], boxes[:, 1] + boxes[:, 3]))
+    labels = labels.tolist()
+    groups = {}
+    for index in order.tolist():
+        groups.setdefault(labels[index], []).append(index)
+    # dict зберігає порядок вставки, тож групи йдуть за своїм першим блоком
+    return list(groups.values())
+
+
+def group_text_bubbles_sequential(ocr_results, max_distance=70):
+    """Попередній алгоритм: зв'язує лише сусідні після сортування блоки за вертикальним проміжком."""
+    if not ocr_results: return []
+    blocks = []
+    for i, (bbox, text, prob) in enumerate(ocr_results):
+        left, top = int(bbox[0][0]), int(bbox[0][1])
+        width, height = int(bbox[1][0] - bbox[0][0]), int(bbox[2][1] - bbox[1][1])
+        # Так само, як QRect: right/bottom включні, центр — цілочисельний
+        right, bottom = left + width - 1, top + height - 1
+        blocks.append({
+            'id': i, 'top': top, 'bottom': bottom,
+            'center': ((top + bottom) // 2, (left + right) // 2)
+        })
+    sorted_blocks = sorted(blocks, key=lambda b: b['center'])
+    groups = []
+    current_group = [sorted_blocks[0]['id']]
+    for i in range(1, len(sorted_blocks)):
+        prev_box = sorted_blocks[i-1]
+        current_box = sorted_blocks[i]
+        vertical_distance = current_box['top'] - prev_box['bottom']
+        if 0 <= vertical_distance < max_distance:
+            current_group.append(current_box['id'])
+        else:
+            groups.append(current_group)
+            current_group = [current_box['id']]
+    groups.append(current_group)
+    return groups
+
+
+def distribute_text_to_group(found_rects, group_indices, new_text):
+    """Пропорційно розподіляє текст по бульбашках групи."""
+    original_words_in_group = [found_rects[idx]['text'].split() for idx in group_indices]
+    total_original_words = sum(len(words) for words in original_words_in_group)
+
+    translated_words = new_text.split()
+    total_translated_words = len(translated_words)
+
+    start_index = 0
+    for j, idx in enumerate(group_indices):
+        num_original_words = len(original_words_in_group[j])
+        share = num_original_words / total_original_words if total_original_words > 0 else 0
+        num_translated_words = round(share * total_translated_words)
+
+        if j == len(group_indices) - 1:
+            chunk = translated_words[start_index:]
+        else:
+            chunk = translated_words[start_index : start_index + num_translated_words]
+
+        found_rects[idx]['translated'] = " ".join(chunk)
+        start_index += num_translated_words
+
+
+def group_sentences(found_rects, groups):
+    """Склеює тексти блоків кожної групи в одне речення для перекладу."""
+    return [" ".join(found_rects[i]['text'] for i in group) for group in groups]
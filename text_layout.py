@@ -0,0 +1,164 @@
+# text_layout.py
+# Автопідбір розміру шрифту: найбільший розмір, за якого переклад вміщується в рамку.
+# QFontMetrics кешуються за (сімейство, розмір, міжлітерний інтервал), результати
+# підбору — за текстом і розміром рамки, тож повторне відтворення сторінки майже нічого не коштує.
+# Тут же реєстрація шрифтів з папки fonts: сімейства запам'ятовуються в cache/fonts.json,
+# тож під час запуску GUI файли шрифтів можна не відкривати, а реєструвати під час першого використання.
+import json
+import os
+import threading
+from functools import lru_cache
+
+from PyQt6.QtGui import QFont, QFontMetrics, QFontDatabase
+from PyQt6.QtCore import Qt, QRect
+
+MIN_FONT_SIZE = 6
+MAX_FONT_SIZE = 72
+TEXT_FLAGS = int(Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap)
+FONT_CACHE_PATH = os.path.join("cache", "fonts.json")
+
+
+# ======================================================================
+# РЕЄСТРАЦІЯ ШРИФТІВ
+# ======================================================================
+# Сімейства, відомі з кешу, але ще не зареєстровані в QFontDatabase: сімейство -> [шляхи]
+_pending_fonts = {}
+_fonts_lock = threading.Lock()
+
+
+def _file_key(path):
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _read_font_cache(cache_path):
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _write_font_cache(cache_path, entries):
+    try:
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Не вдалося зберегти кеш шрифтів: {e}")
+
+
+def _register_font(font_path):
+    font_id = QFontDatabase.addApplicationFont(font_path)
+    if font_id == -1:
+        return None
+    families = QFontDatabase.applicationFontFamilies(font_id)
+    return families[0] if families else None
+
+
+def load_fonts(fonts_dir, lazy=False, cache_path=FONT_CACHE_PATH):
+    """Реєструє шрифти з папки і повертає список їхніх сімейств.
+
+    Якщо lazy, шрифти, чиє сімейство вже відоме з кешу, не реєструються одразу —
+    це зробить ensure_font під час першого використання."""
+    if not os.path.isdir(fonts_dir): return []
+    cached = _read_font_cache(cache_path)
+    entries = {}
+    loaded_font_families = []
+    for font_file in os.listdir(fonts_dir):
+        if not font_file.lower().endswith(('.ttf', '.otf')): continue
+        font_path = os.path.abspath(os.path.join(fonts_dir, font_file))
+        try:
+            key = _file_key(font_path)
+        except OSError:
+            continue
+        entry = cached.get(font_path)
+        if lazy and entry and entry.get('key') == key and entry.get('family'):
+            family = entry['family']
+            with _fonts_lock:
+                _pending_fonts.setdefault(family, []).append(font_path)
+        else:
+            family = _register_font(font_path)
+            if family is None: continue
+        entries[font_path] = {'key': key, 'family': family}
+        loaded_font_families.append(family)
+    if entries != cached:
+        _write_font_cache(cache_path, entries)
+    return loaded_font_families
+
+
+def ensure_font(family):
+    """Реєструє шрифт, відкладений load_fonts(lazy=True). Краще викликати з потоку GUI."""
+    if family not in _pending_fonts:
+        return
+    with _fonts_lock:
+        font_paths = _pending_fonts.pop(family, [])
+    for font_path in font_paths:
+        if _register_font(font_path) is None:
+            print(f"Не вдалося зареєструвати шрифт {font_path}")
+
+
+def letter_spacing_for(family):
+    """Badaboom без додаткового інтервалу між літерами читається погано."""
+    return 3 if "Badaboom" in family else 0
+
+
+def make_font(family, size, spacing=None):
+    ensure_font(family)
+    font = QFont(family, size)
+    spacing = letter_spacing_for(family) if spacing is None else spacing
+    if spacing:
+        font.setLetterSpacing(QFont.SpacingType.AbsoluteSpacing, spacing)
+    return font
+
+
+# QFontMetrics можна створювати в будь-якому потоці, але один об'єкт не варто ділити
+# між потоками, тож у кожного потоку відтворення свій кеш
+_thread_local = threading.local()
+
+
+def font_metrics(family, size, spacing) -> QFontMetrics:
+    cache = getattr(_thread_local, 'metrics', None)
+    if cache is None:
+        cache = _thread_local.metrics = {}
+    key = (family, size, spacing)
+    metrics = cache.get(key)
+    if metrics is None:
+        metrics = cache[key] = QFontMetrics(make_font(family, size, spacing))
+    return metrics
+
+
+def text_fits(text, width, height, family, size):
+    metrics = font_metrics(family, size, letter_spacing_for(family))
+    bounds = metrics.boundingRect(QRect(0, 0, width, height), TEXT_FLAGS, text)
+    # Слово, довше за ширину рамки, перенесене не буде — перевіряємо і ширину
+    return bounds.width() <= width and bounds.height() <= height
+
+
+@lru_cache(maxsize=8192)
+def _fit_font_size(text, width, height, family, min_size, max_size):
+    best = min_size
+    low, high = min_size, max_size
+    while low <= high:
+        size = (low + high) // 2
+        if text_fits(text, width, height, family, size):
+            best, low = size, size + 1
+        else:
+            high = size - 1
+    return best
+
+
+def fit_font_size(text, rect: QRect, family, min_size=MIN_FONT_SIZE, max_size=MAX_FONT_SIZE):
+    """Бінарний пошук найбільшого розміру шрифту, за якого text вміщується в rect.
+    Якщо не вміщується навіть min_size, повертає min_size."""
+    if not text or rect.width() <= 0 or rect.height() <= 0:
+        return min_size
+    return _fit_font_size(text, rect.width(), rect.height(), family, min_size, max_size)
+
+
+def clear_layout_cache():
+    """Скидає кеші поточного потоку, наприклад після реєстрації нових шрифтів."""
+    _thread_local.metrics = {}
+    _fit_font_size.cache_clear()
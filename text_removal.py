@@ -0,0 +1,127 @@
+# text_removal.py
+# Видалення оригінального тексту перед відтворенням перекладу. Замість білого
+# прямокутника будується маска штрихів тексту в межах OCR-блоків (з розширенням),
+# яку заповнює inpainting OpenCV або колір фону бульбашки. Обробляються лише
+# ділянки навколо блоків, тож вартість не залежить від висоти сторінки.
+# numpy та OpenCV імпортуються під час першого очищення, а не під час запуску GUI.
+
+from PyQt6.QtGui import QImage
+from PyQt6.QtCore import QRect
+
+TEXT_REMOVAL_METHODS = {
+    'inpaint': "Домальовування фону (inpainting)",
+    'background': "Колір фону бульбашки",
+    'white': "Біла заливка",
+}
+DEFAULT_TEXT_REMOVAL = 'inpaint'
+DEFAULT_DILATION = 2
+INPAINT_RADIUS = 3
+# Наскільки маска може виходити за OCR-блок; на стільки ж ширше копіюється очищений фон
+ERASE_MARGIN = DEFAULT_DILATION + 1
+# Мінімальна відмінність від кольору фону (за найбільшим каналом), щоб піксель вважався текстом
+TEXT_THRESHOLD = 48
+# Якщо фон навколо блоку майже однорідний (розкид каналів менший), inpainting не потрібен —
+# досить залити текст кольором фону, що в десятки разів швидше
+UNIFORM_BACKGROUND_STD = 6.0
+
+
+def image_view(image: QImage):
+    """Масив (висота, ширина, 4) BGRA, що ділить пам'ять з image (формати ARGB32/RGB32)."""
+    import numpy as np
+    height, width = image.height(), image.width()
+    buffer = image.bits()
+    buffer.setsize(image.sizeInBytes())
+    rows = np.ndarray((height, image.bytesPerLine()), dtype=np.uint8, buffer=buffer)
+    return rows[:, :width * 4].reshape(height, width, 4)
+
+
+def _dilate(mask, size):
+    import numpy as np
+    if size <= 0:
+        return mask
+    try:
+        import cv2
+    except ImportError:
+        # Без OpenCV — зсувами масиву; поля з нулів не дають масці перейти через край на інший бік
+        height, width = mask.shape
+        padded = np.pad(mask, size)
+        result = mask.copy()
+        for dy in range(2 * size + 1):
+            for dx in range(2 * size + 1):
+                result |= padded[dy:dy + height, dx:dx + width]
+        return result
+    return cv2.dilate(mask, np.ones((2 * size + 1, 2 * size + 1), np.uint8))
+
+
+def _background_colour(roi, box):
+    """Медіанний колір рамки пікселів навколо блоку — оцінка фону бульбашки — і чи фон однорідний."""
+    import numpy as np
+    x0, y0, x1, y1 = box
+    ring = np.concatenate([
+        roi[max(y0 - 1, 0), x0:x1], roi[min(y1, roi.shape[0] - 1), x0:x1],
+        roi[y0:y1, max(x0 - 1, 0)], roi[y0:y1, min(x1, roi.shape[1] - 1)],
+    ])[:, :3]
+    return np.median(ring, axis=0).astype(np.uint8), float(ring.std(axis=0).max()) < UNIFORM_BACKGROUND_STD
+
+
+def _merge_regions(rects, padding, width, height):
+    """Групує блоки, чиї розширені межі перетинаються, щоб кожна ділянка оброблялась один раз.
+
+    Ділянки між собою не перетинаються: розширена об'єднанням ділянка знову перевіряється
+    з рештою, доки перетинів не лишиться."""
+    regions = []
+    for rect in sorted(rects, key=lambda r: r.top()):
+        padded = rect.adjusted(-padding, -padding, padding, padding).intersected(QRect(0, 0, width, height))
+        if padded.isEmpty(): continue
+        region = [padded, [rect]]
+        while True:
+            overlapping = [other for other in regions if other[0].intersects(region[0])]
+            if not overlapping:
+                break
+            for other in overlapping:
+                regions.remove(other)
+                region = [region[0].united(other[0]), other[1] + region[1]]
+        regions.append(region)
+    return regions
+
+
+def remove_text(image: QImage, rects, method=DEFAULT_TEXT_REMOVAL, dilation=DEFAULT_DILATION) -> QImage:
+    """Повертає копію сторінки, з якої прибрано текст у рамках rects (QRect).
+
+    method: 'inpaint' — домальовування OpenCV (на однорідному фоні — заливка кольором фону),
+    'background' — завжди колір фону, 'white' — нічого не змінює (рамки заливаються при малюванні)."""
+    import numpy as np
+    result = image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+    if method == 'white' or not rects:
+        return result
+    pixels = image_view(result)
+    padding = dilation + 2 * INPAINT_RADIUS
+    for region, region_rects in _merge_regions(rects, padding, result.width(), result.height()):
+        left, top = region.x(), region.y()
+        roi = pixels[top:region.bottom() + 1, left:region.right() + 1]
+        fill_mask = np.zeros(roi.shape[:2], dtype=np.uint8)
+        inpaint_mask = np.zeros(roi.shape[:2], dtype=np.uint8)
+        fill = np.zeros(roi.shape[:2] + (3,), dtype=np.uint8)
+        for rect in region_rects:
+            box = (max(rect.x() - left, 0), max(rect.y() - top, 0),
+                   min(rect.right() + 1 - left, roi.shape[1]), min(rect.bottom() + 1 - top, roi.shape[0]))
+            x0, y0, x1, y1 = box
+            if x1 <= x0 or y1 <= y0: continue
+            colour, uniform = _background_colour(roi, box)
+            difference = np.abs(roi[y0:y1, x0:x1, :3].astype(np.int16) - colour).max(axis=2)
+            text = (difference > TEXT_THRESHOLD).astype(np.uint8) * 255
+            if method == 'background' or uniform:
+                fill_mask[y0:y1, x0:x1] |= text
+                fill[max(y0 - dilation, 0):y1 + dilation, max(x0 - dilation, 0):x1 + dilation] = colour
+            else:
+                inpaint_mask[y0:y1, x0:x1] |= text
+        fill_mask = _dilate(fill_mask, dilation)
+        if fill_mask.any():
+            selected = fill_mask > 0
+            roi[selected, :3] = fill[selected]
+        inpaint_mask = _dilate(inpaint_mask, dilation)
+        if inpaint_mask.any():
+            import cv2
+            roi[:, :, :3] = cv2.inpaint(np.ascontiguousarray(roi[:, :, :3]), inpaint_mask, INPAINT_RADIUS,
+                                        cv2.INPAINT_TELEA)
+    return result
@@ -0,0 +1,88 @@
+# thumbnails.py
+# Фонове створення мініатюр сторінок з дисковим кешем. Зображення декодується
+# одразу у зменшеному розмірі (QImageReader.setScaledSize), тож повна сторінка
+# в пам'ять не потрапляє, а GUI-потік не блокується.
+import hashlib
+import os
+
+from PyQt6.QtGui import QImage, QImageReader
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, QSize, pyqtSignal
+
+DEFAULT_CACHE_DIR = os.path.join("cache", "thumbnails")
+
+
+class ThumbnailCache:
+    """Мініатюри на диску з ключем шлях + час зміни + розмір файлу + розмір іконки."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path_for(self, image_path, size: QSize):
+        stat = os.stat(image_path)
+        key = f"{os.path.abspath(image_path)}|{stat.st_mtime_ns}|{stat.st_size}|{size.width()}x{size.height()}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + ".png")
+
+
+def load_scaled_image(path, size: QSize) -> QImage:
+    """Декодує зображення одразу в розмірі, що вписується в size."""
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    original_size = reader.size()
+    if original_size.isValid():
+        reader.setScaledSize(original_size.scaled(size, Qt.AspectRatioMode.KeepAspectRatio))
+    image = reader.read()
+    if not image.isNull() and (image.width() > size.width() or image.height() > size.height()):
+        # Формат не підтримує зменшення під час декодування
+        image = image.scaled(size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+    return image
+
+
+class _ThumbnailSignals(QObject):
+    finished = pyqtSignal(str, QImage)
+
+
+class _ThumbnailTask(QRunnable):
+    def __init__(self, path, size, cache, signals):
+        super().__init__()
+        self.path = path
+        self.size = size
+        self.cache = cache
+        self.signals = signals
+
+    def run(self):
+        try:
+            cache_path = self.cache.path_for(self.path, self.size) if self.cache else None
+        except OSError:
+            return
+        image = QImage(cache_path) if cache_path and os.path.exists(cache_path) else QImage()
+        if image.isNull():
+            image = load_scaled_image(self.path, self.size)
+            if image.isNull():
+                return
+            if cache_path:
+                image.save(cache_path)
+        self.signals.finished.emit(self.path, image)
+
+
+class ThumbnailLoader(QObject):
+    """Створює мініатюри в пулі потоків і повідомляє про кожну готову через thumbnail_ready."""
+    thumbnail_ready = pyqtSignal(str, QImage)
+
+    def __init__(self, size: QSize, cache: ThumbnailCache = None, max_threads=None, parent=None):
+        super().__init__(parent)
+        self.size = size
+        self.cache = cache
+        self.pool = QThreadPool(self)
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+        # Об'єкт сигналів живе в GUI-потоці, тож сигнали з пулу доставляються через чергу подій
+        self._signals = _ThumbnailSignals(self)
+        self._signals.finished.connect(self.thumbnail_ready)
+
+    def request(self, path):
+        self.pool.start(_ThumbnailTask(path, self.size, self.cache, self._signals))
+
+    def clear(self):
+        """Скасовує ще не розпочаті завдання."""
+        self.pool.clear()
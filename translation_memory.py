@@ -0,0 +1,176 @@
+# translation_memory.py
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from translators import BaseTranslator, is_translation_error
+
+DEFAULT_DB_PATH = os.path.join("cache", "translation_memory.sqlite3")
+# SQLite обмежує кількість параметрів в одному запиті
+_SQL_CHUNK = 500
+
+
+def normalize_text(text: str) -> str:
+    """Нормалізує текст для ключа кешу: прибирає зайві пробіли та переноси рядків."""
+    return re.sub(r"\s+", " ", text).strip()
+
+
+# ======================================================================
+# ПАМ'ЯТЬ ПЕРЕКЛАДІВ (SQLite)
+# ======================================================================
+class TranslationMemory:
+    """Дисковий кеш перекладів з LRU-витісненням та лічильниками влучань."""
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, max_entries=200_000):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # З'єднання використовується з робочих потоків, тому доступ захищено локом
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                service TEXT NOT NULL,
+                src_lang TEXT NOT NULL,
+                dest_lang TEXT NOT NULL,
+                source_text TEXT NOT NULL,
+                translated TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (service, src_lang, dest_lang, source_text)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations(last_used)")
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def get_many(self, service, src_lang, dest_lang, texts) -> dict:
+        """Повертає {нормалізований текст: переклад} для знайдених у кеші текстів."""
+        keys = list(dict.fromkeys(normalize_text(t) for t in texts if t.strip()))
+        found = {}
+        if not keys:
+            return found
+        with self._lock:
+            for start in range(0, len(keys), _SQL_CHUNK):
+                chunk = keys[start:start + _SQL_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT source_text, translated FROM translations "
+                    f"WHERE service=? AND src_lang=? AND dest_lang=? AND source_text IN ({placeholders})",
+                    (service, src_lang, dest_lang, *chunk)
+                ).fetchall()
+                found.update(rows)
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE translations SET last_used=? "
+                    "WHERE service=? AND src_lang=? AND dest_lang=? AND source_text=?",
+                    [(now, service, src_lang, dest_lang, key) for key in found]
+                )
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, service, src_lang, dest_lang, pairs):
+        """Зберігає пари (оригінал, переклад). Помилкові переклади не кешуються."""
+        now = time.time()
+        rows = [
+            (service, src_lang, dest_lang, normalize_text(text), translated, now)
+            for text, translated in pairs
+            if text.strip() and translated and not is_translation_error(translated)
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations "
+                "(service, src_lang, dest_lang, source_text, translated, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+            self._count = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            if self._count > self.max_entries:
+                self._evict()
+
+    def _evict(self):
+        """Видаляє найдавніше використані записи до 90% від ліміту. Викликається під локом."""
+        target = int(self.max_entries * 0.9)
+        to_delete = self._count - target
+        self._conn.execute(
+            "DELETE FROM translations WHERE rowid IN "
+            "(SELECT rowid FROM translations ORDER BY last_used ASC LIMIT ?)",
+            (to_delete,)
+        )
+        self._conn.commit()
+        self._count = target
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": self._count}
+
+    def reset_counters(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM translations")
+            self._conn.commit()
+            self._count = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# ======================================================================
+# ОБГОРТКА НАД БУДЬ-ЯКИМ ПЕРЕКЛАДАЧЕМ
+# ======================================================================
+class CachedTranslator(BaseTranslator):
+    """Перекладач, що відправляє в мережу лише ті речення, яких немає в пам'яті перекладів."""
+
+    def __init__(self, translator: BaseTranslator, memory: TranslationMemory, service_name: str):
+        self.translator = translator
+        self.memory = memory
+        self.service_name = service_name
+
+    def translate_batch(self, items: list[dict], src_lang: str, dest_lang: str) -> list[dict]:
+        texts = [item['text'] for item in items]
+        cached = self.memory.get_many(self.service_name, src_lang, dest_lang, texts)
+
+        # Однакові речення на сторінці перекладаються лише один раз
+        missing = {}
+        for item in items:
+            key = normalize_text(item['text'])
+            if key and key not in cached and key not in missing:
+                missing[key] = item['text']
+
+        translated_missing = {}
+        if missing:
+            batch = [{'text': text} for text in missing.values()]
+            batch = self.translator.translate_batch(batch, src_lang, dest_lang)
+            for key, result in zip(missing.keys(), batch):
+                translated_missing[key] = result.get('translated', '')
+            self.memory.put_many(
+                self.service_name, src_lang, dest_lang,
+                [(missing[key], translated) for key, translated in translated_missing.items()]
+            )
+
+        for item in items:
+            key = normalize_text(item['text'])
+            if not key:
+                item['translated'] = ''
+            elif key in cached:
+                item['translated'] = cached[key]
+            else:
+                item['translated'] = translated_missing.get(key, '')
+        return items
@@ -1,9 +1,23 @@
 # translators.py
-
-import deepl
-from googletrans import Translator
+# Клієнтські бібліотеки сервісів (deepl, googletrans) імпортуються лише під час
+# створення відповідного перекладача, щоб не сповільнювати запуск програми.
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+import json
+import threading
+import time
 import traceback
+import urllib.parse
+
+from net_utils import ConnectionPool, RateLimiter, retry_with_backoff
+
+# Повідомлення, які перекладачі записують замість перекладу. Справжній переклад теж може
+# починатися зі слова «ПОМИЛКА», тож перевіряються точні форми, а не лише слово
+TRANSLATION_ERROR = "ПОМИЛКА ПЕРЕКЛАДУ"
+TRANSLATION_ERROR_PREFIXES = ("ПОМИЛКА:", "ПОМИЛКА DEEPL:")
+
+def is_translation_error(text: str) -> bool:
+    return text == TRANSLATION_ERROR or text.startswith(TRANSLATION_ERROR_PREFIXES)
 
 # ======================================================================
 # АБСТРАКТНИЙ БАЗОВИЙ КЛАС
@@ -13,11 +27,16 @@ class BaseTranslator(ABC):
     def translate_batch(self, items: list[dict], src_lang: str, dest_lang: str) -> list[dict]:
         pass
 
+    def close(self):
+        """Звільняє з'єднання перекладача; після цього перекладач не використовується."""
+        pass
+
 # ======================================================================
 # РЕАЛІЗАЦІЯ ДЛЯ GOOGLE TRANSLATE
 # ======================================================================
 class GoogleTranslator(BaseTranslator):
     def __init__(self):
+        from googletrans import Translator
         self.translator = Translator()
 
     def translate_batch(self, items: list[dict], src_lang: str, dest_lang: str) -> list[dict]:
@@ -28,11 +47,131 @@ class GoogleTranslator(BaseTranslator):
                     item['translated'] = translated_obj.text
                 except Exception as e:
                     print(f"Error translating with Google '{item['text']}': {e}")
-                    item['translated'] = "ПОМИЛКА ПЕРЕКЛАДУ"
+                    item['translated'] = TRANSLATION_ERROR
             else:
                 item['translated'] = ''
         return items
 
+# ======================================================================
+# ШВИДКИЙ GOOGLE TRANSLATE (паралельні запити, ліміт частоти, повтори)
+# ======================================================================
+class FastGoogleTranslator(BaseTranslator):
+    """Перекладає через публічний endpoint Google паралельними запитами з пулу потоків.
+
+    У пакетному режимі кілька речень склеюються через роздільник в один запит
+    і розділяються після перекладу. base_url можна направити на локальний сервер-заглушку.
+    """
+    DEFAULT_BASE_URL = "https://translate.googleapis.com/translate_a/single"
+    SEPARATOR = "\n"
+    # Обмеження на розмір тексту в одному запиті
+    MAX_REQUEST_CHARS = 4500
+    MAX_BATCH_ITEMS = 200
+    MAX_BATCH_BYTES = 50_000
+
+    def __init__(self, concurrency=4, requests_per_second=5.0, max_retries=4,
+                 batch_mode=True, base_url=DEFAULT_BASE_URL, timeout=10.0):
+        self.concurrency = concurrency
+        self.rate_limiter = RateLimiter(requests_per_second, burst=concurrency)
+        self.max_retries = max_retries
+        self.batch_mode = batch_mode
+        self.base_url = base_url
+        self.timeout = timeout
+        self.connections = ConnectionPool(timeout)
+        # З'єднання ConnectionPool прив'язані до потоків, тож пул потоків живе стільки ж,
+        # скільки перекладач, — інакше кожна сторінка відкривала б нові з'єднання
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=max(1, self.concurrency),
+                                                    thread_name_prefix="google-translate")
+            return self._executor
+
+    def close(self):
+        # Потоки пулу тримають свої з'єднання — разом із потоками закриваються й вони
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        self.connections.close()
+
+    def _request(self, text, src_lang, dest_lang) -> str:
+        """Один HTTP-запит з урахуванням ліміту частоти та повторів. Повертає перекладений текст."""
+        params = urllib.parse.urlencode({'client': 'gtx', 'sl': src_lang, 'tl': dest_lang, 'dt': 't'})
+        body = urllib.parse.urlencode({'q': text}).encode('utf-8')
+
+        def send():
+            self.rate_limiter.acquire()
+            data = self.connections.request(
+                'POST', f"{self.base_url}?{params}", body=body,
+                headers={'Content-Type': 'application/x-www-form-urlencoded;charset=utf-8',
+                         'User-Agent': 'Mozilla/5.0'}
+            )
+            return json.loads(data.decode('utf-8'))
+
+        data = retry_with_backoff(send, max_retries=self.max_retries)
+        # Відповідь: [[["переклад", "оригінал", ...], ...], ...] — переклад розбитий на сегменти
+        return "".join(segment[0] for segment in data[0] if segment and segment[0])
+
+    def _chunks(self, texts):
+        """Групує тексти в запити, що не перевищують MAX_REQUEST_CHARS."""
+        chunk, length = [], 0
+        for text in texts:
+            if chunk and length + len(text) + len(self.SEPARATOR) > self.MAX_REQUEST_CHARS:
+                yield chunk
+                chunk, length = [], 0
+            chunk.append(text)
+            length += len(text) + len(self.SEPARATOR)
+        if chunk:
+            yield chunk
+
+    def _translate_chunk(self, texts, src_lang, dest_lang) -> list[str]:
+        if len(texts) > 1:
+            translated = self._request(self.SEPARATOR.join(texts), src_lang, dest_lang)
+            parts = translated.split(self.SEPARATOR)
+            if len(parts) == len(texts):
+                return [part.strip() for part in parts]
+            # Сервіс об'єднав або розбив рядки — перекладаємо кожне речення окремо
+        return [self._translate_one(text, src_lang, dest_lang) for text in texts]
+
+    def _translate_one(self, text, src_lang, dest_lang) -> str:
+        try:
+            return self._request(text, src_lang, dest_lang)
+        except Exception as e:
+            print(f"Error translating with Google '{text}': {e}")
+            return TRANSLATION_ERROR
+
+    def translate_batch(self, items: list[dict], src_lang: str, dest_lang: str) -> list[dict]:
+        to_translate = [item for item in items if item['text'].strip()]
+        for item in items:
+            if not item['text'].strip():
+                item['translated'] = ''
+        if not to_translate:
+            return items
+
+        # Переноси рядків усередині речення конфліктували б з роздільником
+        texts = [" ".join(item['text'].split()) for item in to_translate]
+        if self.batch_mode:
+            chunks = list(self._chunks(texts))
+            task = lambda chunk: self._translate_chunk_safe(chunk, src_lang, dest_lang)
+        else:
+            chunks = [[text] for text in texts]
+            task = lambda chunk: [self._translate_one(chunk[0], src_lang, dest_lang)]
+
+        results = [text for chunk_result in self._get_executor().map(task, chunks) for text in chunk_result]
+        for item, translated in zip(to_translate, results):
+            item['translated'] = translated
+        return items
+
+    def _translate_chunk_safe(self, texts, src_lang, dest_lang) -> list[str]:
+        try:
+            return self._translate_chunk(texts, src_lang, dest_lang)
+        except Exception as e:
+            print(f"Помилка пакетного перекладу Google: {e}")
+            return [TRANSLATION_ERROR] * len(texts)
+
 # ======================================================================
 # РЕАЛІЗАЦІЯ ДЛЯ DEEPL API
 # ======================================================================
@@ -62,49 +201,349 @@ class DeepLTranslator(BaseTranslator):
         "Turkish": "TR", "Ukrainian": "UK", "Vietnamese": "VI",
         "Chinese (Simplified)": "ZH-HANS", "Chinese (Traditional)": "ZH-HANT"
     }
+
+    # Ліміти одного запиту translate_text: до 50 текстів і 128 KiB на весь запит (із запасом на службові дані)
+    MAX_BATCH_ITEMS = 50
+    MAX_BATCH_BYTES = 100_000
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, validate=True, server_url=None):
+        """validate=False відкладає перевірку ключа (запит get_usage) — її робить TranslatorRegistry.
+        server_url дозволяє направити запити на локальний сервер-заглушку."""
         if not api_key:
             raise ValueError("API ключ для DeepL не може бути порожнім.")
         self.api_key = api_key
+        import deepl
+        try:
+            self.translator = deepl.Translator(api_key, server_url=server_url)
+        except Exception as e:
+            raise ConnectionError(f"Не вдалося ініціалізувати DeepL. Перевірте API ключ та з'єднання. Помилка: {e}")
+        if validate:
+            self.validate_key()
+
+    def validate_key(self):
+        """Перевіряє ключ запитом використання квоти. Клієнт deepl тримає з'єднання відкритим."""
         try:
-            self.translator = deepl.Translator(api_key)
             self.translator.get_usage()
         except Exception as e:
             raise ConnectionError(f"Не вдалося ініціалізувати DeepL. Перевірте API ключ та з'єднання. Помилка: {e}")
 
-    def translate_batch(self, items: list[dict], src_lang: str, dest_lang: str) -> list[dict]:
+    def remaining_characters(self):
+        """Залишок квоти символів за get_usage; None, якщо ліміту немає."""
+        usage = self.translator.get_usage().character
+        return max(0, usage.limit - usage.count) if usage.valid else None
+
+    def close(self):
+        # Translator.close є лише в новіших версіях бібліотеки deepl
+        close = getattr(self.translator, 'close', None)
+        if close is not None:
+            close()
+
+    def translate_texts(self, texts: list[str], src_lang: str, dest_lang: str) -> list[str]:
+        """Перекладає непорожні тексти. Помилки API (deepl.DeepLException) не перехоплюються."""
         source_language = src_lang.upper() if src_lang != 'auto' else None
         target_language = dest_lang.upper() # ВИПРАВЛЕНО: гарантуємо верхній регістр
+        results = self.translator.translate_text(texts, source_lang=source_language, target_lang=target_language)
+        return [result.text for result in results]
 
+    def translate_batch(self, items: list[dict], src_lang: str, dest_lang: str) -> list[dict]:
+        import deepl
         texts_to_translate = [item['text'] for item in items if item['text'].strip()]
         
         if not texts_to_translate:
             return items 
 
         try:
-            results = self.translator.translate_text(
-                texts_to_translate,
-                source_lang=source_language,
-                target_lang=target_language
-            )
-            result_iter = iter(results)
+            fill_translations(items, self.translate_texts(texts_to_translate, src_lang, dest_lang))
+        except deepl.DeepLException as e:
+            print(f"Помилка API DeepL: {e}")
+            for item in items:
+                item['translated'] = deepl_error_message(e)
+        except Exception as e:
+            print(f"Загальна помилка під час перекладу: {e}")
             for item in items:
-                if item['text'].strip():
-                    item['translated'] = next(result_iter).text
-                else:
-                    item['translated'] = ''
+                item['translated'] = TRANSLATION_ERROR
 
+        return items
+
+
+def fill_translations(items, translations):
+    """Записує переклади непорожніх текстів у items (порожні отримують '')."""
+    result_iter = iter(translations)
+    for item in items:
+        item['translated'] = next(result_iter) if item['text'].strip() else ''
+
+
+def deepl_error_message(error) -> str:
+    if "source_lang" in str(error) or "target_lang" in str(error):
+        return f"ПОМИЛКА: Мова не підтримується вашим API."
+    return f"ПОМИЛКА DEEPL: {error}"
+
+# ======================================================================
+# КІЛЬКА КЛЮЧІВ DEEPL: РОЗПОДІЛ ЗАПИТІВ І ПЕРЕМИКАННЯ ПРИ ВИЧЕРПАННІ КВОТИ
+# ======================================================================
+class _PooledKey:
+    def __init__(self, translator: DeepLTranslator):
+        self.translator = translator
+        self.remaining = None       # залишок квоти символів; None — невідомий або без ліміту
+        self.exhausted = False      # квоту вичерпано (до наступного оновлення get_usage)
+        self.disabled = False       # ключ відхилено сервісом
+        self.cooldown_until = 0.0   # після 429 ключ відпочиває до цього моменту (time.monotonic)
+        self.in_flight = 0
+
+
+class DeepLKeyPool(BaseTranslator):
+    """Розподіляє запити між кількома ключами DeepL.
+
+    Кожен запит іде на найменш завантажений ключ, якому вистачає квоти. Якщо сервіс
+    відповідає, що квоту вичерпано (456) або запитів забагато (429), запит повторюється
+    з іншим ключем, тож великий розділ використовує сумарну квоту всіх ключів."""
+    MAX_BATCH_ITEMS = DeepLTranslator.MAX_BATCH_ITEMS
+    MAX_BATCH_BYTES = DeepLTranslator.MAX_BATCH_BYTES
+    # Скільки секунд не використовувати ключ після відповіді 429
+    RATE_LIMIT_COOLDOWN = 5.0
+    # Скільки секунд один запит може сумарно чекати, поки ключі відпочивають після 429
+    MAX_RATE_LIMIT_WAIT = 30.0
+
+    def __init__(self, api_keys, validate=True, server_url=None):
+        keys = list(dict.fromkeys(key for key in api_keys if key))
+        if not keys:
+            raise ValueError("API ключ для DeepL не може бути порожнім.")
+        self.api_keys = keys
+        self._keys = [_PooledKey(DeepLTranslator(key, validate=False, server_url=server_url)) for key in keys]
+        self._lock = threading.Lock()
+        if validate:
+            self.validate_key()
+
+    def validate_key(self):
+        """Оновлює залишки квот усіх ключів. Помилка, якщо не лишилося жодного придатного ключа."""
+        import deepl
+        errors = []
+        for pooled in self._keys:
+            try:
+                remaining = pooled.translator.remaining_characters()
+            except deepl.AuthorizationException as e:
+                errors.append(str(e))
+                with self._lock:
+                    pooled.disabled = True
+                continue
+            except Exception as e:
+                # Тимчасова мережева помилка: ключ лишається в пулі з невідомим залишком
+                errors.append(str(e))
+                continue
+            with self._lock:
+                pooled.remaining = remaining
+                pooled.exhausted = remaining == 0
+        if not any(not pooled.disabled and not pooled.exhausted for pooled in self._keys):
+            raise ConnectionError(f"Жоден ключ DeepL не придатний для перекладу. Помилки: {'; '.join(errors) or 'квоту вичерпано'}")
+
+    def close(self):
+        for pooled in self._keys:
+            pooled.translator.close()
+
+    def usage(self):
+        """Стан ключів для показу користувачу: [(ключ, залишок символів або None, доступний)]."""
+        with self._lock:
+            return [(pooled.translator.api_key, pooled.remaining, not (pooled.disabled or pooled.exhausted))
+                    for pooled in self._keys]
+
+    def _acquire(self, characters):
+        """Обирає ключ для запиту. Повертає (ключ, 0) або (None, скільки чекати); (None, None) — ключів немає."""
+        with self._lock:
+            usable = [pooled for pooled in self._keys if not pooled.disabled and not pooled.exhausted]
+            # Ключ з відомим залишком, меншим за запит, пробуємо лише коли інших немає
+            enough = [pooled for pooled in usable if pooled.remaining is None or pooled.remaining >= characters]
+            candidates = enough or usable
+            if not candidates:
+                return None, None
+            now = time.monotonic()
+            ready = [pooled for pooled in candidates if pooled.cooldown_until <= now]
+            if not ready:
+                return None, min(pooled.cooldown_until for pooled in candidates) - now
+            pooled = min(ready, key=lambda p: (p.in_flight, -(p.remaining if p.remaining is not None else float('inf'))))
+            pooled.in_flight += 1
+            return pooled, 0
+
+    def _no_keys_error(self):
+        """Помилка, коли придатних ключів не лишилося: відхилені ключі не видаються за вичерпану квоту."""
+        import deepl
+        with self._lock:
+            rejected = sum(pooled.disabled for pooled in self._keys)
+        if rejected == len(self._keys):
+            return deepl.AuthorizationException(f"усі ключі DeepL ({rejected}) відхилено сервісом, перевірте їх")
+        if rejected:
+            return deepl.QuotaExceededException(f"квоту решти ключів DeepL вичерпано; відхилено сервісом: {rejected}")
+        return deepl.QuotaExceededException("квоту всіх ключів DeepL вичерпано")
+
+    def translate_texts(self, texts: list[str], src_lang: str, dest_lang: str) -> list[str]:
+        import deepl
+        characters = sum(len(text) for text in texts)
+        waited = 0.0
+        while True:
+            pooled, wait = self._acquire(characters)
+            if pooled is None:
+                if wait is None:
+                    raise self._no_keys_error()
+                wait = max(wait, 0.0)
+                if waited + wait > self.MAX_RATE_LIMIT_WAIT:
+                    raise deepl.TooManyRequestsException(
+                        f"DeepL відповідає «забагато запитів» на всі ключі понад {self.MAX_RATE_LIMIT_WAIT:g} с")
+                time.sleep(wait)
+                waited += wait
+                continue
+            try:
+                translations = pooled.translator.translate_texts(texts, src_lang, dest_lang)
+            except deepl.QuotaExceededException:
+                print(f"DeepL: квоту ключа {pooled.translator.api_key[:4]}... вичерпано, перемикаюся на інший.")
+                with self._lock:
+                    pooled.exhausted, pooled.remaining = True, 0
+                continue
+            except deepl.TooManyRequestsException:
+                with self._lock:
+                    pooled.cooldown_until = time.monotonic() + self.RATE_LIMIT_COOLDOWN
+                continue
+            except deepl.AuthorizationException:
+                print(f"DeepL: ключ {pooled.translator.api_key[:4]}... відхилено, вилучаю його з пулу.")
+                with self._lock:
+                    pooled.disabled = True
+                continue
+            finally:
+                with self._lock:
+                    pooled.in_flight -= 1
+            with self._lock:
+                if pooled.remaining is not None:
+                    pooled.remaining = max(0, pooled.remaining - characters)
+            return translations
+
+    def translate_batch(self, items: list[dict], src_lang: str, dest_lang: str) -> list[dict]:
+        import deepl
+        texts_to_translate = [item['text'] for item in items if item['text'].strip()]
+        if not texts_to_translate:
+            return items
+        try:
+            fill_translations(items, self.translate_texts(texts_to_translate, src_lang, dest_lang))
         except deepl.DeepLException as e:
             print(f"Помилка API DeepL: {e}")
-            error_message = f"ПОМИЛКА DEEPL: {e}"
-            if "source_lang" in str(e) or "target_lang" in str(e):
-                 error_message = f"ПОМИЛКА: Мова не підтримується вашим API."
             for item in items:
-                item['translated'] = error_message
+                item['translated'] = deepl_error_message(e)
         except Exception as e:
             print(f"Загальна помилка під час перекладу: {e}")
             for item in items:
-                item['translated'] = "ПОМИЛКА ПЕРЕКЛАДУ"
+                item['translated'] = TRANSLATION_ERROR
+        return items
+
+# ======================================================================
+# ФАБРИКА ПЕРЕКЛАДАЧІВ
+# ======================================================================
+# Сервіси, яким не потрібен API ключ
+KEYLESS_SERVICES = {'google', 'google_fast'}
+# Сервіси на чат-моделях (llm_translators.py)
+LLM_SERVICES = {'gpt', 'gemini'}
+
+def create_translator(service: str, api_key=None, validate=True, model=None) -> BaseTranslator:
+    """Створює перекладач за ідентифікатором сервісу ('google', 'google_fast', 'deepl', 'gpt', 'gemini').
+    api_key може бути списком ключів — тоді для DeepL запити розподіляються між ними.
+    model — модель для чат-сервісів (None — модель за замовчуванням)."""
+    if service in LLM_SERVICES:
+        # Чат-моделі використовують перший ключ зі списку
+        from llm_translators import OpenAITranslator, GeminiTranslator
+        if isinstance(api_key, (list, tuple)):
+            api_key = api_key[0] if api_key else None
+        return OpenAITranslator(api_key, model=model) if service == 'gpt' else GeminiTranslator(api_key, model=model)
+    if service == 'deepl':
+        if isinstance(api_key, (list, tuple)):
+            if len(api_key) > 1:
+                return DeepLKeyPool(api_key, validate=validate)
+            api_key = api_key[0] if api_key else None
+        return DeepLTranslator(api_key, validate=validate)
+    if service == 'google_fast':
+        return FastGoogleTranslator()
+    return GoogleTranslator()
+
+# ======================================================================
+# РЕЄСТР ПЕРЕКЛАДАЧІВ
+# ======================================================================
+# Як часто повторно перевіряти ключ перекладача, що вже використовується
+KEY_VALIDATION_TTL = 15 * 60
+
+
+class TranslatorRegistry:
+    """Кеш перекладачів за (сервіс, ключ).
+
+    Перекладач разом з його HTTP-з'єднаннями створюється один раз і використовується
+    для всіх наступних сторінок; ключ перевіряється не частіше, ніж раз на validation_ttl секунд."""
+
+    def __init__(self, validation_ttl=KEY_VALIDATION_TTL):
+        self.validation_ttl = validation_ttl
+        self._translators = {}
+        self._validated_at = {}
+        # Спільний замок захищає лише словник замків; створення й перевірка ключа (мережевий
+        # запит) ідуть під замком свого (сервіс, ключ) і не блокують інші сервіси
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def get(self, service: str, api_key=None, model=None) -> BaseTranslator:
+        key = (service, self._key(api_key), model or None)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            translator = self._translators.get(key)
+            if translator is None:
+                translator = self._translators[key] = create_translator(service, api_key, validate=False, model=model)
+            validated_at = self._validated_at.get(key)
+            if hasattr(translator, 'validate_key') and (
+                    validated_at is None or time.monotonic() - validated_at > self.validation_ttl):
+                try:
+                    translator.validate_key()
+                except Exception:
+                    self._translators.pop(key, None)
+                    raise
+                self._validated_at[key] = time.monotonic()
+        return translator
+
+    @staticmethod
+    def _key(api_key):
+        if isinstance(api_key, (list, tuple)):
+            return tuple(api_key) or None
+        return api_key or None
+
+    def invalidate(self, service: str, api_key=None):
+        """Забуває й закриває перекладачі сервісу, що використовують ключ, — після видалення
+        чи зміни ключа в налаштуваннях. Пул DeepL, до якого входить ключ, теж забувається."""
+        def uses_key(cached):
+            return cached == api_key or (isinstance(cached, tuple) and api_key in cached)
+
+        with self._lock:
+            keys = [key for key in self._key_locks if key[0] == service and uses_key(key[1])]
+            removed = self._forget(keys)
+        for translator in removed:
+            translator.close()
+
+    def clear(self):
+        with self._lock:
+            removed = self._forget(list(self._key_locks))
+        for translator in removed:
+            translator.close()
+
+    def _forget(self, keys):
+        """Вилучає записи реєстру (під self._lock) і повертає перекладачі, які треба закрити."""
+        removed = []
+        for key in keys:
+            self._key_locks.pop(key, None)
+            self._validated_at.pop(key, None)
+            translator = self._translators.pop(key, None)
+            if translator is not None:
+                removed.append(translator)
+        return removed
+
+
+_registry = TranslatorRegistry()
+
+
+def get_translator(service: str, api_key=None, model=None) -> BaseTranslator:
+    """Перекладач зі спільного реєстру процесу (див. TranslatorRegistry)."""
+    return _registry.get(service, api_key, model)
+
 
-        return items
\ No newline at end of file
+def invalidate_translators(service: str, api_key):
+    """Забуває перекладачі спільного реєстру, що використовують ключ (див. TranslatorRegistry.invalidate)."""
+    _registry.invalidate(service, api_key)